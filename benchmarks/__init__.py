@@ -0,0 +1,2 @@
+# -*- coding: utf-8 -*-
+"""Benchmark harness for the or_solvers package (see run.py)."""
@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+"""
+Seeded random instances for the benchmarks. The same (size, seed) always
+gives the same instance, so runs on different commits are comparable.
+"""
+
+import numpy as np
+from scipy.sparse import csr_matrix, random as sparse_random
+
+
+def random_lp(m, n, density=1.0, seed=0):
+    """Bounded, feasible product-mix LP (c, A, b) in linprog form
+
+    A has nonnegative entries with at least one per column (so every
+    product uses some resource and the LP is bounded) and is a csr
+    matrix when density < 1. b > 0 keeps x = 0 feasible.
+    """
+    rng = np.random.default_rng(seed)
+    c = -rng.integers(10, 300, n).astype(float)
+    b = rng.integers(1000, 10000, m).astype(float)
+    if density >= 1.0:
+        return c, rng.uniform(0.1, 10.0, (m, n)), b
+    A = sparse_random(m, n, density=density, random_state=rng, format="csr",
+                      data_rvs=lambda k: rng.uniform(0.1, 10.0, k))
+    # one guaranteed entry per column
+    A = A + csr_matrix((rng.uniform(0.1, 10.0, n), (rng.integers(0, m, n), np.arange(n))),
+                       shape=(m, n))
+    return c, A, b
+
+
+def random_assignment(rows, cols=None, seed=0):
+    """Integer worker/task times, rows x cols (square if cols is None)"""
+    rng = np.random.default_rng(seed)
+    return rng.integers(1, 100, (rows, rows if cols is None else cols)).astype(float)
+
+
+def random_transportation(m, n=None, imbalance=0.0, seed=0):
+    """(cost, supply, demand); supply exceeds demand by imbalance (a fraction)
+
+    imbalance < 0 leaves supply short instead. Quantities are integers so
+    balanced instances balance exactly; every warehouse demands at least
+    one unit (needs supply.sum() > n, true for n <= 50 m).
+    """
+    rng = np.random.default_rng(seed)
+    n = m if n is None else n
+    cost = rng.integers(1, 50, (m, n)).astype(float)
+    supply = rng.integers(50, 150, m).astype(float)
+    demand = rng.multinomial(int(supply.sum()) - n, np.full(n, 1.0 / n)).astype(float) + 1.0
+    if imbalance > 0:
+        supply = np.ceil(supply * (1.0 + imbalance))
+    elif imbalance < 0:
+        demand = np.ceil(demand * (1.0 - imbalance))
+    return cost, supply, demand
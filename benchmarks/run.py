@@ -0,0 +1,323 @@
+# -*- coding: utf-8 -*-
+"""
+Solver benchmarks over generated instances.
+
+    python -m benchmarks.run --sizes 10 100 1000 --out bench.json
+    python -m benchmarks.run --out bench.json --baseline baseline.json
+
+Every benchmark is timed on seeded instances of each size (best wall
+time of --repeat runs), with its peak memory from tracemalloc on one
+extra run (allocations made through Python and numpy; memory HiGHS
+allocates in C is not seen) and its iteration count where the solver
+reports one. A further run under stats.collect() records the time per
+solver phase and the solver counters (pivots, loop-search lengths,
+re-solves); --trace writes those runs as a Chrome trace. Results go to
+a JSON file; with --baseline each result is compared to the stored run
+and the exit status is 1 if any benchmark taking at least --min-time
+got slower than --threshold times its baseline.
+"""
+
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+
+import numpy as np
+import scipy
+from scipy.optimize import linear_sum_assignment, linprog
+
+from or_solvers import integer, simplex, stats, transportation
+from or_solvers.assignment import assignment_sensitivity
+from or_solvers.transport_ranging import TransportationRanging
+
+from .generators import random_assignment, random_lp, random_transportation
+
+DEFAULT_SIZES = (10, 100, 1000, 10000)
+
+
+@dataclass
+class Benchmark:
+    """setup(size, seed, options) builds the arguments of run, outside the timing
+
+    run returns an iteration count or None. Sizes above limit are skipped
+    unless --no-limits is given (a dense 10^4 x 10^4 instance alone is
+    800 MB).
+    """
+    name: str
+    setup: object
+    run: object
+    limit: int
+
+
+# =====================================================================
+# LP
+# =====================================================================
+def _lp(size, seed, options):
+    return random_lp(size, 2 * size, options.lp_density, seed)
+
+
+def _run_linprog(c, A, b):
+    res = linprog(c, A_ub=A, b_ub=b, bounds=(0, None), method="highs")
+    return res.nit
+
+
+def _lp_solved(size, seed, options):
+    c, A, b = _lp(size, seed, options)
+    return A, b, c, simplex.solve_simplex(c, A, b, sensitivity=False)
+
+
+def _run_lp_sensitivity(A, b, c, result):
+    simplex.simplex_sensitivity(A, b, c, result)
+
+
+def _lp_integer(size, seed, options):
+    return (*_lp(size, seed, options), options.integer_time_limit)
+
+
+def _run_integer(c, A, b, time_limit):
+    return integer.solve_integer(c, A, b, time_limit=time_limit).nodes
+
+
+# =====================================================================
+# ASSIGNMENT
+# =====================================================================
+def _square(size, seed, options):
+    return (random_assignment(size, seed=seed),)
+
+
+def _rectangular(size, seed, options):
+    return (random_assignment(size, 2 * size, seed=seed),)
+
+
+def _run_lsa(cost):
+    linear_sum_assignment(cost)
+
+
+def _assignment_solved(size, seed, options):
+    cost = random_assignment(size, seed=seed)
+    return (cost, *linear_sum_assignment(cost))
+
+
+def _run_assignment_sensitivity(cost, row_ind, col_ind):
+    assignment_sensitivity(cost, row_ind, col_ind)
+
+
+# =====================================================================
+# TRANSPORTATION
+# =====================================================================
+def _transport(imbalance):
+    def setup(size, seed, options):
+        return random_transportation(size, imbalance=imbalance, seed=seed)
+    return setup
+
+
+def _run_vam(cost, supply, demand):
+    transportation.vogels_approximation_method(cost, supply, demand)
+
+
+def _transport_started(imbalance):
+    def setup(size, seed, options):
+        cost, supply, demand = random_transportation(size, imbalance=imbalance, seed=seed)
+        allocation, _, basis = transportation.vogels_approximation_method(
+            cost, supply, demand, return_basis=True)
+        return cost, allocation, supply, demand, basis
+    return setup
+
+
+def _run_uv(cost, allocation, supply, demand, basis):
+    return transportation.uv_method(cost, allocation, supply, demand, basis=basis)[2]
+
+
+def _transport_solved(imbalance):
+    def setup(size, seed, options):
+        cost, supply, demand = random_transportation(size, imbalance=imbalance, seed=seed)
+        res = transportation.solve_transportation(cost, supply, demand, sensitivity=False)
+        model = transportation._balanced_cost(transportation._as_cost(cost), supply, demand,
+                                              0.0, 0.0)[0]
+        return model, res.allocation, res.basis
+    return setup
+
+
+def _run_transport_sensitivity(model, allocation, basis):
+    transportation.transportation_sensitivity(model, allocation, basis)
+
+
+def _transport_result(imbalance):
+    def setup(size, seed, options):
+        cost, supply, demand = random_transportation(size, imbalance=imbalance, seed=seed)
+        return cost, supply, demand, transportation.solve_transportation(cost, supply, demand,
+                                                                          sensitivity=False)
+    return setup
+
+
+def _run_transport_ranging(cost, supply, demand, result):
+    ranging = TransportationRanging.from_result(cost, supply, demand, result)
+    ranging.cost_ranges(*(result.allocation > 0.01).nonzero())
+    ranging.supply_ranges(supply)
+    ranging.demand_ranges(demand)
+
+
+BENCHMARKS = [
+    Benchmark("lp.linprog", _lp, _run_linprog, 10000),
+    Benchmark("lp.sensitivity", _lp_solved, _run_lp_sensitivity, 2000),
+    Benchmark("lp.integer", _lp_integer, _run_integer, 1000),
+    Benchmark("assignment.lsa_square", _square, _run_lsa, 5000),
+    Benchmark("assignment.lsa_rectangular", _rectangular, _run_lsa, 3000),
+    Benchmark("assignment.sensitivity", _assignment_solved, _run_assignment_sensitivity, 1000),
+    Benchmark("transport.vam_balanced", _transport(0.0), _run_vam, 3000),
+    Benchmark("transport.vam_unbalanced", _transport(0.1), _run_vam, 3000),
+    Benchmark("transport.uv_balanced", _transport_started(0.0), _run_uv, 1000),
+    Benchmark("transport.uv_unbalanced", _transport_started(0.1), _run_uv, 1000),
+    Benchmark("transport.sensitivity", _transport_solved(0.0), _run_transport_sensitivity, 3000),
+    Benchmark("transport.ranging", _transport_result(0.1), _run_transport_ranging, 1000),
+]
+
+
+# =====================================================================
+# RUNNER
+# =====================================================================
+def measure(benchmark, size, seed, repeat, options, trace=None):
+    """One result record: best wall time, peak traced memory, iterations, phases
+
+    trace, a SolveStats, collects the timeline of the instrumented run.
+    """
+    args = benchmark.setup(size, seed, options)
+    times = []
+    iterations = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        iterations = benchmark.run(*args)
+        times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        benchmark.run(*args)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    with stats.collect() as collected:
+        with stats.phase(f"{benchmark.name}[{size}]"):
+            benchmark.run(*args)
+    if trace is not None:
+        trace.merge(collected)
+    return {
+        "name": benchmark.name,
+        "size": size,
+        "wall_s": min(times),
+        "peak_mb": peak / 2**20,
+        "iterations": None if iterations is None else int(iterations),
+        "phases": {name: seconds for name, seconds in collected.phases.items()
+                   if name != f"{benchmark.name}[{size}]"},
+        "counters": collected.counters,
+    }
+
+
+def run_benchmarks(sizes=DEFAULT_SIZES, only=None, seed=0, repeat=3, limits=True, options=None,
+                   log=None, trace=None):
+    """Run every selected benchmark at every size; returns the result records
+
+    only is a list of name prefixes ("transport", "lp.sensitivity").
+    log, if given, is called with each record as it is produced; trace
+    is passed on to measure.
+    """
+    options = options or argparse.Namespace(lp_density=0.01, integer_time_limit=10.0)
+    records = []
+    for benchmark in BENCHMARKS:
+        if only and not any(benchmark.name.startswith(prefix) for prefix in only):
+            continue
+        for size in sizes:
+            if limits and size > benchmark.limit:
+                continue
+            record = measure(benchmark, size, seed, repeat, options, trace)
+            records.append(record)
+            if log is not None:
+                log(record)
+    return records
+
+
+def compare(records, baseline):
+    """(record, baseline record, ratio) for every result present in both runs"""
+    stored = {(r["name"], r["size"]): r for r in baseline["results"]}
+    rows = []
+    for record in records:
+        old = stored.get((record["name"], record["size"]))
+        if old is not None:
+            rows.append((record, old, record["wall_s"] / max(old["wall_s"], 1e-9)))
+    return rows
+
+
+def _environment(args):
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "scipy": scipy.__version__,
+        "machine": platform.machine(),
+        "platform": platform.platform(),
+        "seed": args.seed,
+        "repeat": args.repeat,
+        "lp_density": args.lp_density,
+        "integer_time_limit": args.integer_time_limit,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+def _print_record(record):
+    iterations = "" if record["iterations"] is None else f"{record['iterations']:>10d}"
+    print(f"{record['name']:<28s} {record['size']:>7d} {record['wall_s']:>11.4f}s "
+          f"{record['peak_mb']:>10.1f} MB {iterations}", flush=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--only", nargs="+", help="benchmark name prefixes to run")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--lp-density", type=float, default=0.01,
+                        help="nonzero fraction of the LP matrix (1 = dense)")
+    parser.add_argument("--integer-time-limit", type=float, default=10.0,
+                        help="seconds each integer product-mix solve may search")
+    parser.add_argument("--no-limits", action="store_true",
+                        help="run sizes above each benchmark's size limit too")
+    parser.add_argument("--out", help="write results to this JSON file")
+    parser.add_argument("--trace", help="write the instrumented runs as a Chrome trace")
+    parser.add_argument("--baseline", help="compare against results stored by an earlier --out")
+    parser.add_argument("--threshold", type=float, default=1.25,
+                        help="slowdown ratio reported as a regression")
+    parser.add_argument("--min-time", type=float, default=0.005,
+                        help="seconds below which a slowdown is treated as noise")
+    args = parser.parse_args(argv)
+
+    print(f"{'benchmark':<28s} {'size':>7s} {'wall':>12s} {'peak':>13s} {'iterations':>10s}")
+    trace = stats.SolveStats() if args.trace else None
+    records = run_benchmarks(args.sizes, args.only, args.seed, args.repeat,
+                             not args.no_limits, args, log=_print_record, trace=trace)
+    if trace is not None:
+        trace.to_chrome_trace(args.trace)
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump({"environment": _environment(args), "results": records}, f, indent=1)
+
+    if not args.baseline:
+        return 0
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    regressions = 0
+    print(f"\n{'benchmark':<28s} {'size':>7s} {'baseline':>12s} {'now':>12s} {'ratio':>7s}")
+    for record, old, ratio in compare(records, baseline):
+        flag = ""
+        if ratio > args.threshold and record["wall_s"] >= args.min_time:
+            flag = "  REGRESSION"
+            regressions += 1
+        print(f"{record['name']:<28s} {record['size']:>7d} {old['wall_s']:>11.4f}s "
+              f"{record['wall_s']:>11.4f}s {ratio:>7.2f}{flag}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
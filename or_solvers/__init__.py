@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+"""
+Headless OR solvers (LP, assignment, transportation) used by the GUI in
+or_1.py. Every solver returns a plain result object and can be called
+from batch jobs without Tk.
+"""
+
+from .simplex import (
+    SimplexResult,
+    SimplexSensitivity,
+    optimal_basis,
+    simplex_sensitivity,
+    solve_simplex,
+)
+from .lp_session import LPSession, add_new_constraint, add_new_variable
+from .integer import IntegerResult, solve_integer
+from .scenarios import Scenario, ScenarioResults, solve_scenarios
+from .assignment import (
+    AssignmentResult,
+    AssignmentSensitivity,
+    assignment_duals,
+    assignment_sensitivity,
+    solve_assignment,
+)
+from .assignment_batch import AssignmentBatchResults, solve_assignment_batch
+from .assignment_session import AssignmentSession
+from .cache import SolveCache, cache_key
+from .jobs import SolveJob
+from .model_io import load_assignment, load_lp, load_matrix, load_transportation
+from .murty import k_best_assignments, ranked_assignments
+from .transportation import (
+    TransportationResult,
+    TransportationSensitivity,
+    solve_transportation,
+    transportation_sensitivity,
+    uv_method,
+    vogels_approximation_method,
+)
+from .transport_ranging import TransportationRanging
+from .stats import SolveStats, collect
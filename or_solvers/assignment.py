@@ -0,0 +1,398 @@
+# -*- coding: utf-8 -*-
+"""
+Assignment problem (Hungarian algorithm) solver with sensitivity analysis.
+
+The cost matrix may be rectangular and may mark forbidden pairs with inf.
+A scipy.sparse cost lists only the allowed pairs (stored entries, explicit
+zeros included); it is solved by sparse Jonker-Volgenant and never
+densified, so large problems with few allowed pairs per row stay cheap.
+
+Sensitivity works from the dual potentials of the optimal matching: all
+reduced costs come from one broadcast, and the exact tolerance of every
+assigned cell is the length of the cheapest alternating cycle through
+it, found with bounded shortest augmenting path searches.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+import numpy as np
+from scipy.optimize import linear_sum_assignment
+from scipy.sparse import csr_matrix, issparse
+from scipy.sparse.csgraph import connected_components, dijkstra, min_weight_full_bipartite_matching
+
+from .stats import SolveStats, collect, count, phase
+
+# Relative size below which a reduced cost or dual update counts as zero
+EPS = 1e-12
+# Rows relaxed together per Bellman-Ford block
+DUAL_BLOCK = 128
+# Starting arcs per row of the bounded graph used for tolerances
+ARCS_PER_ROW = 1
+# Sources per bounded Dijkstra call
+SOURCE_CHUNK = 256
+
+
+@dataclass
+class AssignmentSensitivity:
+    """Dual potentials, alternative assignments and cost tolerances
+
+    u and v are row / column potentials with reduced_costs = cost - u - v
+    >= 0, zero on the assigned cells and v = 0 on columns left free (u = 0
+    on free rows). For a sparse cost, reduced_costs is a csr matrix over
+    the allowed pairs. alternatives holds (row, col, cost, reduced cost)
+    for the unassigned allowed cells with the smallest reduced cost (how
+    much cheaper the cell must get before it can enter an optimal
+    assignment). tolerance[k] is exactly how much the k-th assigned
+    cell's cost can rise before the optimal assignment changes (inf if it
+    cannot change).
+    """
+    alternatives: list
+    tolerance: np.ndarray
+    u: np.ndarray = None
+    v: np.ndarray = None
+    reduced_costs: np.ndarray = None
+
+
+@dataclass
+class AssignmentResult:
+    """Optimal matching as parallel row/column index arrays
+
+    stats holds the phase timings and counters when the solve collected
+    them.
+    """
+    row_ind: np.ndarray
+    col_ind: np.ndarray
+    costs: np.ndarray
+    total: float
+    sensitivity: AssignmentSensitivity = None
+    stats: SolveStats = None
+
+
+def solve_assignment(cost_matrix, sensitivity=True, workers=None, stats=False):
+    """Minimum-cost assignment of rows (workers) to columns (tasks)
+
+    Every row is assigned if there are no more rows than columns,
+    otherwise every column. Raises ValueError if the forbidden pairs
+    leave no such assignment. workers > 1 runs the per-assignment
+    tolerance searches on a thread pool. stats=True (or an enclosing
+    stats.collect() block) attaches a SolveStats to the result.
+    """
+    with collect(stats) as collected:
+        with phase("assignment.solve"):
+            if issparse(cost_matrix):
+                cost_matrix = _as_csr(cost_matrix)
+                row_ind, col_ind = _sparse_matching(cost_matrix)
+                costs = np.asarray(cost_matrix[row_ind, col_ind]).ravel()
+            else:
+                cost_matrix = np.asarray(cost_matrix)
+                row_ind, col_ind = linear_sum_assignment(cost_matrix)
+                costs = cost_matrix[row_ind, col_ind]
+        result = AssignmentResult(row_ind, col_ind, costs, costs.sum())
+
+        if sensitivity:
+            result.sensitivity = assignment_sensitivity(cost_matrix, row_ind, col_ind,
+                                                        workers=workers)
+    result.stats = collected
+    return result
+
+
+def _as_csr(cost):
+    cost = csr_matrix(cost, dtype=float)
+    cost.sum_duplicates()
+    return cost
+
+
+def _sparse_matching(cost):
+    """Sparse Jonker-Volgenant; it treats zero weights as missing, so shift to >= 1
+
+    Every full matching has the same number of cells, so a constant
+    shift does not change which one is cheapest.
+    """
+    shifted = cost.copy()
+    if shifted.nnz:
+        shifted.data += 1.0 - shifted.data.min()
+    return min_weight_full_bipartite_matching(shifted)
+
+
+def assignment_sensitivity(cost_matrix, row_ind, col_ind, top=10, workers=None):
+    """Dual potentials, reduced costs, top alternatives and exact tolerances
+
+    Raises ValueError if the matching is not optimal.
+    """
+    with phase("assignment.sensitivity"):
+        return _assignment_sensitivity(cost_matrix, row_ind, col_ind, top, workers)
+
+
+def _assignment_sensitivity(cost_matrix, row_ind, col_ind, top, workers):
+    sparse = issparse(cost_matrix)
+    original = _as_csr(cost_matrix) if sparse else np.asarray(cost_matrix)
+    n_rows, n_cols = original.shape
+    if n_rows > n_cols:
+        flipped = _assignment_sensitivity(original.T, col_ind, row_ind, top, workers)
+        reduced = flipped.reduced_costs.T
+        return AssignmentSensitivity(
+            [(i, j, c, r) for j, i, c, r in flipped.alternatives], flipped.tolerance,
+            flipped.v, flipped.u, reduced.tocsr() if sparse else reduced,
+        )
+
+    cost = original if sparse else original.astype(float)
+    with phase("assignment.duals"):
+        sigma, graph, dist, (u, v) = _row_graph_duals(cost, row_ind, col_ind)
+    if sparse:
+        src, dst, lengths = graph
+        arc_costs = _clean(lengths + dist[src] - dist[dst])
+        arcs = lambda limit: _arcs_within(src, dst, arc_costs, limit)
+    else:
+        R = _clean(graph + dist[:, None] - dist[None, :])
+        np.fill_diagonal(R, np.inf)
+        arc_costs = R[np.isfinite(R)]
+        arcs = lambda limit: _matrix_arcs_within(R, limit)
+    with phase("assignment.tolerances"):
+        tolerance = _cycle_lengths(len(dist), np.arange(n_rows), arcs, arc_costs, workers)[row_ind]
+
+    if sparse:
+        rows = np.repeat(np.arange(n_rows), np.diff(cost.indptr))
+        real = cost.copy()
+        real.data = _clean(cost.data - u[rows] - v[cost.indices])
+        candidates = real.data.copy()
+        candidates[sigma[rows] == cost.indices] = np.inf
+        cells = lambda flat: (rows[flat], cost.indices[flat])
+    else:
+        real = _clean(cost - u[:, None] - v[None, :])
+        candidates = real.copy()
+        candidates[row_ind, col_ind] = np.inf
+        candidates = candidates.ravel()
+        cells = lambda flat: np.unravel_index(flat, cost.shape)
+
+    top_k = min(top, int(np.isfinite(candidates).sum()))
+    alternatives = []
+    if top_k > 0:
+        flat = np.argpartition(candidates, top_k - 1)[:top_k]
+        flat = flat[np.argsort(candidates[flat], kind="stable")]
+        alternatives = [(i, j, original[i, j], r)
+                        for i, j, r in zip(*cells(flat), candidates[flat])]
+
+    return AssignmentSensitivity(alternatives, tolerance, u, v, real)
+
+
+def assignment_duals(cost_matrix, row_ind, col_ind):
+    """Potentials (u, v) proving optimality of an assignment
+
+    u[i] + v[j] <= cost[i, j] on every allowed pair, with equality on the
+    assigned ones and zero on unassigned rows / columns. Raises
+    ValueError if the assignment is not optimal (no such potentials).
+    """
+    if issparse(cost_matrix):
+        cost = _as_csr(cost_matrix)
+    else:
+        cost = np.asarray(cost_matrix, dtype=float)
+    if cost.shape[0] > cost.shape[1]:
+        v, u = assignment_duals(cost.T, col_ind, row_ind)
+        return u, v
+    return _row_graph_duals(cost, row_ind, col_ind)[3]
+
+
+def _row_graph_duals(cost, row_ind, col_ind):
+    """sigma, row graph, its shortest distances and the duals (rows <= columns)
+
+    The graph is the arc-length matrix for a dense cost and (src, dst,
+    length) arrays for a csr one.
+    """
+    n_rows, n_cols = cost.shape
+    sigma = np.empty(n_rows, dtype=np.intp)
+    sigma[row_ind] = col_ind
+    free = np.setdiff1d(np.arange(n_cols), col_ind)
+    matched = np.asarray(cost[np.arange(n_rows), sigma]).ravel()
+    if issparse(cost):
+        src, dst, lengths, nodes = _sparse_row_graph(cost, sigma, matched, free)
+        dist = _sparse_distances(src, dst, lengths, nodes, EPS * _scale(cost.data))
+        graph = (src, dst, lengths)
+    else:
+        graph = _dense_row_graph(cost, sigma, matched, free)
+        dist = _dense_distances(graph, EPS * _scale(cost))
+    return sigma, graph, dist, _potentials(dist, sigma, matched, free, n_cols)
+
+
+def _scale(values):
+    values = np.abs(values)
+    return max(1.0, values.max(initial=0.0, where=np.isfinite(values)))
+
+
+def _clean(values):
+    """Zero out round-off below EPS relative to the largest finite value"""
+    return np.where(np.abs(values) < EPS * _scale(values), 0.0, values)
+
+
+# The row graph has one node per row (rows <= columns) standing for that
+# row in its assigned column, plus a node F for all free columns when
+# there are more columns than rows. Arc i -> k has length
+# cost[i, sigma[k]] - cost[k, sigma[k]] ("row i takes row k's column"),
+# i -> F takes i's cheapest free column and F -> k frees row k's column.
+# Shortest distances give the duals, and the cycles are exactly the ways
+# to change the assignment.
+
+def _dense_row_graph(cost, sigma, matched, free):
+    """Arc lengths W[i, k] of the row graph as a matrix"""
+    m = len(sigma)
+    nodes = m + (len(free) > 0)
+    graph = np.zeros((nodes, nodes))
+    graph[:m, :m] = cost[:, sigma]
+    if len(free):
+        graph[:m, m] = cost[:, free].min(axis=1)
+    return graph - np.append(matched, 0.0)[None, :nodes]
+
+
+def _dense_distances(W, tol):
+    """Shortest distances from a virtual source joined to every node
+
+    Bellman-Ford relaxes DUAL_BLOCK nodes at a time against all nodes
+    (one vectorized min per block), using updated distances as soon as a
+    block is done. Raises ValueError if distances still fall after one
+    sweep per node: a negative cycle, so the matching is not optimal.
+    """
+    nodes = len(W)
+    into = np.ascontiguousarray(W.T)  # into[k, i] = W[i, k]
+    dist = np.zeros(nodes)
+    for _ in range(nodes + 1):
+        changed = False
+        for lo in range(0, nodes, DUAL_BLOCK):
+            hi = min(lo + DUAL_BLOCK, nodes)
+            best = (into[lo:hi] + dist[None, :]).min(axis=1)
+            better = best < dist[lo:hi] - tol
+            if better.any():
+                dist[lo:hi][better] = best[better]
+                changed = True
+        if not changed:
+            return dist
+    raise ValueError("matching is not optimal")
+
+
+def _sparse_row_graph(cost, sigma, matched, free):
+    """Arcs (src, dst, length) of the row graph over the allowed pairs"""
+    m, n = cost.shape
+    nodes = m + (len(free) > 0)
+    owner = np.full(n, m, dtype=np.intp)
+    owner[sigma] = np.arange(m)
+    rows = np.repeat(np.arange(m), np.diff(cost.indptr))
+    dst = owner[cost.indices]
+
+    real = (dst < m) & (dst != rows)
+    src, dsts, lengths = [rows[real]], [dst[real]], [cost.data[real] - matched[dst[real]]]
+    if nodes > m:
+        # one arc to F per row (its cheapest free column) and F -> every row
+        to_free = np.full(m, np.inf)
+        np.minimum.at(to_free, rows[dst == m], cost.data[dst == m])
+        reach = np.flatnonzero(np.isfinite(to_free))
+        src += [reach, np.full(m, m)]
+        dsts += [np.full(len(reach), m), np.arange(m)]
+        lengths += [to_free[reach], -matched]
+    return np.concatenate(src), np.concatenate(dsts), np.concatenate(lengths), nodes
+
+
+def _sparse_distances(src, dst, lengths, nodes, tol):
+    """Shortest distances from a virtual source joined to every node
+
+    Bellman-Ford over the arc list: each sweep is one vectorized min per
+    target over its incoming arcs. Raises ValueError if distances still
+    fall after one sweep per node (a negative cycle: the matching is not
+    optimal).
+    """
+    order = np.argsort(dst, kind="stable")
+    src, lengths = src[order], lengths[order]
+    targets, starts = np.unique(dst[order], return_index=True)
+    dist = np.zeros(nodes)
+    if not len(targets):
+        return dist
+    for _ in range(nodes + 1):
+        best = np.minimum.reduceat(dist[src] + lengths, starts)
+        better = best < dist[targets] - tol
+        if not better.any():
+            return dist
+        dist[targets[better]] = best[better]
+    raise ValueError("matching is not optimal")
+
+
+def _potentials(dist, sigma, matched, free, n_cols):
+    """Row / column duals from row-graph distances, zero on free columns"""
+    m = len(sigma)
+    shift = dist[m] if len(free) else 0.0
+    u = shift - dist[:m]
+    v = np.zeros(n_cols)
+    v[sigma] = dist[:m] + matched - shift
+    return u, v
+
+
+def _matrix_arcs_within(R, limit):
+    rows, cols = np.nonzero(R <= limit)
+    return rows, cols, R[rows, cols]
+
+
+def _arcs_within(src, dst, lengths, limit):
+    keep = lengths <= limit
+    return src[keep], dst[keep], lengths[keep]
+
+
+def _cycle_lengths(nodes, sources, arcs, arc_costs, workers=None):
+    """Length of the cheapest cycle through each source node of the row graph
+
+    arcs(limit) returns (src, dst, reduced cost) of the arcs no dearer
+    than limit, arc_costs the reduced costs of all arcs. The cheapest
+    cycle through row i is the extra cost of the best assignment without
+    i's current cell. Zero-length cycles are read off the strong
+    components of the zero arcs. The rest come from Dijkstra searches
+    limited to arcs of length <= T: a cycle found with length <= T is
+    exact, since a shorter one could only use arcs <= T as well; sources
+    without one are retried with T four times larger, and once every arc
+    is in the graph the search runs unbounded.
+    """
+    lengths = np.full(nodes, np.inf)
+    src, dst, _ = arcs(0.0)
+    zero = csr_matrix((np.ones(len(src)), (src, dst)), shape=(nodes, nodes))
+    _, labels = connected_components(zero, directed=True, connection="strong")
+    on_cycle = np.bincount(labels)[labels] > 1
+    lengths[on_cycle] = 0.0
+
+    positive = arc_costs[(arc_costs > 0) & np.isfinite(arc_costs)]
+    todo = sources[~on_cycle[sources]]
+    if len(positive) == 0:
+        return lengths
+    k = min(ARCS_PER_ROW * nodes, len(positive) - 1)
+    limit = np.partition(positive, k)[k]
+    largest = positive.max()
+
+    pool = ThreadPoolExecutor(workers) if workers and workers > 1 else None
+    try:
+        while len(todo):
+            complete = limit >= largest
+            src, dst, length = arcs(limit)
+            graph = csr_matrix((length, (src, dst)), shape=(nodes, nodes))
+            back = csr_matrix((length, (dst, src)), shape=(nodes, nodes))
+            chunks = [todo[lo:lo + SOURCE_CHUNK] for lo in range(0, len(todo), SOURCE_CHUNK)]
+            bound = np.inf if complete else limit
+            count("assignment.cycle_rounds")
+            count("assignment.cycle_searches", len(todo))
+            searches = [(graph, back, sources, bound) for sources in chunks]
+            found = np.concatenate(list(pool.map(_bounded_cycles, *zip(*searches)) if pool
+                                        else map(_bounded_cycles, *zip(*searches))))
+            exact = (found <= limit) | complete
+            lengths[todo[exact]] = found[exact]
+            todo = todo[~exact]
+            limit *= 4
+    finally:
+        if pool:
+            pool.shutdown()
+    return lengths
+
+
+def _bounded_cycles(graph, back, sources, limit):
+    """Cheapest cycle through each source using paths no longer than limit
+
+    back is the transposed graph: its row s lists the arcs closing a
+    cycle at s.
+    """
+    dist = dijkstra(graph, indices=sources, limit=limit)
+    closing = back[sources].tocoo()
+    found = np.full(len(sources), np.inf)
+    np.minimum.at(found, closing.row, dist[closing.row, closing.col] + closing.data)
+    return found
@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+"""
+Batch assignment engine: solve many independent assignment problems (one
+per production cell and shift, say) in one call, in chunks spread over a
+process pool so per-problem Python overhead is amortized.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+import numpy as np
+from scipy.optimize import linear_sum_assignment
+
+# Problems handed to a worker process at a time
+DEFAULT_CHUNKSIZE = 256
+
+
+@dataclass
+class AssignmentBatchResults:
+    """One optimal matching per problem, in input order
+
+    Problem k's pairs are row_ind[offsets[k]:offsets[k + 1]] (likewise
+    col_ind), sorted by row. For a 3-D stack every feasible problem has
+    min(rows, cols) pairs, so when all are feasible
+    row_ind.reshape(len(totals), -1) gives one row per problem. totals is
+    NaN, and the pair range empty, where forbidden pairs (inf) leave no
+    complete assignment.
+    """
+    row_ind: np.ndarray
+    col_ind: np.ndarray
+    offsets: np.ndarray
+    totals: np.ndarray
+
+    def pairs(self, k):
+        """(row_ind, col_ind) of problem k"""
+        part = slice(self.offsets[k], self.offsets[k + 1])
+        return self.row_ind[part], self.col_ind[part]
+
+
+def _solve_chunk(matrices):
+    rows, cols = [], []
+    counts = np.zeros(len(matrices), dtype=np.int64)
+    totals = np.full(len(matrices), np.nan)
+    for k, cost in enumerate(matrices):
+        try:
+            row_ind, col_ind = linear_sum_assignment(cost)
+        except ValueError:
+            continue
+        rows.append(row_ind)
+        cols.append(col_ind)
+        counts[k] = len(row_ind)
+        totals[k] = cost[row_ind, col_ind].sum()
+    empty = [np.zeros(0, dtype=np.intp)]
+    return np.concatenate(rows or empty), np.concatenate(cols or empty), counts, totals
+
+
+def solve_assignment_batch(costs, processes=None, chunksize=DEFAULT_CHUNKSIZE):
+    """
+    Minimum-cost assignment for every cost matrix in costs.
+
+    costs is a 3-D array (problems x rows x columns) or a list of 2-D
+    matrices of any shapes. Work is spread over a process pool in chunks
+    of chunksize (slices of a 3-D stack travel as single arrays);
+    processes=None uses every core, processes=1 solves inline.
+    """
+    if isinstance(costs, np.ndarray):
+        if costs.ndim != 3:
+            raise ValueError("costs must be a 3-D stack or a list of matrices")
+    else:
+        costs = [np.asarray(cost) for cost in costs]
+    if processes is None:
+        processes = os.cpu_count() or 1
+
+    chunks = [costs[k:k + chunksize] for k in range(0, len(costs), chunksize)]
+    if processes <= 1 or len(chunks) <= 1:
+        parts = [_solve_chunk(chunk) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(processes) as pool:
+            parts = list(pool.map(_solve_chunk, chunks))
+
+    if not parts:
+        parts = [_solve_chunk([])]
+    row_ind, col_ind, counts, totals = (np.concatenate(arrays) for arrays in zip(*parts))
+    offsets = np.concatenate([[0], np.cumsum(counts)])
+    return AssignmentBatchResults(row_ind, col_ind, offsets, totals)
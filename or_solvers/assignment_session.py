@@ -0,0 +1,297 @@
+# -*- coding: utf-8 -*-
+"""
+Incremental assignment session: keeps the optimal matching and its dual
+potentials so that edits to single cells, rows or columns are absorbed
+by a few shortest augmenting path steps (O(n^2) each) instead of a cold
+O(n^3) Hungarian solve.
+"""
+
+import numpy as np
+from scipy.optimize import linear_sum_assignment
+
+from .assignment import EPS, AssignmentResult, _scale, assignment_duals, assignment_sensitivity
+
+
+class AssignmentSession:
+    """
+    Optimal assignment of rows (workers) to columns (tasks) held together
+    with dual potentials u, v: u[i] + v[j] <= cost[i, j] everywhere, with
+    equality on assigned cells. There may be more columns than rows; then
+    every row is assigned and v is <= 0, with v = 0 on free columns.
+    Forbidden pairs are inf.
+
+    Every edit frees only the rows whose optimality conditions it breaks,
+    lowers their u back to feasibility and re-assigns each with one
+    Dijkstra search over reduced costs. Edits return the new result; if
+    the forbidden pairs leave some row unassignable they raise
+    ValueError, status becomes "infeasible" and the row stays free until
+    a later edit lets it be placed. Use copy() to try a what-if without
+    keeping it.
+    """
+
+    def __init__(self, cost_matrix, result=None):
+        self.cost = np.array(cost_matrix, dtype=float)
+        n_rows, n_cols = self.cost.shape
+        if n_rows > n_cols:
+            raise ValueError("AssignmentSession needs at least as many columns (tasks) as rows (workers)")
+
+        if result is None:
+            row_ind, col_ind = linear_sum_assignment(self.cost)
+        else:
+            row_ind, col_ind = result.row_ind, result.col_ind
+        self.u, self.v = assignment_duals(self.cost, row_ind, col_ind)
+        self.row_to_col = np.full(n_rows, -1, dtype=np.intp)
+        self.col_to_row = np.full(n_cols, -1, dtype=np.intp)
+        self.row_to_col[row_ind] = col_ind
+        self.col_to_row[col_ind] = row_ind
+        self.augmentations = 0
+        self.status = "optimal"
+        self._tol = EPS * _scale(self.cost)
+
+    @classmethod
+    def from_duals(cls, cost_matrix, col_ind, u, v):
+        """Session for a known optimal matching (row i -> col_ind[i]) and its duals
+
+        Skips the initial solve; u and v must satisfy the conditions in
+        the class docstring for cost_matrix.
+        """
+        session = object.__new__(cls)
+        session.cost = np.asarray(cost_matrix, dtype=float)
+        session.u = np.array(u, dtype=float)
+        session.v = np.array(v, dtype=float)
+        session.row_to_col = np.array(col_ind, dtype=np.intp)
+        session.col_to_row = np.full(session.cost.shape[1], -1, dtype=np.intp)
+        session.col_to_row[session.row_to_col] = np.arange(len(session.row_to_col))
+        session.augmentations = 0
+        session.status = "optimal"
+        session._tol = EPS * _scale(session.cost)
+        return session
+
+    @property
+    def shape(self):
+        return self.cost.shape
+
+    def copy(self):
+        """Independent session with its own cost matrix"""
+        other = object.__new__(AssignmentSession)
+        other.__dict__.update({k: v.copy() if isinstance(v, np.ndarray) else v
+                               for k, v in self.__dict__.items()})
+        return other
+
+    # -----------------------------------------------------------------
+    # Edits
+    # -----------------------------------------------------------------
+    def set_cost(self, i, j, value):
+        """Change one cell (inf forbids the pair)"""
+        old = self.cost[i, j]
+        self._set(np.s_[i, j], value)
+        if self.status != "optimal":
+            return self._reassign(rows=[i])
+        if self.row_to_col[i] == j:
+            if value <= old:
+                self.u[i] = value - self.v[j]  # only loosens row i
+                return self.result()
+            return self._reassign(rows=[i])
+        if value - self.u[i] - self.v[j] < -self._tol:
+            return self._reassign(rows=[i])
+        return self.result()
+
+    def set_row(self, i, costs):
+        """Replace all costs of row i (a worker's times or qualifications)"""
+        self._set(np.s_[i, :], costs)
+        return self._reassign(rows=[i])
+
+    def set_rows(self, rows, costs):
+        """Replace the costs of several rows at once
+
+        Every row is re-priced before any is re-assigned; replacing them
+        one by one with set_row would augment over the stale duals of
+        the rows still to come.
+        """
+        rows = list(rows)
+        for i, row in zip(rows, costs):
+            self._set(np.s_[i, :], row)
+        return self._reassign(rows=rows)
+
+    def set_column(self, j, costs):
+        """Replace all costs of column j (a task's times)"""
+        self._set(np.s_[:, j], costs)
+        return self._reassign(cols=[j])
+
+    def fix(self, i, j):
+        """Pin row i to column j by forbidding the rest of row i and column j"""
+        keep = self.cost[i, j]
+        self.cost[i, :] = np.inf
+        self.cost[:, j] = np.inf
+        self.cost[i, j] = keep
+        if self.status == "optimal" and self.row_to_col[i] == j:
+            return self.result()
+        return self._reassign(rows=[i], cols=[j])
+
+    def add_row(self, costs):
+        """New worker as the last row"""
+        n_rows, n_cols = self.shape
+        if n_rows == n_cols:
+            raise ValueError("cannot add a row: every column is already assigned")
+        self.cost = np.vstack([self.cost, np.asarray(costs, dtype=float)])
+        self.u = np.append(self.u, 0.0)
+        self.row_to_col = np.append(self.row_to_col, -1)
+        self._tol = max(self._tol, EPS * _scale(self.cost[-1]))
+        return self._reassign(rows=[n_rows])
+
+    def remove_row(self, i):
+        """Drop worker i; later rows shift down by one"""
+        j = self.row_to_col[i]
+        wide = self.shape[0] < self.shape[1]
+        self.cost = np.delete(self.cost, i, axis=0)
+        self.u = np.delete(self.u, i)
+        self.row_to_col = np.delete(self.row_to_col, i)
+        self.col_to_row[self.col_to_row > i] -= 1
+        cols = []
+        if j >= 0:
+            self.col_to_row[j] = -1
+            cols = [j]
+        if not wide:
+            self._widen()
+        return self._reassign(cols=cols)
+
+    def add_column(self, costs):
+        """New task as the last column"""
+        wide = self.shape[0] < self.shape[1]
+        self.cost = np.column_stack([self.cost, np.asarray(costs, dtype=float)])
+        self.v = np.append(self.v, 0.0)
+        self.col_to_row = np.append(self.col_to_row, -1)
+        self._tol = max(self._tol, EPS * _scale(self.cost[:, -1]))
+        if not wide:
+            self._widen()
+        return self._reassign(cols=[self.shape[1] - 1])
+
+    def remove_column(self, j):
+        """Drop task j; later columns shift down by one"""
+        n_rows, n_cols = self.shape
+        if n_rows == n_cols:
+            raise ValueError("cannot remove a column: every row needs one")
+        k = self.col_to_row[j]
+        self.cost = np.delete(self.cost, j, axis=1)
+        self.v = np.delete(self.v, j)
+        self.col_to_row = np.delete(self.col_to_row, j)
+        self.row_to_col[self.row_to_col > j] -= 1
+        rows = []
+        if k >= 0:
+            self.row_to_col[k] = -1
+            rows = [k]
+        return self._reassign(rows=rows)
+
+    # -----------------------------------------------------------------
+    # Current solution
+    # -----------------------------------------------------------------
+    def result(self, sensitivity=False):
+        """AssignmentResult for the current matching"""
+        if self.status != "optimal":
+            raise ValueError("no assignment places every row within the allowed pairs")
+        row_ind = np.arange(self.shape[0])
+        col_ind = self.row_to_col.copy()
+        costs = self.cost[row_ind, col_ind]
+        result = AssignmentResult(row_ind, col_ind, costs, costs.sum())
+        if sensitivity:
+            result.sensitivity = assignment_sensitivity(self.cost, row_ind, col_ind)
+        return result
+
+    # -----------------------------------------------------------------
+    # Internals
+    # -----------------------------------------------------------------
+    def _set(self, index, values):
+        self.cost[index] = values
+        self._tol = max(self._tol, EPS * _scale(np.atleast_1d(self.cost[index])))
+
+    def _widen(self):
+        """Shift the duals so that v <= 0, as needed once a column can stay free"""
+        shift = self.v.max()
+        self.v -= shift
+        self.u += shift
+
+    def _reassign(self, rows=(), cols=()):
+        """Free what the edit broke, restore dual feasibility and augment
+
+        A freed row takes u = min_j (cost - v), the largest feasible
+        value. A freed column is left alone when every column ends up
+        assigned; otherwise it needs v = 0, and raising it may in turn
+        free rows that now price it below zero.
+        """
+        wide = self.shape[0] < self.shape[1]
+        rows, cols = list(rows), list(cols)
+        if wide:
+            cols.extend(np.flatnonzero((self.col_to_row < 0) & (self.v != 0.0)))
+        while rows or cols:
+            while cols:
+                j = cols.pop()
+                k = self.col_to_row[j]
+                if k >= 0:
+                    self.col_to_row[j] = self.row_to_col[k] = -1
+                    rows.append(k)
+                if wide:
+                    self.v[j] = 0.0
+                    rows.extend(np.flatnonzero(self.cost[:, j] - self.u < -self._tol))
+                else:
+                    slack = self.cost[:, j] - self.u
+                    self.v[j] = slack.min() if np.isfinite(slack).any() else 0.0
+            while rows and not cols:
+                i = rows.pop()
+                j = self.row_to_col[i]
+                if j >= 0:
+                    self.row_to_col[i] = self.col_to_row[j] = -1
+                    if wide:
+                        cols.append(j)
+                slack = self.cost[i] - self.v
+                self.u[i] = slack.min() if np.isfinite(slack).any() else 0.0
+
+        self.status = "optimal"
+        for i in np.flatnonzero(self.row_to_col < 0):
+            if not self._augment(i):
+                self.status = "infeasible"
+        return self.result()
+
+    def _augment(self, start):
+        """Assign free row start along a shortest augmenting path
+
+        Dijkstra over columns with reduced costs as lengths stops at the
+        first free column; the duals of the scanned columns then shift by
+        their distance so the whole path has zero reduced cost. Returns
+        False if no free column is reachable.
+        """
+        cost, u, v = self.cost, self.u, self.v
+        n_cols = self.shape[1]
+        dist = cost[start] - u[start] - v
+        pred = np.full(n_cols, start, dtype=np.intp)
+        scanned = np.zeros(n_cols, dtype=bool)
+        open_dist = dist.copy()
+        while True:
+            j = int(np.argmin(open_dist))
+            delta = open_dist[j]
+            if not np.isfinite(delta):
+                return False
+            k = self.col_to_row[j]
+            if k < 0:
+                break
+            scanned[j] = True
+            open_dist[j] = np.inf
+            through = delta + cost[k] - u[k] - v
+            better = (through < dist) & ~scanned
+            dist[better] = through[better]
+            open_dist[better] = through[better]
+            pred[better] = k
+
+        done = np.flatnonzero(scanned)
+        v[done] += dist[done] - delta
+        owners = self.col_to_row[done]
+        u[owners] -= dist[done] - delta
+        u[start] += delta
+
+        while True:
+            i = pred[j]
+            self.col_to_row[j] = i
+            j, self.row_to_col[i] = self.row_to_col[i], j
+            if i == start:
+                break
+        self.augmentations += 1
+        return True
@@ -0,0 +1,360 @@
+# -*- coding: utf-8 -*-
+"""
+Content-addressed cache of solver results.
+
+A solve is keyed by a hash of its instance arrays and options, so the
+same model solved again (a GUI button, a dashboard refresh, a repeated
+scenario) returns the stored result instead of solving. Entries are kept
+in memory up to a byte budget, evicting the least recently used; with a
+directory every entry is also pickled to disk, so later processes hit
+too.
+
+A miss still looks for a near match, the most recent cached solve with
+the same structure (the same A for an LP, the same shape for assignment
+and transportation), and warm-starts from its basis when only b, c,
+costs or supply / demand changed.
+"""
+
+import copy
+import hashlib
+import os
+import pickle
+import sys
+import tempfile
+from collections import OrderedDict
+from dataclasses import fields, is_dataclass
+
+import numpy as np
+from scipy.sparse import csr_matrix, issparse
+
+from .assignment import solve_assignment
+from .assignment_session import AssignmentSession
+from .lp_session import LPSession
+from .simplex import optimal_basis, simplex_sensitivity, solve_simplex
+from .stats import count
+from .transportation import ZERO, solve_transportation
+
+# Default memory budget of a SolveCache (bytes of cached results)
+DEFAULT_MAX_BYTES = 256 * 2**20
+# Changed cost rows, as a fraction of all rows, up to which a transportation
+# problem starts from the cached basis rather than from VAM
+WARM_ROWS = 0.5
+# Changed rows up to which an assignment is re-solved incrementally; beyond
+# that the C Hungarian solve is faster than one augmenting search per row
+WARM_ASSIGNMENT_ROWS = 2
+
+
+def cache_key(name, *args, **kwargs):
+    """Hex digest of a solver call: its name and the content of every argument
+
+    Arrays are hashed by value (as float64), sparse matrices by their
+    canonical csr form, so equal instances get equal keys however they
+    were built.
+    """
+    digest = hashlib.blake2b(name.encode(), digest_size=16)
+    for value in args:
+        _feed(digest, value)
+    for option in sorted(kwargs):
+        digest.update(option.encode())
+        _feed(digest, kwargs[option])
+    return digest.hexdigest()
+
+
+def _feed(digest, value):
+    if issparse(value):
+        value = csr_matrix(value, dtype=float)
+        value.sum_duplicates()
+        digest.update(f"csr{value.shape}".encode())
+        for part in (value.data, value.indices, value.indptr):
+            _feed(digest, part)
+    elif isinstance(value, (np.ndarray, list, tuple, int, float)) and not isinstance(value, bool):
+        array = np.asarray(value)
+        if array.dtype.kind in "biuf":
+            array = np.ascontiguousarray(array, dtype=float)
+            digest.update(f"{array.shape}".encode())
+            digest.update(array.data)
+        else:
+            digest.update(repr(value).encode())
+    else:
+        digest.update(repr(value).encode())
+    digest.update(b";")
+
+
+def _nbytes(value):
+    """Approximate memory held by a result: its arrays plus container overhead"""
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if issparse(value):
+        return sum(part.nbytes for part in vars(value).values() if isinstance(part, np.ndarray))
+    if is_dataclass(value):
+        return sys.getsizeof(value) + sum(_nbytes(getattr(value, f.name)) for f in fields(value))
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(_nbytes(item) for item in value)
+    return sys.getsizeof(value)
+
+
+def _row_digests(cost):
+    """8-byte digest of every row of a dense or sparse cost"""
+    if issparse(cost):
+        cost = csr_matrix(cost, dtype=float)
+        cost.sum_duplicates()
+        rows = (cost.data[start:stop] for start, stop in zip(cost.indptr[:-1], cost.indptr[1:]))
+    else:
+        rows = np.asarray(cost, dtype=float)
+    return [hashlib.blake2b(row.tobytes(), digest_size=8).digest() for row in rows]
+
+
+def _changed_rows(old, new):
+    return [i for i, (a, b) in enumerate(zip(old, new)) if a != b]
+
+
+class SolveCache:
+    """LRU cache of solver results keyed by instance content
+
+    solve_simplex, solve_assignment and solve_transportation take the
+    arguments of the module functions of the same name and return their
+    results. get / put with cache_key cache any other call (the GUI
+    caches its background solves this way). Results are handed out as
+    copies, so callers may modify them.
+
+    Memory is bounded by max_bytes; a result larger than that is only
+    kept on disk. The disk tier (directory) is not bounded: clear()
+    empties it. hits and misses count get calls, warm_starts the solves
+    that started from the basis or matching of a near match (not those
+    that rejected it and solved cold).
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES, directory=None):
+        self.max_bytes = max_bytes
+        self.directory = directory
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+        self._entries = OrderedDict()  # key -> (result, warm, family, nbytes)
+        self._families = {}  # family -> OrderedDict of keys, most recent last
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.warm_starts = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries or (self.directory is not None
+                                        and os.path.exists(self._path(key)))
+
+    # -----------------------------------------------------------------
+    # Storage
+    # -----------------------------------------------------------------
+    def get(self, key):
+        """Copy of the result cached under key, or None"""
+        entry = self._entries.get(key)
+        if entry is None and self.directory is not None:
+            entry = self._load(key)
+            if entry is not None:
+                self._insert(key, entry)
+        if entry is None:
+            self.misses += 1
+            count("cache.misses")
+            return None
+        self.hits += 1
+        count("cache.hits")
+        if key in self._entries:  # not if only the disk can hold it
+            self._touch(key, entry[2])
+        return copy.deepcopy(entry[0])
+
+    def put(self, key, result, family=None, warm=None):
+        """Cache result under key
+
+        warm is what a near match of the same family needs to warm-start
+        (a basis, or a matching and its duals).
+        """
+        entry = (result, warm, family, _nbytes(result) + _nbytes(warm))
+        self._insert(key, entry)
+        if self.directory is not None:
+            self._store(key, entry)
+
+    def near(self, family):
+        """warm data of the most recently used entry of family, or None"""
+        keys = self._families.get(family)
+        if not keys:
+            return None
+        key = next(reversed(keys))
+        self._touch(key, family)
+        return self._entries[key][1]
+
+    def clear(self):
+        """Drop every entry, on disk too"""
+        self._entries.clear()
+        self._families.clear()
+        self.nbytes = 0
+        if self.directory is not None:
+            for name in os.listdir(self.directory):
+                if name.endswith(".pkl"):
+                    os.remove(os.path.join(self.directory, name))
+
+    def _insert(self, key, entry):
+        self._discard(key)
+        if entry[3] > self.max_bytes:
+            return
+        self._entries[key] = entry
+        self.nbytes += entry[3]
+        if entry[2] is not None:
+            self._families.setdefault(entry[2], OrderedDict())[key] = None
+        while self.nbytes > self.max_bytes:
+            self._discard(next(iter(self._entries)))
+
+    def _discard(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self.nbytes -= entry[3]
+        keys = self._families.get(entry[2])
+        if keys is not None:
+            keys.pop(key, None)
+            if not keys:
+                del self._families[entry[2]]
+
+    def _touch(self, key, family):
+        self._entries.move_to_end(key)
+        if family is not None:
+            self._families[family].move_to_end(key)
+
+    def _path(self, key):
+        return None if self.directory is None else os.path.join(self.directory, key + ".pkl")
+
+    def _store(self, key, entry):
+        """Pickle entry next to its final name, then rename (readers never see half a file)"""
+        with tempfile.NamedTemporaryFile(dir=self.directory, suffix=".tmp", delete=False) as f:
+            pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(f.name, self._path(key))
+
+    def _load(self, key):
+        try:
+            with open(self._path(key), "rb") as f:
+                return pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except (pickle.UnpicklingError, EOFError):
+            return None  # truncated or foreign file: treat as a miss
+
+    # -----------------------------------------------------------------
+    # Cached solvers
+    # -----------------------------------------------------------------
+    def solve_simplex(self, c, A, b, sensitivity=True):
+        """solve_simplex, warm-started by LPSession from a cached basis for the same A"""
+        family = ("lp", cache_key("A", A))
+        key = cache_key("solve_simplex", c, b, sensitivity, family[1])
+        result = self.get(key)
+        if result is not None:
+            return result
+
+        basis = self.near(family)
+        result = None
+        if basis is not None:
+            try:
+                session = LPSession.from_basis(c, A, b, basis)
+                result = session.reoptimize()
+            except np.linalg.LinAlgError:
+                result = None
+            else:
+                if session.cold_solves == 0:
+                    self.warm_starts += 1
+                    count("cache.warm_starts")
+                if result.success and sensitivity:
+                    result.sensitivity = simplex_sensitivity(A, b, c, result)
+        if result is None:
+            result = solve_simplex(c, A, b, sensitivity=sensitivity)
+
+        if result.success:
+            if result.sensitivity is not None:
+                basis = result.sensitivity.basis
+            else:
+                basis = optimal_basis(A, result)
+            self.put(key, result, family, basis)
+        else:
+            self.put(key, result)
+        return copy.deepcopy(result)
+
+    def solve_assignment(self, cost_matrix, sensitivity=True):
+        """solve_assignment, re-assigning only the changed rows of a cached matching
+
+        A dense cost of the same shape as a cached solve with sensitivity
+        that differs in at most WARM_ASSIGNMENT_ROWS rows is re-solved by
+        AssignmentSession from the cached matching and duals.
+        """
+        key = cache_key("solve_assignment", cost_matrix, sensitivity)
+        result = self.get(key)
+        if result is not None:
+            return result
+
+        family = digests = None
+        if not issparse(cost_matrix):
+            rows, cols = np.shape(cost_matrix)
+            if rows <= cols:
+                family = ("assignment", rows, cols)
+                digests = _row_digests(cost_matrix)
+        warm = self.near(family) if family is not None else None
+        result = None
+        if warm is not None:
+            col_ind, u, v, old_digests = warm
+            changed = _changed_rows(old_digests, digests)
+            if len(changed) <= WARM_ASSIGNMENT_ROWS:
+                cost = np.array(cost_matrix, dtype=float)
+                session = AssignmentSession.from_duals(cost, col_ind, u, v)
+                try:
+                    session.set_rows(changed, cost[changed])
+                    result = session.result(sensitivity=sensitivity)
+                    self.warm_starts += 1
+                    count("cache.warm_starts")
+                except ValueError:
+                    result = None  # let the cold solve raise its own error
+
+        if result is None:
+            result = solve_assignment(cost_matrix, sensitivity=sensitivity)
+        if family is not None and result.sensitivity is not None:
+            sens = result.sensitivity
+            self.put(key, result, family, (result.col_ind, sens.u, sens.v, digests))
+        else:
+            self.put(key, result)
+        return copy.deepcopy(result)
+
+    def solve_transportation(self, cost, supply, demand, sensitivity=True,
+                             shortage_penalty=0.0, overflow_penalty=0.0):
+        """solve_transportation, started from the basis of a cached plan of the same shape
+
+        The cached basis is the start when at most WARM_ROWS of the cost
+        rows changed; it stays feasible when only costs or penalties
+        changed, and for new supply / demand it is used if it still is
+        (otherwise the solve starts from VAM as usual).
+        """
+        key = cache_key("solve_transportation", cost, supply, demand, sensitivity,
+                        shortage_penalty, overflow_penalty)
+        result = self.get(key)
+        if result is not None:
+            return result
+
+        gap = float(np.sum(supply) - np.sum(demand))
+        tol = ZERO * max(1.0, float(np.sum(supply)), float(np.sum(demand)))
+        side = 0 if abs(gap) <= tol else int(np.sign(gap))
+        pattern = None
+        if issparse(cost):
+            lanes = csr_matrix(cost)
+            lanes.sum_duplicates()
+            pattern = cache_key("lanes", lanes.indices, lanes.indptr)
+        family = ("transportation", np.shape(cost), pattern, side)
+        digests = _row_digests(cost)
+
+        basis = None
+        warm = self.near(family)
+        if warm is not None:
+            changed = _changed_rows(warm[1], digests)
+            if len(changed) <= WARM_ROWS * len(digests):
+                basis = warm[0]
+        result = solve_transportation(cost, supply, demand, sensitivity, shortage_penalty,
+                                      overflow_penalty, basis=basis)
+        if result.warm_start:
+            self.warm_starts += 1
+            count("cache.warm_starts")
+        self.put(key, result, family, (result.basis, digests))
+        return copy.deepcopy(result)
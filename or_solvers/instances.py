@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+"""
+TechElectro Manufacturing example instances used by the GUI.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+
+@dataclass
+class LPInstance:
+    """Product-mix LP in linprog form: minimize c @ x s.t. A @ x <= b, x >= 0
+
+    integer, if set, flags the products that must take whole values (as
+    declared in a model file); pass it on to solve_integer.
+    """
+    c: list
+    A: list
+    b: list
+    products: list
+    constraint_names: list
+    integer: np.ndarray = None
+
+
+@dataclass
+class AssignmentInstance:
+    """Worker/task cost matrix with row and column labels"""
+    cost_matrix: np.ndarray
+    workers: list
+    tasks: list
+
+
+@dataclass
+class TransportationInstance:
+    """Factory/warehouse unit costs with supply and demand vectors
+
+    Supply and demand may differ; unmet demand costs shortage_penalty and
+    unshipped supply overflow_penalty per unit (scalars or per-line arrays).
+    """
+    cost_matrix: np.ndarray
+    supply: np.ndarray
+    demand: np.ndarray
+    factories: list
+    warehouses: list
+    shortage_penalty: object = 0.0
+    overflow_penalty: object = 0.0
+
+
+def techelectro_lp():
+    """10-product, 10-resource production planning model"""
+    # Maximize → we minimize negative profits
+    c = [-150, -200, -300, -180, -220, -120, -80, -100, -60, -50]
+    A = [
+        [2, 3, 4, 2.5, 3, 1.5, 1, 1.5, 0.5, 0.5],
+        [5, 4, 8, 6, 7, 3, 2, 3, 1, 1],
+        [3, 5, 6, 4, 5, 2, 1, 2, 0.5, 0.5],
+        [4, 5, 7, 4, 6, 2, 1.5, 2, 1, 1],
+        [1, 2, 3, 1.5, 2, 1, 0.5, 1, 0.3, 0.3],
+        [0.5, 0.8, 1, 0.7, 0.9, 0.4, 0.3, 0.4, 0.2, 0.2],
+        [1, 1, 1.5, 1, 1.2, 0.8, 0.5, 0.7, 0.3, 0.3],
+        [3, 4, 5, 3.5, 4, 2, 1, 2, 0.5, 0.5],
+        [2, 3, 4, 2.5, 3.5, 1, 0.8, 1.2, 0.4, 0.4],
+        [100, 150, 250, 120, 180, 80, 50, 70, 30, 25],
+    ]
+    b = [8000, 15000, 12000, 10000, 5000, 2000, 3500, 9000, 7000, 400000]
+
+    products = [
+        "Smartphones (X1)",
+        "Tablets (X2)",
+        "Laptops (X3)",
+        "Monitors (X4)",
+        "Cameras (X5)",
+        "Smart Watches (X6)",
+        "Headphones (X7)",
+        "Speakers (X8)",
+        "Keyboards (X9)",
+        "Mice (X10)",
+    ]
+    constraint_names = [
+        "Labor Hours", "Raw Material A", "Raw Material B", "Machine Time",
+        "Assembly Time", "Quality Control", "Packaging", "Storage Space",
+        "Energy", "Budget"
+    ]
+    return LPInstance(c, A, b, products, constraint_names)
+
+
+def techelectro_assignment():
+    """10 workers × 10 assembly tasks, times in hours"""
+    cost_matrix = np.array([
+        [8, 12, 15, 10, 13, 7, 5, 6, 4, 3],
+        [9, 10, 14, 11, 12, 8, 6, 7, 5, 4],
+        [11, 13, 16, 12, 14, 9, 7, 8, 6, 5],
+        [7, 11, 13, 9, 11, 6, 4, 5, 3, 2],
+        [10, 14, 17, 13, 15, 8, 6, 9, 7, 6],
+        [12, 15, 18, 14, 16, 10, 8, 10, 8, 7],
+        [6, 9, 12, 8, 10, 5, 3, 4, 2, 1],
+        [13, 16, 19, 15, 17, 11, 9, 11, 9, 8],
+        [8, 11, 14, 10, 12, 7, 5, 6, 4, 3],
+        [9, 12, 15, 11, 13, 8, 6, 7, 5, 4],
+    ])
+
+    workers = ["John", "Sarah", "Mike", "Lisa", "David", "Frank", "Grace", "Henry", "Irene", "Jack"]
+    tasks = ["Smartphone", "Tablet", "Laptop", "Monitor", "Camera",
+             "Smart Watch", "Headphone", "Speaker", "Keyboard", "Mouse"]
+    return AssignmentInstance(cost_matrix, workers, tasks)
+
+
+def techelectro_transportation():
+    """10 factories × 10 warehouses, balanced at 5000 units"""
+    cost_matrix = np.array([
+        [8, 12, 10, 15, 9, 11, 13, 14, 16, 10],
+        [10, 9, 11, 13, 12, 8, 10, 15, 14, 11],
+        [12, 8, 9, 14, 10, 13, 7, 16, 11, 12],
+        [11, 7, 10, 12, 11, 14, 8, 13, 9, 10],
+        [14, 13, 15, 8, 12, 16, 14, 6, 10, 13],
+        [9, 11, 12, 14, 8, 10, 13, 15, 12, 9],
+        [7, 13, 11, 16, 10, 9, 14, 12, 15, 11],
+        [10, 12, 8, 13, 11, 12, 10, 14, 13, 9],
+        [11, 10, 9, 14, 12, 11, 8, 15, 12, 10],
+        [12, 11, 7, 15, 13, 10, 9, 16, 14, 8],
+    ], dtype=float)
+
+    factories = ["Beijing", "Shanghai", "Shenzhen", "Guangzhou", "Chengdu",
+                 "Wuhan", "Tianjin", "Nanjing", "Hangzhou", "Suzhou"]
+    warehouses = ["North", "South", "East", "West", "Central",
+                  "Northeast", "Southeast", "Northwest", "Southwest", "Midwest"]
+
+    supply = np.array([500, 600, 550, 480, 520, 470, 530, 490, 510, 350], dtype=float)
+    demand = np.array([480, 520, 500, 460, 540, 490, 510, 470, 530, 500], dtype=float)
+    return TransportationInstance(cost_matrix, supply, demand, factories, warehouses)
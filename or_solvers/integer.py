@@ -0,0 +1,306 @@
+# -*- coding: utf-8 -*-
+"""
+Integer product mix: whole units, batch sizes and minimum lots.
+
+solve_integer takes the product-mix model of simplex.py (minimize c @ x
+s.t. A @ x <= b, x >= 0) and solves it with HiGHS branch and bound, so
+the plan never has to be rounded by hand. Products may be made in whole
+units, in multiples of a batch size, and / or with a minimum lot (either
+none of a product or at least the lot: a semi-continuous variable).
+
+The LP relaxation is solved first (or passed in) and its plan rounded
+to a feasible integer plan, which is the first incumbent of the search
+and the answer if the time or node limit ends the search before
+anything better is found. The result reports the LP bound and the gap left.
+
+With highspy installed the model goes to HiGHS directly, so the rounded
+plan seeds branch and bound; otherwise scipy.optimize.milp runs the same
+HiGHS solver and the rounded plan is kept as the fallback.
+"""
+
+import time
+from dataclasses import dataclass
+
+import numpy as np
+from scipy.optimize import Bounds, LinearConstraint, linprog, milp
+from scipy.sparse import csc_matrix, diags, issparse
+
+from .simplex import EPS, as_model_matrix
+from .stats import SolveStats, collect, count, phase
+
+# Relative gap between the best plan and the best bound at which the search stops
+DEFAULT_GAP = 1e-4
+# Row violation (relative to 1 + |b|) up to which a rounded plan is feasible
+FEASIBILITY_TOL = 1e-6
+# HiGHS / milp variable kinds: continuous, integer, semi-continuous, semi-integer
+CONTINUOUS, INTEGER, SEMI_CONTINUOUS, SEMI_INTEGER = 0, 1, 2, 3
+# HiGHS model status → linprog status code (1: stopped by a limit)
+STATUS_CODES = {"Optimal": 0, "Time limit reached": 1, "Iteration limit reached": 1,
+                "Solution limit reached": 1, "Interrupted by user": 1, "Infeasible": 2,
+                "Unbounded": 3, "Primal infeasible or unbounded": 3}
+
+
+@dataclass
+class IntegerResult:
+    """Outcome of an integer product-mix solve; profit is -c @ x
+
+    x is the best plan found, in units (batch multiples already
+    expanded). lp_bound is the profit of the LP relaxation and bound the
+    best profit branch and bound proved possible (at most lp_bound); gap
+    is (bound - profit) / |profit|, how much better an integer plan
+    could still be, and lp_gap the same against the LP. rounded_profit
+    is the profit of the rounded LP plan the search started from.
+    status uses the linprog codes: 0 optimal (within the gap), 1 search
+    stopped by the time or node limit, 2 infeasible, 3 unbounded, 4 solver
+    failure. With status 1 or 4 success tells whether a plan was found
+    by then; x is that plan (at worst the rounded LP plan). stats holds
+    the phase timings and counters when the solve collected them.
+    """
+    success: bool
+    message: str
+    x: np.ndarray = None
+    profit: float = None
+    usage: np.ndarray = None
+    slack: np.ndarray = None
+    lp_bound: float = None
+    bound: float = None
+    gap: float = None
+    lp_gap: float = None
+    rounded_profit: float = None
+    nodes: int = 0
+    status: int = 0
+    stats: SolveStats = None
+
+
+def solve_integer(c, A, b, integer=True, batch=None, minimum=None, maximum=None,
+                  time_limit=None, gap=DEFAULT_GAP, lp=None, stats=False, node_limit=None):
+    """Best plan in whole units / batches / minimum lots, within time_limit seconds
+
+    integer is True (every product in whole units), False, or one flag
+    per product. batch[j] > 0 makes product j a multiple of batch[j]
+    units; minimum[j] > 0 makes it 0 or at least minimum[j]; maximum
+    caps the quantities (a minimum lot needs a finite cap, which is
+    read off the nonnegative rows of A when not given). time_limit
+    bounds the whole call, LP included, and node_limit the branch and
+    bound nodes (a budget that, unlike time, gives the same plan on
+    every machine); gap is the relative gap at which the search stops.
+    lp, a SimplexResult of solve_simplex for
+    the same c, A, b, saves the LP solve when there are no caps.
+    stats=True (or an enclosing stats.collect() block) attaches a
+    SolveStats to the result.
+    """
+    start = time.perf_counter()
+    with collect(stats) as collected:
+        with phase("integer.build"):
+            model = _IntegerModel(c, A, b, integer, batch, minimum, maximum)
+
+        with phase("integer.lp"):
+            if lp is not None and maximum is None and lp.success:
+                y_lp, lp_profit, status, message = lp.x / model.scale, lp.profit, 0, lp.message
+            else:
+                y_lp, lp_profit, status, message = model.relaxation()
+        if status != 0:
+            result = IntegerResult(False, message, status=status)
+        else:
+            with phase("integer.rounding"):
+                rounded = model.rounded(y_lp)
+            remaining = None if time_limit is None else time_limit - (time.perf_counter() - start)
+            with phase("integer.search"):
+                if remaining is not None and remaining <= 0:
+                    found = (None, -np.inf, 0, 1, "Time limit reached")
+                else:
+                    found = model.search(rounded, remaining, gap, node_limit)
+            result = model.result(found, rounded, lp_profit)
+    result.stats = collected
+    return result
+
+
+class _IntegerModel:
+    """The model in batch units: y = x / scale, so every batch becomes one unit"""
+
+    def __init__(self, c, A, b, integer, batch, minimum, maximum):
+        A = as_model_matrix(A)
+        self.b = np.asarray(b, dtype=float)
+        m, n = A.shape
+        batch = np.zeros(n) if batch is None else np.nan_to_num(np.asarray(batch, dtype=float))
+        self.scale = np.where(batch > 0, batch, 1.0)
+        self.c = np.asarray(c, dtype=float) * self.scale
+        self.A = csc_matrix(A @ diags(self.scale)) if issparse(A) else A * self.scale
+        self.integral = np.broadcast_to(np.asarray(integer, dtype=bool), (n,)) | (batch > 0)
+
+        upper = np.full(n, np.inf) if maximum is None else np.asarray(maximum, dtype=float)
+        lot = np.zeros(n) if minimum is None else np.nan_to_num(np.asarray(minimum, dtype=float))
+        self.semi = lot > 0
+        if np.any(self.semi & np.isinf(upper)):
+            upper = np.where(self.semi, np.minimum(upper, _implied_upper(A, self.b)), upper)
+            if np.any(self.semi & np.isinf(upper)):
+                raise ValueError("products with a minimum lot need a maximum quantity "
+                                 "(no nonnegative row of A caps them)")
+        self.upper = upper / self.scale
+        self.lower = np.where(self.integral, np.ceil(lot / self.scale - EPS), lot / self.scale)
+        self.kind = np.where(self.integral, INTEGER, CONTINUOUS) + np.where(self.semi, 2, 0)
+
+    def relaxation(self):
+        """(y, profit, status, message) of the LP relaxation"""
+        res = linprog(self.c, A_ub=self.A, b_ub=self.b, bounds=np.column_stack(
+            [np.zeros(len(self.c)), self.upper]), method="highs")
+        count("integer.lp_iterations", int(res.nit))
+        if not res.success:
+            return None, None, res.status, res.message
+        return res.x, -res.fun, 0, res.message
+
+    def feasible(self, y):
+        return np.all(self.A @ y - self.b <= FEASIBILITY_TOL * (1.0 + np.abs(self.b)))
+
+    def rounded(self, y):
+        """A feasible integer plan near the LP plan y, or None
+
+        Integer quantities are rounded down and lots below their minimum
+        dropped; if that breaks a row (A has negative entries) the plan
+        restarts from zero. Then the most profitable products are raised
+        as far as the slack allows, one product at a time.
+        """
+        y = np.clip(y, 0.0, self.upper)
+        y = np.where(self.integral, np.floor(y + EPS), y)
+        y[self.semi & (y < self.lower - EPS)] = 0.0
+        if not self.feasible(y):
+            y = np.zeros_like(y)
+            if not self.feasible(y):
+                return None
+        slack = self.b - self.A @ y
+        A = self.A if issparse(self.A) else csc_matrix(self.A)
+        raised = 0
+        for j in np.argsort(self.c):
+            if self.c[j] >= 0:
+                break
+            rows = A.indices[A.indptr[j]:A.indptr[j + 1]]
+            values = A.data[A.indptr[j]:A.indptr[j + 1]]
+            limits = values > EPS
+            room = self.upper[j] - y[j]
+            if limits.any():
+                room = min(room, np.min(slack[rows[limits]] / values[limits]))
+            if not np.isfinite(room):
+                continue
+            if self.integral[j]:
+                room = np.floor(room + EPS)
+            if room <= EPS or (self.semi[j] and y[j] == 0 and room < self.lower[j]):
+                continue
+            y[j] += room
+            slack[rows] -= values * room
+            raised += 1
+        count("integer.rounding_raises", raised)
+        return y
+
+    def search(self, start, time_limit, gap, node_limit=None):
+        """(y or None, objective bound, nodes, status, message) of branch and bound"""
+        try:
+            import highspy
+        except ImportError:
+            return self._search_milp(time_limit, gap, node_limit)
+        return self._search_highs(highspy, start, time_limit, gap, node_limit)
+
+    def _search_milp(self, time_limit, gap, node_limit):
+        options = {"mip_rel_gap": gap}
+        if time_limit is not None:
+            options["time_limit"] = time_limit
+        if node_limit is not None:
+            options["node_limit"] = int(node_limit)
+        res = milp(self.c, integrality=self.kind, bounds=Bounds(self.lower_bounds(), self.upper),
+                   constraints=LinearConstraint(self.A, -np.inf, self.b), options=options)
+        bound = getattr(res, "mip_dual_bound", None)
+        nodes = getattr(res, "mip_node_count", 0) or 0
+        status = res.status
+        if status == 4 and "Solution limit reached" in res.message:
+            status = 1  # milp has no code of its own for the node limit
+        return (res.x, -np.inf if bound is None else bound, nodes, status, res.message)
+
+    def _search_highs(self, highspy, start, time_limit, gap, node_limit):
+        A = csc_matrix(self.A)
+        lp = highspy.HighsLp()
+        lp.num_col_, lp.num_row_ = A.shape[1], A.shape[0]
+        lp.col_cost_ = self.c
+        lp.col_lower_ = self.lower_bounds()
+        lp.col_upper_ = self.upper
+        lp.row_lower_ = np.full(A.shape[0], -np.inf)
+        lp.row_upper_ = self.b
+        lp.a_matrix_.format_ = highspy.MatrixFormat.kColwise
+        lp.a_matrix_.start_ = A.indptr
+        lp.a_matrix_.index_ = A.indices
+        lp.a_matrix_.value_ = A.data
+        lp.integrality_ = [highspy.HighsVarType(int(k)) for k in self.kind]
+
+        h = highspy.Highs()
+        h.setOptionValue("output_flag", False)
+        h.setOptionValue("mip_rel_gap", float(gap))
+        if time_limit is not None:
+            h.setOptionValue("time_limit", float(time_limit))
+        if node_limit is not None:
+            h.setOptionValue("mip_max_nodes", int(node_limit))
+        h.passModel(lp)
+        if start is not None:
+            solution = highspy.HighsSolution()
+            solution.col_value = start
+            solution.value_valid = True
+            h.setSolution(solution)
+        h.run()
+
+        message = h.modelStatusToString(h.getModelStatus())
+        info = h.getInfo()
+        y = None
+        if info.primal_solution_status == 2:  # kSolutionStatusFeasible
+            y = np.asarray(h.getSolution().col_value, dtype=float)
+        return y, info.mip_dual_bound, info.mip_node_count, STATUS_CODES.get(message, 4), message
+
+    def lower_bounds(self):
+        """Column lower bounds in HiGHS form: the minimum lot for semi variables, else 0"""
+        return np.where(self.semi, self.lower, 0.0)
+
+    def result(self, found, rounded, lp_profit):
+        y, bound, nodes, status, message = found
+        count("integer.nodes", int(nodes))
+        rounded_profit = None if rounded is None else float(-self.c @ rounded)
+        if status in (2, 3) and y is None:
+            return IntegerResult(False, message, lp_bound=lp_profit, nodes=nodes, status=status,
+                                 rounded_profit=rounded_profit)
+        if rounded is not None and (y is None or -self.c @ y < rounded_profit):
+            y = rounded  # the search found nothing better than the rounded LP plan
+        if y is None:
+            return IntegerResult(False, message, lp_bound=lp_profit, nodes=nodes, status=status)
+
+        x = y * self.scale
+        profit = float(-self.c @ y)
+        bound = min(lp_profit, -bound) if np.isfinite(bound) else lp_profit
+        usage = self.A @ y
+        return IntegerResult(
+            success=True,
+            message=message,
+            x=x,
+            profit=profit,
+            usage=usage,
+            slack=self.b - usage,
+            lp_bound=lp_profit,
+            bound=max(bound, profit),
+            gap=_gap(max(bound, profit), profit),
+            lp_gap=_gap(lp_profit, profit),
+            rounded_profit=rounded_profit,
+            nodes=int(nodes),
+            status=status,
+        )
+
+
+def _gap(bound, profit):
+    if bound - profit <= EPS * max(1.0, abs(profit)):
+        return 0.0
+    return (bound - profit) / abs(profit) if profit != 0 else np.inf
+
+
+def _implied_upper(A, b):
+    """Largest x_j any single all-nonnegative row of A allows (inf if none caps it)"""
+    A = csc_matrix(A)
+    nonnegative = np.ones(A.shape[0], dtype=bool)
+    np.logical_and.at(nonnegative, A.indices, A.data >= 0)
+    cols = np.repeat(np.arange(A.shape[1]), np.diff(A.indptr))
+    capping = (A.data > EPS) & nonnegative[A.indices]
+    upper = np.full(A.shape[1], np.inf)
+    np.minimum.at(upper, cols[capping], b[A.indices[capping]] / A.data[capping])
+    return upper
@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+"""
+Background solves: run a solver in a worker process, stream its progress
+back through a queue and cancel it on request.
+
+A process rather than a thread, because HiGHS and the assignment codes
+run in C without releasing control, so the only way to stop them early
+is to terminate the worker. The caller polls (the GUI from Tk's after
+loop); nothing here touches Tk.
+"""
+
+import multiprocessing as mp
+import queue
+from dataclasses import dataclass
+
+# Message kinds posted by the worker
+PROGRESS = "progress"
+DONE = "done"
+FAILED = "failed"
+
+
+@dataclass
+class JobMessage:
+    """One message from the worker
+
+    For PROGRESS, iteration and objective are the solver's figures; for
+    DONE, result is the solver's return value; for FAILED, error is the
+    exception text.
+    """
+    kind: str
+    iteration: int = 0
+    objective: float = float("nan")
+    result: object = None
+    error: str = None
+
+
+def _run(messages, target, args, kwargs):
+    def progress(iteration, objective):
+        messages.put(JobMessage(PROGRESS, iteration=iteration, objective=objective))
+
+    try:
+        result = target(*args, progress=progress, **kwargs)
+    except Exception as exc:  # the exception itself may not pickle
+        messages.put(JobMessage(FAILED, error=f"{type(exc).__name__}: {exc}"))
+    else:
+        messages.put(JobMessage(DONE, result=result))
+
+
+class SolveJob:
+    """target(*args, progress=callback, **kwargs) running in a worker process
+
+    target must be a module-level function that accepts a progress
+    keyword (solve_simplex, solve_transportation, k_best_assignments,
+    ...); progress(iteration, objective) calls are posted as PROGRESS
+    messages and the return value as a DONE message. The worker is
+    spawned, not forked, so it is safe to start from a Tk program.
+    """
+
+    def __init__(self, target, *args, **kwargs):
+        context = mp.get_context("spawn")
+        self._messages = context.Queue()
+        self._process = context.Process(
+            target=_run, args=(self._messages, target, args, kwargs), daemon=True
+        )
+        self.finished = False
+        self._process.start()
+
+    def poll(self):
+        """Messages posted since the last call, without blocking"""
+        messages = []
+        while not self.finished:
+            try:
+                message = self._messages.get_nowait()
+            except queue.Empty:
+                if self._process.is_alive():
+                    break
+                message = self._last_message()
+            messages.append(message)
+            if message.kind != PROGRESS:
+                self._close()
+        return messages
+
+    def wait(self, timeout=None):
+        """Block until the job ends; returns its DONE or FAILED message
+
+        Progress messages are discarded. Raises queue.Empty on timeout.
+        """
+        while True:
+            message = self._messages.get(timeout=timeout)
+            if message.kind != PROGRESS:
+                self._close()
+                return message
+
+    def _last_message(self):
+        """What a worker that has exited left behind, or FAILED if it died silently"""
+        try:
+            return self._messages.get(timeout=1.0)
+        except queue.Empty:
+            code = self._process.exitcode
+            return JobMessage(FAILED, error=f"worker exited with code {code}")
+
+    def cancel(self):
+        """Stop the worker at once; later polls return nothing"""
+        if not self.finished:
+            self._process.terminate()
+            self._close()
+
+    def _close(self):
+        self.finished = True
+        self._process.join()
+        self._messages.close()
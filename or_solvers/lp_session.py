@@ -0,0 +1,370 @@
+# -*- coding: utf-8 -*-
+"""
+Incremental LP session: keeps the optimal basis of the product-mix LP so
+that new constraints and new products can be evaluated by warm-started
+dual / primal simplex pivots instead of a cold re-solve.
+
+A may be dense or scipy.sparse; a sparse A stays sparse (csc) through
+every what-if, and B^-1 is never formed: B is LU-factored (SuperLU for
+sparse A) and pivots append eta vectors (product form of the inverse)
+until the next refactorization.
+"""
+
+import numpy as np
+from scipy.sparse import csc_matrix, issparse
+from scipy.sparse import hstack as sparse_hstack
+from scipy.sparse import vstack as sparse_vstack
+
+from .simplex import EPS, BasisFactor, SimplexResult, as_model_matrix, optimal_basis, solve_simplex
+from .stats import count, phase
+
+# Pivots between refactorizations of B
+REFACTOR_EVERY = 50
+# Degenerate pivots in a row before switching to Bland's rule
+DEGENERATE_STREAK = 50
+# Pivots per row and column of the LP after which a re-solve is given up
+MAX_PIVOTS_PER_LINE = 20
+# Session status → linprog status code
+STATUS_CODES = {"optimal": 0, "infeasible": 2, "unbounded": 3, "singular": 4}
+
+
+class LPSession:
+    """
+    Optimal LP min c @ x s.t. A @ x <= b, x >= 0 held together with its
+    basis (columns of [A | I], slack i is n + i) and a factorization of it.
+
+    add_constraint runs dual simplex from the current basis (the old
+    basis stays dual feasible); add_variable prices the new column and
+    runs primal simplex only if it has a negative reduced cost;
+    reoptimize swaps in new b / c / A and picks whichever simplex the
+    old basis is still feasible for. All of them mutate the session; use
+    copy() to try a what-if without keeping it. A, b and c are never
+    modified in place, so copies share them. Ties in the ratio tests go
+    to the lowest index, and a run of degenerate pivots switches both
+    simplex methods to Bland's rule. A re-solve still running after
+    MAX_PIVOTS_PER_LINE pivots per row and column, or whose basis turns
+    singular, is solved cold instead. pivots counts the pivots made and
+    cold_solves the re-solves that could not start from (or finish
+    from) the basis.
+    """
+
+    def __init__(self, c, A, b, result=None):
+        self.c = np.array(c, dtype=float)
+        self.A = as_model_matrix(A)
+        self.b = np.array(b, dtype=float)
+        self.pivots = 0
+        self.cold_solves = 0
+        self.status = "optimal"
+
+        if result is None:
+            result = solve_simplex(self.c, self.A, self.b, sensitivity=False)
+        if not result.success:
+            raise ValueError(f"LPSession needs an optimal LP: {result.message}")
+
+        if result.sensitivity is not None and result.sensitivity.basis is not None:
+            self.basis = np.array(result.sensitivity.basis)
+        else:
+            self.basis = optimal_basis(self.A, result)
+        self._refactor()
+
+    @classmethod
+    def from_basis(cls, c, A, b, basis):
+        """Session for a known optimal basis, skipping the initial solve"""
+        session = object.__new__(cls)
+        session.c = np.asarray(c, dtype=float)
+        session.A = as_model_matrix(A)
+        session.b = np.asarray(b, dtype=float)
+        session.basis = np.array(basis)
+        session.pivots = 0
+        session.cold_solves = 0
+        session.status = "optimal"
+        session._refactor()
+        return session
+
+    @property
+    def shape(self):
+        return self.A.shape
+
+    def copy(self):
+        """Independent session; the model arrays are shared read-only"""
+        other = object.__new__(LPSession)
+        other.c = self.c
+        other.A = self.A
+        other.b = self.b
+        other.basis = self.basis.copy()
+        other._factor = self._factor
+        other._etas = list(self._etas)
+        other.pivots = self.pivots
+        other.cold_solves = self.cold_solves
+        other.status = self.status
+        return other
+
+    # -----------------------------------------------------------------
+    # What-ifs
+    # -----------------------------------------------------------------
+    def add_constraint(self, row, rhs):
+        """Add row @ x <= rhs and re-optimize with dual simplex"""
+        m, n = self.shape
+
+        # The new slack joins the basis: B' = [[B, 0], [row_B, 1]], still
+        # dual feasible. Refactoring it is one (sparse) LU.
+        if issparse(self.A):
+            self.A = csc_matrix(sparse_vstack([self.A, _sparse_line(row, (1, -1))]))
+        else:
+            self.A = np.vstack([self.A, np.asarray(row, dtype=float)])
+        self.b = np.append(self.b, rhs)
+        self.basis = np.append(self.basis, n + m)
+        with phase("lp_session.add_constraint"):
+            self._refactor()
+            return self._warm(self._dual_simplex)
+
+    def add_variable(self, col, profit):
+        """Add a product with resource usage col; enters only if it prices out"""
+        m, n = self.shape
+
+        if issparse(self.A):
+            self.A = csc_matrix(sparse_hstack([self.A, _sparse_line(col, (-1, 1))]))
+        else:
+            self.A = np.column_stack([self.A, np.asarray(col, dtype=float)])
+        self.c = np.append(self.c, -profit)  # maximizing → negative for linprog
+        self.basis[self.basis >= n] += 1
+
+        if self.status == "optimal" and self._reduced_costs()[n] < -EPS:
+            with phase("lp_session.add_variable"):
+                return self._warm(self._primal_simplex)
+        return self.result()
+
+    def reoptimize(self, b=None, c=None, A=None, changed_columns=None):
+        """
+        Replace b, c and/or A and re-optimize from the current basis.
+
+        B is only refactored when A changes in a basic column
+        (changed_columns lists the structural columns that differ; None
+        means any). The old basis is then re-used by primal simplex if it
+        is still primal feasible, or by dual simplex if it is still dual
+        feasible; otherwise the LP is solved cold.
+        """
+        if b is not None:
+            self.b = np.asarray(b, dtype=float)
+        if c is not None:
+            self.c = np.asarray(c, dtype=float)
+        if A is not None:
+            self.A = as_model_matrix(A)
+            n = self.shape[1]
+            basic = self.basis[self.basis < n]
+            if changed_columns is None or np.intersect1d(basic, changed_columns).size:
+                try:
+                    self._refactor()
+                except np.linalg.LinAlgError:
+                    return self._cold_solve()
+
+        scale = max(1.0, np.abs(self.b).max())
+        with phase("lp_session.reoptimize"):
+            if self._basic_values().min() >= -EPS * scale:
+                return self._warm(self._primal_simplex)
+            if self._reduced_costs().min() >= -EPS:
+                return self._warm(self._dual_simplex)
+            return self._cold_solve()
+
+    def _warm(self, simplex):
+        """Re-optimize with simplex from the current basis, or solve cold
+
+        The cold solve takes over when simplex hits the pivot cap or a
+        refactorization finds the basis singular.
+        """
+        try:
+            finished = simplex()
+        except np.linalg.LinAlgError:
+            finished = False
+        if not finished:
+            return self._cold_solve()
+        return self.result()
+
+    def _cold_solve(self):
+        self.cold_solves += 1
+        count("lp_session.cold_solves")
+        result = solve_simplex(self.c, self.A, self.b, sensitivity=False)
+        if result.success:
+            self.basis = optimal_basis(self.A, result)
+            self._refactor()
+            self.status = "optimal"
+        else:
+            self.status = {2: "infeasible", 3: "unbounded"}.get(result.status, "singular")
+        return self.result()
+
+    # -----------------------------------------------------------------
+    # Current solution
+    # -----------------------------------------------------------------
+    def result(self):
+        """SimplexResult for the current basis (duals in profit terms)"""
+        if self.status != "optimal":
+            return SimplexResult(False, f"The problem is {self.status}.",
+                                 status=STATUS_CODES[self.status])
+
+        m, n = self.shape
+        x_B = self._basic_values()
+        values = np.zeros(n + m)
+        values[self.basis] = np.maximum(x_B, 0.0)
+        x, slack = values[:n], values[n:]
+        y = self._duals()
+        return SimplexResult(
+            success=True,
+            message="Optimal (warm-started from previous basis)",
+            x=x,
+            profit=-(self.c @ x),
+            usage=self.b - slack,
+            slack=slack,
+            duals=np.where(np.abs(y) < EPS, 0.0, -y),
+            reduced_costs=np.maximum(self._reduced_costs()[:n], 0.0),
+        )
+
+    # -----------------------------------------------------------------
+    # Simplex internals
+    # -----------------------------------------------------------------
+    def _refactor(self):
+        count("lp_session.refactors")
+        self._factor = BasisFactor(self.A, self.basis)
+        self._etas = []
+
+    def _ftran(self, rhs):
+        """B^-1 rhs: the LU solve, then the etas of the pivots since"""
+        x = self._factor.solve(rhs)
+        for r, alpha in self._etas:
+            x_r = x[r] / alpha[r]
+            x -= alpha * x_r
+            x[r] = x_r
+        return x
+
+    def _btran(self, rhs):
+        """rhs B^-1: the etas in reverse, then the transposed LU solve"""
+        y = np.array(rhs, dtype=float)
+        for r, alpha in reversed(self._etas):
+            y[r] = (y[r] - (y @ alpha - y[r] * alpha[r])) / alpha[r]
+        return self._factor.solve(y, trans=True)
+
+    def _column(self, j):
+        m, n = self.shape
+        if j >= n:
+            col = np.zeros(m)
+            col[j - n] = 1.0
+            return col
+        if issparse(self.A):
+            return self.A[:, [j]].toarray().ravel()
+        return self.A[:, j]
+
+    def _c_full(self):
+        return np.concatenate([self.c, np.zeros(self.shape[0])])
+
+    def _basic_values(self):
+        return self._ftran(self.b)
+
+    def _duals(self):
+        """Simplex multipliers y = c_B B^-1 (min form, y <= 0 at optimum)"""
+        return self._btran(self._c_full()[self.basis])
+
+    def _reduced_costs(self):
+        """c - y [A | I] for every column, zero on the basis"""
+        y = self._duals()
+        d = np.concatenate([self.c - self.A.T @ y, -y])
+        d[self.basis] = 0.0
+        return d
+
+    def _pivot(self, r, q):
+        """Replace basis[r] by column q, appending an eta vector"""
+        alpha = self._ftran(self._column(q))
+        self._etas.append((r, alpha))
+        self.basis[r] = q
+        self.pivots += 1
+        count("lp_session.pivots")
+        if len(self._etas) >= REFACTOR_EVERY:
+            self._refactor()
+
+    def _max_pivots(self):
+        return MAX_PIVOTS_PER_LINE * sum(self.shape)
+
+    def _dual_simplex(self):
+        """Dual simplex pivots to optimality; False if the pivot cap is hit"""
+        count("lp_session.dual_simplex")
+        scale = max(1.0, np.abs(self.b).max())
+        degenerate = 0
+        for _ in range(self._max_pivots()):
+            x_B = self._basic_values()
+            infeasible = np.flatnonzero(x_B < -EPS * scale)
+            if len(infeasible) == 0:
+                self.status = "optimal"
+                return True
+
+            # Most infeasible row leaves; Bland's rule once pivots stop making progress
+            if degenerate >= DEGENERATE_STREAK:
+                r = infeasible[np.argmin(self.basis[infeasible])]
+            else:
+                r = infeasible[np.argmin(x_B[infeasible])]
+
+            rho = self._btran(np.eye(1, len(self.basis), r).ravel())
+            alpha = np.concatenate([self.A.T @ rho, rho])
+            alpha[self.basis] = 0.0
+            eligible = np.flatnonzero(alpha < -EPS)
+            if len(eligible) == 0:
+                self.status = "infeasible"
+                return True
+
+            d = self._reduced_costs()
+            ratios = np.maximum(d[eligible], 0.0) / -alpha[eligible]
+            best = ratios.min()
+            q = eligible[ratios <= best + EPS].min()  # ties: lowest index (Bland)
+            degenerate = degenerate + 1 if best <= EPS else 0
+            self._pivot(r, q)
+        count("lp_session.pivot_limits")
+        return False
+
+    def _primal_simplex(self):
+        """Primal simplex pivots to optimality; False if the pivot cap is hit"""
+        count("lp_session.primal_simplex")
+        degenerate = 0
+        for _ in range(self._max_pivots()):
+            d = self._reduced_costs()
+            improving = np.flatnonzero(d < -EPS)
+            if len(improving) == 0:
+                self.status = "optimal"
+                return True
+
+            # Dantzig pricing; Bland's rule once pivots stop making progress
+            if degenerate >= DEGENERATE_STREAK:
+                q = improving[0]
+            else:
+                q = improving[np.argmin(d[improving])]
+
+            alpha = self._ftran(self._column(q))
+            x_B = self._basic_values()
+            eligible = np.flatnonzero(alpha > EPS)
+            if len(eligible) == 0:
+                self.status = "unbounded"
+                return True
+
+            ratios = np.maximum(x_B[eligible], 0.0) / alpha[eligible]
+            best = ratios.min()
+            ties = eligible[ratios <= best + EPS]
+            r = ties[np.argmin(self.basis[ties])]
+            degenerate = degenerate + 1 if best <= EPS else 0
+            self._pivot(r, q)
+        count("lp_session.pivot_limits")
+        return False
+
+
+def _sparse_line(values, shape):
+    """A new row / column of a sparse A, which may itself be given sparse"""
+    if issparse(values):
+        return csc_matrix(values).reshape(shape)
+    return csc_matrix(np.reshape(np.asarray(values, dtype=float), shape))
+
+
+def add_new_constraint(A, b, c, new_row, new_rhs, session=None):
+    """What-if: optimum after adding new_row @ x <= new_rhs (warm-started)"""
+    session = LPSession(c, A, b) if session is None else session.copy()
+    return session.add_constraint(new_row, new_rhs)
+
+
+def add_new_variable(A, b, c, new_col, new_profit, session=None):
+    """What-if: optimum after adding a product with column new_col (warm-started)"""
+    session = LPSession(c, A, b) if session is None else session.copy()
+    return session.add_variable(new_col, new_profit)
@@ -0,0 +1,354 @@
+# -*- coding: utf-8 -*-
+"""
+Load LP, assignment and transportation instances from files.
+
+LP models come from MPS (or, with highspy installed, CPLEX LP) files and
+are returned in linprog form with a sparse A. Cost matrices come from
+.npy and uncompressed .npz (memory-mapped, nothing is read until used),
+compressed .npz, CSV (numpy's C parser, no per-cell Python work) or,
+with pyarrow installed, Parquet.
+All loaders return the instance dataclasses of instances.py.
+"""
+
+import csv
+import os
+import struct
+import zipfile
+from itertools import islice
+
+import numpy as np
+from scipy.sparse import csc_matrix, csr_matrix, vstack
+
+from .instances import AssignmentInstance, LPInstance, TransportationInstance
+from .stats import phase
+
+# Bounds at or beyond this magnitude count as infinite (HiGHS convention)
+INF = 1e30
+
+# MPS bound types the reader understands (SC is rejected on its own)
+BOUND_TYPES = ("UP", "LO", "FX", "FR", "MI", "PL", "BV", "LI", "UI")
+
+
+# =====================================================================
+# LP (MPS / LP files)
+# =====================================================================
+def load_lp(path):
+    """Product-mix LP from an MPS or LP file, as an LPInstance
+
+    The model is brought to minimize c @ x s.t. A @ x <= b, x >= 0 with A
+    a csr matrix: >= rows are negated, equality and ranged rows become a
+    <= / >= pair (named "row (<=)" and "row (>=)") and finite upper
+    bounds become rows "column (upper bound)". A MAX objective is
+    negated, so c stays in cost terms like techelectro_lp(). Raises
+    ValueError for nonzero lower bounds or free variables, which the
+    x >= 0 form cannot hold, and for semi-continuous (SC) bounds.
+    Integer columns (MARKER INTORG / INTEND blocks, BV, LI and UI
+    bounds) are flagged in the instance's integer array.
+
+    highspy, if installed, reads the file in C (and is required for .lp
+    files); otherwise a built-in reader handles free and fixed MPS.
+    """
+    try:
+        import highspy
+    except ImportError:
+        if os.path.splitext(path)[1].lower() == ".lp":
+            raise ImportError("reading .lp files needs highspy (pip install highspy)") from None
+        highspy = None
+    with phase("io.load_lp"):
+        model = _read_mps(path) if highspy is None else _read_highs(highspy, path)
+        return _lp_instance(*model)
+
+
+def _read_highs(highspy, path):
+    h = highspy.Highs()
+    h.setOptionValue("output_flag", False)
+    if h.readModel(str(path)) == highspy.HighsStatus.kError:
+        raise ValueError(f"cannot read LP model from {path}")
+    lp = h.getLp()
+    matrix = lp.a_matrix_
+    shape = (lp.num_row_, lp.num_col_)
+    arrays = (np.asarray(matrix.value_, dtype=float), np.asarray(matrix.index_),
+              np.asarray(matrix.start_))
+    if matrix.format_ == highspy.MatrixFormat.kRowwise:
+        A = csr_matrix(arrays, shape=shape)
+    else:
+        A = csc_matrix(arrays, shape=shape)
+    c = np.asarray(lp.col_cost_, dtype=float)
+    if lp.sense_ == highspy.ObjSense.kMaximize:
+        c = -c
+    cols = list(lp.col_names_) or [f"x{j + 1}" for j in range(lp.num_col_)]
+    rows = list(lp.row_names_) or [f"r{i + 1}" for i in range(lp.num_row_)]
+    integer = np.zeros(lp.num_col_, dtype=bool)
+    for j, kind in enumerate(lp.integrality_):
+        if kind in (highspy.HighsVarType.kSemiContinuous, highspy.HighsVarType.kSemiInteger):
+            raise ValueError(f"variable {cols[j]} is semi-continuous, which is not supported")
+        integer[j] = kind != highspy.HighsVarType.kContinuous
+    return (c, A, np.asarray(lp.row_lower_, dtype=float), np.asarray(lp.row_upper_, dtype=float),
+            np.asarray(lp.col_lower_, dtype=float), np.asarray(lp.col_upper_, dtype=float),
+            cols, rows, integer)
+
+
+def _read_mps(path):
+    """Free or fixed MPS (names without spaces) into arrays"""
+    objective = None
+    maximize = False
+    row_index, row_types = {}, []
+    col_index = {}
+    entries = ([], [], [])  # row, column, value
+    cost = {}
+    rhs, ranges = {}, {}
+    lower, upper = {}, {}
+    integer = set()
+    in_marker = False
+    section = None
+
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip() or line[0] == "*":
+                continue
+            fields = line.split()
+            if not line[0].isspace():
+                section = fields[0].upper()
+                if section == "OBJSENSE" and len(fields) > 1:
+                    maximize = fields[1].upper() in ("MAX", "MAXIMIZE")
+                continue
+            if section == "OBJSENSE":
+                maximize = fields[0].upper() in ("MAX", "MAXIMIZE")
+            elif section == "ROWS":
+                kind, name = fields[0].upper(), fields[1]
+                if kind == "N":
+                    objective = objective or name
+                else:
+                    row_index[name] = len(row_types)
+                    row_types.append(kind)
+            elif section == "COLUMNS":
+                if "'MARKER'" in fields:
+                    in_marker = "'INTORG'" in fields or (in_marker and "'INTEND'" not in fields)
+                    continue
+                j = col_index.setdefault(fields[0], len(col_index))
+                if in_marker:
+                    integer.add(j)
+                for name, value in zip(fields[1::2], fields[2::2]):
+                    if name == objective:
+                        cost[j] = float(value)
+                    elif name in row_index:
+                        entries[0].append(row_index[name])
+                        entries[1].append(j)
+                        entries[2].append(float(value))
+            elif section in ("RHS", "RANGES"):
+                target = rhs if section == "RHS" else ranges
+                pairs = fields[1:] if len(fields) % 2 else fields
+                for name, value in zip(pairs[::2], pairs[1::2]):
+                    if name in row_index:
+                        target[row_index[name]] = float(value)
+            elif section == "BOUNDS":
+                kind = fields[0].upper()
+                if kind == "SC":
+                    raise ValueError(f"{path}: semi-continuous bounds (SC) are not supported")
+                if kind not in BOUND_TYPES:
+                    raise ValueError(f"{path}: unknown bound type {fields[0]}")
+                # The bound set name is optional, and so is the value of
+                # FR / MI / PL / BV bounds
+                if kind in ("FR", "MI", "PL", "BV") and fields[-1] in col_index:
+                    name, value = fields[-1], None
+                elif len(fields) >= 3:
+                    name, value = fields[-2], float(fields[-1])
+                else:
+                    raise ValueError(f"{path}: bound {line.strip()} needs a value")
+                if name not in col_index:
+                    raise ValueError(f"{path}: bound on unknown column {name}")
+                j = col_index[name]
+                if kind in ("UP", "UI", "FX"):
+                    upper[j] = value
+                if kind in ("LO", "LI", "FX"):
+                    lower[j] = value
+                elif kind in ("FR", "MI"):
+                    lower[j] = -np.inf
+                if kind in ("FR", "PL"):
+                    upper[j] = np.inf
+                elif kind == "BV":
+                    lower[j], upper[j] = 0.0, 1.0
+                if kind in ("BV", "LI", "UI"):
+                    integer.add(j)
+
+    m, n = len(row_types), len(col_index)
+    A = csr_matrix((entries[2], (entries[0], entries[1])), shape=(m, n))
+    c = _from_dict(cost, n, 0.0)
+    if maximize:
+        c = -c
+
+    types = np.array(row_types, dtype="U1")
+    b = _from_dict(rhs, m, 0.0)
+    r = _from_dict(ranges, m, np.nan)
+    row_lower = np.where(types == "L", -np.inf, b)
+    row_upper = np.where(types == "G", np.inf, b)
+    ranged = ~np.isnan(r)
+    row_lower = np.where(ranged & (types == "L"), b - np.abs(r), row_lower)
+    row_upper = np.where(ranged & (types == "G"), b + np.abs(r), row_upper)
+    row_lower = np.where(ranged & (types == "E") & (r < 0), b + r, row_lower)
+    row_upper = np.where(ranged & (types == "E") & (r > 0), b + r, row_upper)
+
+    cols = sorted(col_index, key=col_index.get)
+    rows = sorted(row_index, key=row_index.get)
+    return (c, A, row_lower, row_upper, _from_dict(lower, n, 0.0), _from_dict(upper, n, np.inf),
+            cols, rows, np.isin(np.arange(n), list(integer)))
+
+
+def _from_dict(values, size, fill):
+    array = np.full(size, fill)
+    if values:
+        array[np.fromiter(values.keys(), dtype=np.intp)] = np.fromiter(values.values(), dtype=float)
+    return array
+
+
+def _lp_instance(c, A, row_lower, row_upper, col_lower, col_upper, cols, rows, integer):
+    """Bring row / column bounds to A @ x <= b, x >= 0"""
+    if np.any(col_lower != 0):
+        bad = cols[int(np.flatnonzero(col_lower != 0)[0])]
+        raise ValueError(f"variable {bad} has a nonzero or infinite lower bound; "
+                         f"only x >= 0 is supported")
+    A = csr_matrix(A)
+    n = A.shape[1]
+    upper = np.flatnonzero(row_upper < INF)
+    lower = np.flatnonzero(row_lower > -INF)
+    bounded = np.flatnonzero(col_upper < INF)
+    both = set(np.intersect1d(upper, lower).tolist())
+
+    def label(i, sign):
+        return f"{rows[i]} ({sign})" if i in both else rows[i]
+
+    blocks = [A[upper], -A[lower],
+              csr_matrix((np.ones(len(bounded)), (np.arange(len(bounded)), bounded)),
+                         shape=(len(bounded), n))]
+    b = np.concatenate([row_upper[upper], -row_lower[lower], col_upper[bounded]])
+    names = ([label(i, "<=") for i in upper] + [label(i, ">=") for i in lower]
+             + [f"{cols[j]} (upper bound)" for j in bounded])
+    return LPInstance(np.asarray(c, dtype=float), vstack(blocks, format="csr"), b,
+                      list(cols), names, integer)
+
+
+# =====================================================================
+# COST MATRICES (assignment / transportation)
+# =====================================================================
+def load_matrix(path, key=None):
+    """A dense cost matrix from .npy, .npz, .csv or .parquet
+
+    .npy files are memory-mapped read-only, so a matrix larger than RAM
+    can be opened and only the touched pages are read; copy it before
+    editing. For .npz, key picks the array (default: the only or first
+    one); it is memory-mapped too if stored uncompressed (np.savez), but
+    read into memory from np.savez_compressed archives, which cannot be
+    mapped. CSV files hold numbers only, with an optional header line.
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".npy":
+        return np.load(path, mmap_mode="r")
+    if ext == ".npz":
+        return _npz_array(path, key)
+    if ext == ".parquet":
+        return _read_parquet(path)
+    return _read_csv(path)[1]
+
+
+def _npz_array(path, key=None):
+    """One array of an .npz, memory-mapped read-only when its member is stored uncompressed"""
+    with zipfile.ZipFile(path) as archive:
+        if key is None:
+            key = archive.namelist()[0][:-len(".npy")]
+        info = archive.getinfo(key + ".npy")
+        if info.compress_type != zipfile.ZIP_STORED:
+            with archive.open(info) as f:
+                return np.lib.format.read_array(f)
+    with open(path, "rb") as f:
+        # local file header: 30 bytes, then the member name and extra field
+        f.seek(info.header_offset)
+        name_length, extra_length = struct.unpack("<26xHH", f.read(30))
+        f.seek(name_length + extra_length, os.SEEK_CUR)
+        version = np.lib.format.read_magic(f)
+        if version == (1, 0):
+            shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+        else:
+            shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+        offset = f.tell()
+    if dtype.hasobject:
+        with np.load(path) as arrays:
+            return arrays[key]
+    return np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=shape,
+                     order="F" if fortran_order else "C")
+
+
+def _read_csv(path):
+    """(header or None, numeric matrix) of a CSV file"""
+    with open(path, newline="", encoding="utf-8") as f:
+        first = next(csv.reader(islice(f, 1)), [])
+    header = None
+    try:
+        [float(value) for value in first]
+    except ValueError:
+        header = [value.strip() for value in first]
+    data = np.loadtxt(path, delimiter=",", skiprows=int(header is not None), ndmin=2,
+                      encoding="utf-8")
+    return header, data
+
+
+def _read_parquet(path):
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("reading .parquet files needs pyarrow (pip install pyarrow)") from None
+    table = pq.read_table(path)
+    return np.column_stack([column.to_numpy() for column in table.columns]).astype(float)
+
+
+def _labels(prefix, count, names=None):
+    return list(names) if names is not None else [f"{prefix} {k + 1}" for k in range(count)]
+
+
+def load_assignment(path, key=None):
+    """Worker/task cost matrix from a file (see load_matrix) as an AssignmentInstance
+
+    A CSV header line, if present, names the tasks. inf (written inf in
+    CSV) marks forbidden pairs.
+    """
+    header = None
+    if os.path.splitext(path)[1].lower() == ".csv":
+        header, cost = _read_csv(path)
+    else:
+        cost = load_matrix(path, key)
+    rows, cols = cost.shape
+    return AssignmentInstance(cost, _labels("Worker", rows), _labels("Task", cols, header))
+
+
+def load_transportation(path, shortage_penalty=0.0, overflow_penalty=0.0):
+    """Transportation instance from .npz or a CSV / Parquet tableau
+
+    An .npz holds arrays cost, supply and demand, and optionally
+    shortage_penalty and overflow_penalty (which then override the
+    arguments); cost is memory-mapped as in load_matrix. A CSV or
+    Parquet file is the classic tableau: the cost matrix with supply as
+    an extra last column and demand as an extra last row (its corner
+    cell is ignored); a CSV header line names the warehouses.
+    """
+    ext = os.path.splitext(path)[1].lower()
+    header = None
+    if ext == ".npz":
+        cost = _npz_array(path, "cost")
+        with np.load(path) as arrays:
+            supply, demand = arrays["supply"], arrays["demand"]
+            if "shortage_penalty" in arrays.files:
+                shortage_penalty = arrays["shortage_penalty"]
+            if "overflow_penalty" in arrays.files:
+                overflow_penalty = arrays["overflow_penalty"]
+    else:
+        if ext == ".csv":
+            header, tableau = _read_csv(path)
+        else:
+            tableau = load_matrix(path)
+        cost, supply, demand = tableau[:-1, :-1], tableau[:-1, -1], tableau[-1, :-1]
+        if header is not None:
+            header = header[:-1]
+    m, n = cost.shape
+    return TransportationInstance(np.asarray(cost, dtype=float), np.asarray(supply, dtype=float),
+                                  np.asarray(demand, dtype=float), _labels("Factory", m),
+                                  _labels("Warehouse", n, header), shortage_penalty,
+                                  overflow_penalty)
@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+"""
+Ranked complete assignments (Murty's algorithm) for backup rosters.
+
+The solution space is partitioned around each optimum: child k keeps the
+first k - 1 free pairs of its parent fixed and forbids the k-th. Children
+are queued at a lower bound read off the parent's reduced costs and only
+solved (warm-started from the parent's AssignmentSession, one augmenting
+path instead of a cold solve) when that bound reaches the front of the
+queue; most children of a large problem are never solved at all.
+"""
+
+import heapq
+import itertools
+from dataclasses import dataclass
+
+import numpy as np
+
+from .assignment import AssignmentResult
+from .assignment_session import AssignmentSession
+from .stats import count
+
+
+@dataclass
+class _Node:
+    """A subproblem (fixed pairs, forbidden pairs) and its optimal state"""
+    fixed: list
+    forbidden: list
+    col_ind: np.ndarray
+    u: np.ndarray
+    v: np.ndarray
+
+
+def ranked_assignments(cost_matrix):
+    """Yield complete assignments in order of increasing total cost
+
+    Lazy: each next() pops one solution and prices its children, so
+    stopping early costs nothing more. Forbidden pairs are inf; if there
+    are more rows than columns, every column is assigned. Raises
+    ValueError if no complete assignment exists.
+    """
+    cost = np.asarray(cost_matrix, dtype=float)
+    if cost.shape[0] > cost.shape[1]:
+        for result in ranked_assignments(cost.T):
+            order = np.argsort(result.col_ind)
+            yield AssignmentResult(result.col_ind[order], result.row_ind[order],
+                                   result.costs[order], result.total)
+        return
+
+    session = AssignmentSession(cost.copy())
+    node = _Node([], [], session.row_to_col.copy(), session.u.copy(), session.v.copy())
+    queue = []
+    counter = itertools.count()
+    while True:
+        yield session.result()
+        _queue_children(session, node, queue, counter)
+        while queue:
+            value, _, parent, position, child = heapq.heappop(queue)
+            if child is not None:
+                session, node = _session(cost, child), child
+                break
+            try:
+                solved, child = _child(cost, parent, position)
+            except ValueError:
+                continue  # nothing feasible in this part of the partition
+            heapq.heappush(queue, (solved.result().total, next(counter), parent, position, child))
+        else:
+            return
+
+
+def k_best_assignments(cost_matrix, k, progress=None):
+    """The k cheapest complete assignments (fewer if fewer exist)
+
+    progress, if given, is called as progress(count, total) as each
+    assignment is found.
+    """
+    ranked = itertools.islice(ranked_assignments(cost_matrix), k)
+    if progress is None:
+        return list(ranked)
+    found = []
+    for result in ranked:
+        found.append(result)
+        progress(len(found), result.total)
+    return found
+
+
+def _session(cost, node):
+    """Warm session for a subproblem from its stored optimal state"""
+    constrained = _constrained(cost, node.fixed, node.forbidden)
+    return AssignmentSession.from_duals(constrained, node.col_ind, node.u, node.v)
+
+
+def _constrained(cost, fixed, forbidden):
+    """Copy of cost with the forbidden pairs and the rest of each fixed row / column at inf"""
+    constrained = cost.copy()
+    if forbidden:
+        constrained[tuple(np.transpose(forbidden))] = np.inf
+    if fixed:
+        rows, cols = np.transpose(fixed)
+        keep = constrained[rows, cols]
+        constrained[rows, :] = np.inf
+        constrained[:, cols] = np.inf
+        constrained[rows, cols] = keep
+    return constrained
+
+
+def _free_rows(node, n_rows):
+    fixed = np.zeros(n_rows, dtype=bool)
+    fixed[[i for i, _ in node.fixed]] = True
+    return np.flatnonzero(~fixed)
+
+
+def _queue_children(session, node, queue, counter):
+    """Queue every child of node at a lower bound on its cost; session is consumed
+
+    Any assignment avoiding pair (i, j) costs at least the current total
+    plus the cheapest other reduced cost in row i plus the cheapest
+    other one in column j (two distinct cells, reduced costs >= 0). With
+    more columns than rows, column j may instead stay free, which costs
+    -v[j]. Fixing the pair afterwards keeps the current optimum optimal.
+    """
+    total = session.result().total
+    wide = session.shape[0] < session.shape[1]
+    for position, i in enumerate(_free_rows(node, session.shape[0])):
+        j = session.row_to_col[i]
+        row = session.cost[i] - session.u[i] - session.v
+        col = session.cost[:, j] - session.u - session.v[j]
+        row[j] = col[i] = np.inf
+        vacate = min(col.min(), -session.v[j]) if wide else col.min()
+        bound = total + max(row.min(), 0.0) + max(vacate, 0.0)
+        if np.isfinite(bound):
+            heapq.heappush(queue, (bound, next(counter), node, position, None))
+        session.fix(i, j)
+
+
+def _child(cost, parent, position):
+    """Solve the popped child from its parent's state
+
+    The parent's optimum stays optimal once its first position free
+    pairs are fixed, so only forbidding the next pair needs an
+    augmenting path.
+    """
+    count("murty.subproblems")
+    free = _free_rows(parent, len(parent.col_ind))
+    fixed = parent.fixed + [(i, parent.col_ind[i]) for i in free[:position]]
+    i = free[position]
+    forbidden = parent.forbidden + [(i, parent.col_ind[i])]
+    session = AssignmentSession.from_duals(_constrained(cost, fixed, parent.forbidden),
+                                           parent.col_ind, parent.u, parent.v)
+    session.set_cost(i, parent.col_ind[i], np.inf)
+    node = _Node(fixed, forbidden, session.row_to_col.copy(), session.u.copy(), session.v.copy())
+    return session, node
@@ -0,0 +1,724 @@
+# -*- coding: utf-8 -*-
+"""
+Text reports for the solver results, rendered lazily.
+
+Every report is a generator of text chunks: fixed blocks come out whole
+and tables one row at a time, so a caller can show the first page of a
+huge model without formatting the rest (the GUI pages through them) or
+stream a full report to disk with write_report. Nothing here touches Tk.
+"""
+
+import numpy as np
+
+from .lp_session import LPSession
+from .simplex import TOL
+from .stats import phase
+from .transport_ranging import TransportationRanging
+
+RULE = "=" * 79
+
+
+def fmt_bound(value, spec):
+    """Format a range bound, printing ±∞ for unbounded sides"""
+    if np.isinf(value):
+        text = "∞" if value > 0 else "-∞"
+        return format(text, spec.split(".")[0] + "s")
+    return format(value + 0.0, spec)  # + 0.0 turns -0.0 into 0.0
+
+
+def fmt_share(part, whole, spec):
+    """part / whole in percent, or a dash when whole is zero"""
+    if whole == 0:
+        return format("-", spec.split(".")[0] + "s") + " "
+    return format(part / whole * 100 + 0.0, spec) + "%"
+
+
+def write_report(path, *reports):
+    """Stream one or more reports to a text file, chunk by chunk"""
+    with open(path, "w", encoding="utf-8") as f, phase("report.render"):
+        for report in reports:
+            for chunk in report:
+                f.write(chunk)
+
+
+def _sensitivity_banner():
+    yield "\n╔" + "=" * 78 + "╗\n"
+    yield "║" + " " * 20 + "SENSITIVITY ANALYSIS" + " " * 38 + "║\n"
+    yield "╚" + "=" * 78 + "╝\n\n"
+
+
+# =====================================================================
+# SIMPLEX
+# =====================================================================
+def simplex_problem(lp):
+    """Problem statement, shown while the LP is being solved"""
+    yield """
+╔══════════════════════════════════════════════════════════════════════════════╗
+║                    LINEAR PROGRAMMING PROBLEM (SIMPLEX)                      ║
+║                      WITH SENSITIVITY ANALYSIS                               ║
+╚══════════════════════════════════════════════════════════════════════════════╝
+
+PROBLEM STATEMENT:
+TechElectro Manufacturing needs to determine optimal production quantities for 
+10 electronic products to maximize total profit while respecting resource constraints.
+
+DECISION VARIABLES:
+X1  = Smartphones     X6  = Smart Watches
+X2  = Tablets         X7  = Headphones
+X3  = Laptops         X8  = Speakers
+X4  = Monitors        X9  = Keyboards
+X5  = Cameras         X10 = Mice
+
+OBJECTIVE FUNCTION (Maximize Profit in $):
+Z = 150X1 + 200X2 + 300X3 + 180X4 + 220X5 + 120X6 + 80X7 + 100X8 + 60X9 + 50X10
+
+CONSTRAINTS:
+1.  Labor Hours:      2X1 + 3X2 + 4X3 + 2.5X4 + 3X5 + 1.5X6 + 1X7 + 1.5X8 + 0.5X9 + 0.5X10 ≤ 8000
+2.  Raw Material A:   5X1 + 4X2 + 8X3 + 6X4 + 7X5 + 3X6 + 2X7 + 3X8 + 1X9 + 1X10 ≤ 15000
+3.  Raw Material B:   3X1 + 5X2 + 6X3 + 4X4 + 5X5 + 2X6 + 1X7 + 2X8 + 0.5X9 + 0.5X10 ≤ 12000
+4.  Machine Time:     4X1 + 5X2 + 7X3 + 4X4 + 6X5 + 2X6 + 1.5X7 + 2X8 + 1X9 + 1X10 ≤ 10000
+5.  Assembly Time:    1X1 + 2X2 + 3X3 + 1.5X4 + 2X5 + 1X6 + 0.5X7 + 1X8 + 0.3X9 + 0.3X10 ≤ 5000
+6.  Quality Control:  0.5X1 + 0.8X2 + 1X3 + 0.7X4 + 0.9X5 + 0.4X6 + 0.3X7 + 0.4X8 + 0.2X9 + 0.2X10 ≤ 2000
+7.  Packaging:        1X1 + 1X2 + 1.5X3 + 1X4 + 1.2X5 + 0.8X6 + 0.5X7 + 0.7X8 + 0.3X9 + 0.3X10 ≤ 3500
+8.  Storage Space:    3X1 + 4X2 + 5X3 + 3.5X4 + 4X5 + 2X6 + 1X7 + 2X8 + 0.5X9 + 0.5X10 ≤ 9000
+9.  Energy:           2X1 + 3X2 + 4X3 + 2.5X4 + 3.5X5 + 1X6 + 0.8X7 + 1.2X8 + 0.4X9 + 0.4X10 ≤ 7000
+10. Budget:           100X1 + 150X2 + 250X3 + 120X4 + 180X5 + 80X6 + 50X7 + 70X8 + 30X9 + 25X10 ≤ 400000
+
+Non-negativity: X1, X2, X3, X4, X5, X6, X7, X8, X9, X10 ≥ 0
+
+"""
+    yield "Solving using Simplex Method...\n\n"
+
+
+def simplex_solution(lp, res, new_constraint=None, new_product=None):
+    """Optimal plan, sensitivity and what-ifs
+
+    new_constraint is a (row, rhs) and new_product a (column, profit)
+    what-if, each warm-started from the optimal basis.
+    """
+    if not res.success:
+        yield "Failed to find optimal solution!\n"
+        return
+
+    yield """
+═══════════════════════════════════════════════════════════════════════════════
+                              OPTIMAL SOLUTION
+═══════════════════════════════════════════════════════════════════════════════
+
+OPTIMAL PRODUCTION QUANTITIES:
+"""
+    for prod, qty in zip(lp.products, res.x):
+        yield f"  {prod:20s} = {qty:8.2f} units\n"
+
+    yield f"\n{RULE}\n"
+    yield f"MAXIMUM PROFIT: ${res.profit:,.2f}\n"
+    yield f"{RULE}\n\n"
+
+    yield from simplex_sensitivity_report(lp.b, lp.c, res, lp.products, lp.constraint_names)
+    yield from a_matrix_report(lp.A, res, lp.products, lp.constraint_names)
+
+    if new_constraint is None and new_product is None:
+        return
+    session = LPSession(lp.c, lp.A, lp.b, result=res)
+    if new_constraint is not None:
+        yield from new_constraint_report(session, *new_constraint)
+    if new_product is not None:
+        yield from new_product_report(session, *new_product)
+
+
+def simplex_sensitivity_report(b, c, res, products, constraint_names):
+    """Shadow prices, reduced costs, RHS and cost ranging"""
+    sens = res.sensitivity
+    yield from _sensitivity_banner()
+
+    # 1. SHADOW PRICES
+    yield "1. SHADOW PRICES (Dual Values)\n"
+    yield RULE + "\n"
+    yield "Shadow Price = Profit increase per unit increase in resource\n\n"
+    yield f"{'Constraint':<20s} {'Used/Limit':>15s} {'Shadow Price':>15s} {'Status':>12s}\n"
+    yield "-" * 79 + "\n"
+
+    for i in range(len(b)):
+        status = "BINDING" if sens.binding[i] else "NON-BINDING"
+        yield (
+            f"{constraint_names[i]:<20s} {res.usage[i]:>7.0f}/{b[i]:<7.0f} "
+            f"${sens.shadow_prices[i]:>14.2f} {status:>12s}\n"
+        )
+
+    # 2. REDUCED COSTS
+    yield "\n2. REDUCED COSTS\n"
+    yield RULE + "\n"
+    yield "Amount profit must increase for non-basic products to enter production\n\n"
+    yield f"{'Product':<20s} {'Production':>12s} {'Reduced Cost':>15s} {'Status':>15s}\n"
+    yield "-" * 79 + "\n"
+
+    for i, (prod, qty) in enumerate(zip(products, res.x)):
+        status = "IN BASIS" if qty > TOL else "NOT IN BASIS"
+        yield f"{prod:<20s} {qty:>12.2f} ${sens.reduced_costs[i]:>14.2f} {status:>15s}\n"
+
+    # 3. RHS RANGING
+    yield "\n3. RIGHT-HAND SIDE SENSITIVITY RANGES\n"
+    yield RULE + "\n"
+    yield "Range where shadow price remains valid\n\n"
+    yield f"{'Constraint':<20s} {'Current':>10s} {'Min RHS':>10s} {'Max RHS':>10s} {'% Range':>12s}\n"
+    yield "-" * 79 + "\n"
+
+    for i, name in enumerate(constraint_names):
+        current = b[i]
+        min_rhs, max_rhs = sens.rhs_ranges[i]
+        if current == 0:
+            pct = "n/a"
+        else:
+            dec_pct = (current - min_rhs) / abs(current) * 100
+            inc_pct = (max_rhs - current) / abs(current) * 100
+            pct = f"[-{fmt_bound(dec_pct, '.0f')}%,+{fmt_bound(inc_pct, '.0f')}%]"
+
+        yield (
+            f"{name:<20s} {current:>10.0f} {fmt_bound(min_rhs, '>10.0f')} "
+            f"{fmt_bound(max_rhs, '>10.0f')} {pct}\n"
+        )
+
+    # 4. OBJECTIVE COEFFICIENT RANGING
+    yield "\n4. OBJECTIVE COEFFICIENT SENSITIVITY RANGES\n"
+    yield RULE + "\n"
+    yield "Profit ranges where optimal solution remains unchanged\n\n"
+    yield f"{'Product':<20s} {'Current $':>10s} {'Min $':>10s} {'Max $':>10s} {'Range $':>15s}\n"
+    yield "-" * 79 + "\n"
+
+    for i, prod in enumerate(products):
+        current = -c[i]
+        min_profit, max_profit = sens.cost_ranges[i]
+        dec = current - min_profit
+        inc = max_profit - current
+
+        yield (
+            f"{prod:<20s} {current:>10.0f} {fmt_bound(min_profit, '>10.0f')} "
+            f"{fmt_bound(max_profit, '>10.0f')} "
+            f"[{fmt_bound(-dec, '>6.0f')},+{fmt_bound(inc, '.0f')}]\n"
+        )
+
+    yield f"""
+
+{RULE}
+                          MANAGERIAL INSIGHTS
+{RULE}
+
+KEY FINDINGS:
+
+1. BINDING CONSTRAINTS (Critical Bottlenecks):
+   Constraints with shadow price > $0 are fully utilized.
+   → Focus: Expand capacity for resources with highest shadow prices
+
+2. NON-BINDING CONSTRAINTS:
+   Constraints with slack > 0 have unused capacity.
+   → Consider: Reduce investment or reallocate these resources
+
+3. PRODUCTION RECOMMENDATIONS:
+   - Produce all items with qty > 0 at indicated levels
+   - Items with qty = 0 are unprofitable under current conditions
+   - Monitor reduced costs to identify when non-produced items become viable
+
+4. PRICE SENSITIVITY:
+   - Narrow ranges indicate high sensitivity to price changes
+   - Wide ranges suggest robust decisions less affected by market fluctuations
+
+ACTIONABLE RECOMMENDATIONS:
+
+1. Prioritize expanding the top 3 binding constraints
+2. Negotiate better prices for products with high reduced costs
+3. Re-optimize quarterly or when parameters change by >10%
+4. Use shadow prices for make-vs-buy resource decisions
+5. Focus marketing on high-volume products in the solution
+
+{RULE}
+"""
+
+
+def a_matrix_report(A, res, products, constraint_names):
+    """How changes in the coefficients a_ij matter, summarized per column
+
+    Every a_ij of a column behaves the same way qualitatively (it depends
+    only on whether the product is basic), so the report explains the
+    two cases once and lists each product with the binding constraints
+    its coefficients touch, instead of a paragraph per coefficient.
+    """
+    yield "\n\n═══════════════════════════════════════════════════════════════════════\n"
+    yield "               A-MATRIX COEFFICIENT SENSITIVITY ANALYSIS\n"
+    yield "═══════════════════════════════════════════════════════════════════════\n"
+    yield (
+        "Interpretation of how changes in each coefficient a_ij affect the model.\n"
+        "Small changes keep the same basis; large changes may require re-optimization.\n\n"
+    )
+
+    basic = np.asarray(res.x) > TOL
+    binding = np.flatnonzero(res.sensitivity.binding) if res.sensitivity is not None \
+        else np.flatnonzero(np.asarray(res.slack) < TOL)
+    yield (
+        f"BASIC columns ({basic.sum()} of {len(products)}): changing a_ij shifts the values\n"
+        "  of the basic variables but typically keeps the current basis; changes in\n"
+        "  binding rows move the optimum most.\n"
+        f"NON-BASIC columns ({(~basic).sum()} of {len(products)}): increasing a_ij makes the\n"
+        "  product use more of constraint i; decreasing it in binding rows can make\n"
+        "  the product attractive enough to enter the basis.\n\n"
+    )
+
+    yield f"{'Product':<20s} {'Status':<10s} {'Nonzero a_ij':>12s}   Binding constraints used\n"
+    yield "-" * 79 + "\n"
+    for j, prod in enumerate(products):
+        column = np.asarray(_column(A, j))
+        used = [constraint_names[i] for i in binding if column[i] != 0]
+        if len(used) > 4:
+            used = used[:3] + [f"... (+{len(used) - 3} more)"]
+        status = "BASIC" if basic[j] else "NON-BASIC"
+        yield f"{prod:<20s} {status:<10s} {np.count_nonzero(column):>12d}   {', '.join(used) or '-'}\n"
+
+
+def _column(A, j):
+    if hasattr(A, "getcol"):
+        return A.getcol(j).toarray().ravel()
+    return np.asarray(A)[:, j]
+
+
+def new_constraint_report(session, new_row, new_rhs):
+    """What-if: add new_row @ x <= new_rhs, re-optimized by dual simplex"""
+    res_new = session.copy().add_constraint(new_row, new_rhs)
+
+    text = "\n\n═══════════════════════════════════════════════════════════════════════\n"
+    text += "                     NEW CONSTRAINT SENSITIVITY\n"
+    text += "═══════════════════════════════════════════════════════════════════════\n"
+    text += f"New Constraint Added: {new_row} ≤ {new_rhs}\n\n"
+
+    if res_new.success:
+        text += "Result: The new constraint is FEASIBLE.\n"
+        text += f"New Optimal Profit = ${res_new.profit:,.2f}\n"
+        text += "Interpretation:\n"
+        text += "  • If profit decreased or production quantities changed, the new\n"
+        text += "    constraint is binding and restricts operations.\n"
+        text += "  • If profit and solution stayed same, the new constraint is redundant.\n\n"
+    else:
+        text += "Result: NEW CONSTRAINT MAKES THE PROBLEM INFEASIBLE.\n"
+        text += "→ This constraint cannot be added without relaxing other constraints\n"
+        text += "  or accepting a different feasible region.\n\n"
+    yield text
+
+
+def new_product_report(session, new_col, new_profit):
+    """What-if: add a product, priced against the current duals"""
+    res_new = session.copy().add_variable(new_col, new_profit)
+    n_vars = session.shape[1] + 1
+
+    text = "\n\n═══════════════════════════════════════════════════════════════════════\n"
+    text += "                       NEW VARIABLE SENSITIVITY\n"
+    text += "═══════════════════════════════════════════════════════════════════════\n"
+    text += f"New Product (X{n_vars}) Added:\n"
+    text += f"  • Resource usage coefficients: {new_col}\n"
+    text += f"  • Profit per unit: ${new_profit}\n\n"
+
+    if res_new.success:
+        new_var_qty = res_new.x[-1]
+
+        text += f"New Optimal Profit = ${res_new.profit:,.2f}\n"
+        text += f"Optimal quantity of new product X{n_vars} = {new_var_qty:.2f} units\n\n"
+
+        if new_var_qty > TOL:
+            text += (
+                "Conclusion: The new product ENTERED the basis.\n"
+                "→ It is profitable under current resource structure and should be\n"
+                "   included in the production plan.\n"
+            )
+        else:
+            text += (
+                "Conclusion: The new product DID NOT enter the basis.\n"
+                "→ At current profit and resource usage, it is not competitive with\n"
+                "   existing products.\n"
+            )
+    else:
+        text += (
+            "Adding the new variable led to an infeasible or unbounded model.\n"
+            "→ Check coefficients and profit values.\n"
+        )
+    yield text
+
+
+def integer_plan_report(lp, res):
+    """Whole-unit plan of solve_integer against the LP bound"""
+    text = "\n\n═══════════════════════════════════════════════════════════════════════\n"
+    text += "                       WHOLE-UNIT PRODUCTION PLAN\n"
+    text += "═══════════════════════════════════════════════════════════════════════\n"
+    if not res.success:
+        text += f"No integer plan found: {res.message}\n"
+        yield text
+        return
+
+    for prod, qty in zip(lp.products, res.x):
+        text += f"  {prod:20s} = {qty:8.0f} units\n"
+    text += f"\nProfit (whole units):        ${res.profit:,.2f}\n"
+    text += f"LP bound (fractional plan):  ${res.lp_bound:,.2f}   (gap {res.lp_gap:.2%})\n"
+    text += f"Best possible integer plan:  ${res.bound:,.2f}   (gap {res.gap:.2%})\n"
+    if res.rounded_profit is not None:
+        text += f"Rounded LP plan:             ${res.rounded_profit:,.2f}\n"
+    if res.status == 1:
+        text += "\nThe time or node limit ended the search: this is the best plan found by then.\n"
+    elif res.status != 0:
+        text += f"\nThe search stopped early ({res.message}): this is the best plan found by then.\n"
+    yield text
+
+
+# =====================================================================
+# ASSIGNMENT
+# =====================================================================
+def assignment_problem(inst):
+    """Cost matrix, shown while the assignment is being solved"""
+    workers, tasks = inst.workers, inst.tasks
+    yield f"""
+╔══════════════════════════════════════════════════════════════════════════════╗
+║                          ASSIGNMENT PROBLEM                                  ║
+║                      WITH SENSITIVITY ANALYSIS                               ║
+╚══════════════════════════════════════════════════════════════════════════════╝
+
+PROBLEM: Assign {len(workers)} workers to {len(tasks)} assembly tasks to minimize total time.
+
+COST MATRIX (Time in Hours):
+═══════════════════════════════════════════════════════════════════════════════
+Worker    {"".join(f"T{j + 1:<5d}" for j in range(len(tasks))).rstrip()}
+───────────────────────────────────────────────────────────────────────────────
+"""
+    for i, worker in enumerate(workers):
+        yield f"{worker:<8s}  " + "".join(f"{inst.cost_matrix[i][j]:4g}  " for j in range(len(tasks))) + "\n"
+
+    yield "═" * 79 + "\n\nSolving using Hungarian Algorithm...\n\n"
+
+
+def assignment_solution(inst, res, backups=()):
+    """Optimal assignment, sensitivity and backup rosters (k-best results)"""
+    workers, tasks = inst.workers, inst.tasks
+    yield """
+═══════════════════════════════════════════════════════════════════════════════
+                            OPTIMAL ASSIGNMENT
+═══════════════════════════════════════════════════════════════════════════════
+
+"""
+    for i, j, time in zip(res.row_ind, res.col_ind, res.costs):
+        yield f"  {workers[i]:<10s} → {tasks[j]:<15s} ({time:2g} hours)\n"
+
+    yield f"\n{RULE}\n"
+    yield f"MINIMUM TOTAL TIME: {res.total:g} hours\n"
+    yield f"{RULE}\n\n"
+
+    yield from assignment_sensitivity_report(res, workers, tasks, backups)
+
+
+def assignment_sensitivity_report(res, workers, tasks, backups=()):
+    """Opportunity costs, tolerances, efficiency and backup rosters"""
+    sens = res.sensitivity
+    yield from _sensitivity_banner()
+
+    # 1. OPPORTUNITY COSTS
+    yield "1. OPPORTUNITY COST ANALYSIS\n"
+    yield RULE + "\n"
+    yield "Reduced cost: how much an alternative's time must drop before it enters the optimum\n\n"
+
+    yield "Top 10 Alternative Assignments (lowest opportunity cost):\n\n"
+    yield f"{'Worker':<12s} {'Task':<15s} {'Time':>8s} {'Opp. Cost':>12s}\n"
+    yield "-" * 79 + "\n"
+
+    for i, j, time, opp in sens.alternatives[:10]:
+        yield f"{workers[i]:<12s} {tasks[j]:<15s} {time:>8g} hrs {opp:>11.1f} hrs\n"
+
+    # 2. COST TOLERANCE
+    yield "\n2. COST TOLERANCE ANALYSIS\n"
+    yield RULE + "\n"
+    yield "How much can assignment costs rise before the optimal assignment changes?\n\n"
+    yield f"{'Worker':<12s} {'→ Task':<15s} {'Current':>10s} {'Max Increase':>15s}\n"
+    yield "-" * 79 + "\n"
+
+    for i, j, current_cost, tolerance in zip(res.row_ind, res.col_ind, res.costs, sens.tolerance):
+        yield f"{workers[i]:<12s} → {tasks[j]:<13s} {current_cost:>10g} hrs {tolerance:>14.1f} hrs\n"
+
+    # 3. WORKER EFFICIENCY
+    yield "\n3. WORKER EFFICIENCY ANALYSIS\n"
+    yield RULE + "\n\n"
+
+    avg_time = res.total / len(workers)
+    yield f"Average time per assignment: {avg_time:.1f} hours\n\n"
+    yield f"{'Worker':<12s} {'Assigned Time':>15s} {'vs Average':>15s} {'Rating':>15s}\n"
+    yield "-" * 79 + "\n"
+
+    for i, time in zip(res.row_ind, res.costs):
+        diff = time - avg_time
+        rating = "Excellent" if time < avg_time * 0.8 else ("Good" if time < avg_time else "Needs Training")
+        yield f"{workers[i]:<12s} {time:>15g} hrs {diff:>14.1f} hrs {rating:>15s}\n"
+
+    # 4. BACKUP ROSTERS
+    yield "\n4. BACKUP ROSTERS\n"
+    yield RULE + "\n"
+    yield "Next-best complete assignments (Murty's k-best), ranked by total time:\n\n"
+    yield f"{'Rank':<6s} {'Total':>9s} {'Extra':>9s}   Changes from the optimum\n"
+    yield "-" * 79 + "\n"
+
+    optimal = dict(zip(res.row_ind, res.col_ind))
+    for rank, backup in enumerate(backups, start=2):
+        changes = ", ".join(
+            f"{workers[i]} → {tasks[j]}"
+            for i, j in zip(backup.row_ind, backup.col_ind)
+            if optimal.get(i) != j
+        )
+        yield f"#{rank:<5d} {backup.total:>5g} hrs {backup.total - res.total:>+5g} hrs   {changes}\n"
+
+    yield f"""
+
+{RULE}
+                          MANAGERIAL INSIGHTS
+{RULE}
+
+KEY FINDINGS:
+
+1. ASSIGNMENT STABILITY:
+   - High opportunity costs (>5 hrs) indicate stable assignments
+   - Low opportunity costs (<2 hrs) suggest near-equivalent alternatives
+
+2. FLEXIBILITY:
+   - Workers with high cost tolerance can handle task changes better
+   - Low tolerance workers are optimally matched - avoid reassignment
+
+3. TRAINING PRIORITIES:
+   - Focus training on workers performing above average time
+   - Cross-train workers with narrow assignment options
+
+RECOMMENDATIONS:
+
+1. Implement the optimal assignment immediately
+2. Keep the backup rosters above ready for absences on critical tasks
+3. Provide specialized training to workers with below-average efficiency
+4. Consider team-based assignments for workers with similar skills
+5. Re-evaluate assignments monthly or when new workers/tasks are added
+
+{RULE}
+"""
+
+
+# =====================================================================
+# TRANSPORTATION
+# =====================================================================
+def transportation_problem(inst):
+    """Cost matrix and balance, shown while the plan is being solved"""
+    cost_matrix, factories, warehouses = inst.cost_matrix, inst.factories, inst.warehouses
+    yield """
+╔══════════════════════════════════════════════════════════════════════════════╗
+║                        TRANSPORTATION PROBLEM                                ║
+║              (VAM + UV Method + Sensitivity Analysis)                        ║
+╚══════════════════════════════════════════════════════════════════════════════╝
+
+"""
+    total_supply, total_demand = np.sum(inst.supply), np.sum(inst.demand)
+    if total_supply == total_demand:
+        balance = f"Total Supply = Total Demand = {total_supply:.0f} units (BALANCED)"
+    else:
+        balance = (f"Total Supply = {total_supply:.0f}, Total Demand = {total_demand:.0f} "
+                   f"units (UNBALANCED)")
+    yield (
+        f"PROBLEM: Distribute products from {len(factories)} factories to "
+        f"{len(warehouses)} warehouses at minimum cost.\n\n{balance}\n\n"
+        "COST MATRIX ($ per unit):\n" + "═" * 79 + "\n"
+        + "Factory   " + "   ".join(f"W{j + 1}" for j in range(len(warehouses))) + "\n"
+        + "─" * 79 + "\n"
+    )
+
+    for i, factory in enumerate(factories):
+        yield f"{factory:<10s}  " + "".join(f"{cost_matrix[i][j]:3g}  " for j in range(len(warehouses))) + "\n"
+
+    yield "═" * 79 + "\n\n"
+
+
+def transportation_solution(inst, res):
+    """VAM / UV steps, optimal plan and sensitivity"""
+    cost_matrix, factories, warehouses = inst.cost_matrix, inst.factories, inst.warehouses
+
+    # STEP 1: VAM
+    steps = "STEP 1: Initial Solution (Vogel's Approximation Method)\n"
+    steps += RULE + "\n\n"
+    steps += f"\nInitial Cost: ${res.initial_cost:,.2f}\n\n"
+
+    # STEP 2: UV Method
+    steps += "STEP 2: Optimization (UV/MODI Method)\n"
+    steps += RULE + "\n\n"
+    steps += f"\nOptimized in {res.iterations} iterations\n\n"
+    yield steps
+
+    yield """
+═══════════════════════════════════════════════════════════════════════════════
+                        OPTIMAL TRANSPORTATION PLAN
+═══════════════════════════════════════════════════════════════════════════════
+
+NON-ZERO SHIPMENTS:
+"""
+    allocation = res.allocation
+    for i, j in zip(*(allocation > 0.01).nonzero()):
+        cost = cost_matrix[i, j] * allocation[i, j]
+        yield (
+            f"  {factories[i]:<12s} → {warehouses[j]:<12s}: "
+            f"{allocation[i, j]:>6.0f} units (${cost:>8.2f})\n"
+        )
+
+    for j in np.flatnonzero(res.unmet_demand > 0.01):
+        yield f"  {'(unmet)':<12s} → {warehouses[j]:<12s}: {res.unmet_demand[j]:>6.0f} units\n"
+    for i in np.flatnonzero(res.unshipped_supply > 0.01):
+        yield f"  {factories[i]:<12s} → {'(unshipped)':<12s}: {res.unshipped_supply[i]:>6.0f} units\n"
+
+    yield f"\n{RULE}\n"
+    yield f"MINIMUM TOTAL COST: ${res.total_cost:,.2f}\n"
+    yield f"Cost Reduction: ${res.initial_cost - res.total_cost:,.2f}\n"
+    yield f"{RULE}\n\n"
+
+    ranging = TransportationRanging.from_result(cost_matrix, inst.supply, inst.demand, res,
+                                                inst.shortage_penalty, inst.overflow_penalty)
+    yield from transportation_sensitivity_report(
+        cost_matrix, res, inst.supply, inst.demand, factories, warehouses, ranging
+    )
+
+
+def transportation_sensitivity_report(cost, res, supply, demand, factories, warehouses,
+                                      ranging=None):
+    """Duals, alternative routes, route utilization and supply / demand use
+
+    With ranging (a TransportationRanging of res) the routes and the
+    supply / demand tables also show the range over which the optimal
+    routes stay the same.
+    """
+    sens = res.sensitivity
+    allocation = res.allocation
+    yield from _sensitivity_banner()
+
+    # 1. DUAL VARIABLES (u and v)
+    yield "1. DUAL VARIABLES (u and v values)\n"
+    yield RULE + "\n\n"
+
+    n, m = len(factories), len(warehouses)
+
+    yield "Factory Dual Variables (u):\n"
+    for i, factory in enumerate(factories):
+        yield f"  {factory:<12s}: u{i + 1} = ${sens.u[i]:>6.2f}\n"
+
+    yield "\nWarehouse Dual Variables (v):\n"
+    for j, warehouse in enumerate(warehouses):
+        yield f"  {warehouse:<12s}: v{j + 1} = ${sens.v[j]:>6.2f}\n"
+
+    # 2. REDUCED COSTS
+    yield "\n2. REDUCED COSTS FOR NON-BASIC ROUTES\n"
+    yield RULE + "\n"
+    yield "Negative values indicate potential for cost improvement\n\n"
+
+    yield "Top 10 Alternative Routes (lowest reduced cost):\n\n"
+    yield f"{'Factory':<12s} {'→ Warehouse':<12s} {'Cost':>8s} {'Reduced Cost':>15s}\n"
+    yield "-" * 79 + "\n"
+
+    for i, j, c_val, rc in sens.routes[:10]:
+        yield f"{factories[i]:<12s} → {warehouses[j]:<10s} ${c_val:>7.2f} ${rc:>14.2f}\n"
+
+    # 3. ROUTE UTILIZATION
+    yield "\n3. ROUTE UTILIZATION ANALYSIS\n"
+    yield RULE + "\n\n"
+
+    total_units = allocation.sum()
+    avg_cost_per_unit = res.total_cost / total_units if total_units > 0 else 0.0
+
+    yield f"Average cost per unit: ${avg_cost_per_unit:.2f}\n\n"
+    header = f"{'Factory':<12s} {'→ Warehouse':<12s} {'Units':>8s} {'$/unit':>8s} {'Efficiency':>12s}"
+    if ranging is not None:
+        header += f" {'Min $':>8s} {'Max $':>8s}"
+    yield header + "\n"
+    yield "-" * 79 + "\n"
+
+    active = (allocation > 0.01).nonzero()
+    if ranging is not None:
+        cost_ranges = ranging.cost_ranges(*active)[2]
+    for k, (i, j) in enumerate(zip(*active)):
+        unit_cost = cost[i, j]
+        efficiency = "Excellent" if unit_cost < avg_cost_per_unit * 0.9 else \
+            ("Good" if unit_cost < avg_cost_per_unit * 1.1 else "High Cost")
+
+        line = (
+            f"{factories[i]:<12s} → {warehouses[j]:<10s} {allocation[i, j]:>8.0f} "
+            f"${unit_cost:>7.2f} {efficiency:>12s}"
+        )
+        if ranging is not None:
+            low, high = cost_ranges[k]
+            line += f" {fmt_bound(low, '>8.2f')} {fmt_bound(high, '>8.2f')}"
+        yield line + "\n"
+
+    # 4. SUPPLY/DEMAND SENSITIVITY
+    yield "\n4. SUPPLY/DEMAND SENSITIVITY\n"
+    yield RULE + "\n\n"
+
+    ranged = ranging is not None
+    if ranged:
+        supply_ranges = ranging.supply_ranges(supply)
+        demand_ranges = ranging.demand_ranges(demand)
+        if ranging.shape == (ranging.M, ranging.N):
+            yield ("Min / Max: range keeping the same routes, the last warehouse's demand\n"
+                   "(last factory's supply) moving with it to stay balanced.\n\n")
+        else:
+            yield "Min / Max: range keeping the same routes.\n\n"
+    range_header = f" {'Min':>10s} {'Max':>10s}" if ranged else ""
+
+    yield "Factory Supply Utilization:\n"
+    yield f"{'Factory':<12s} {'Shipped':>10s} {'Capacity':>10s} {'% Used':>10s}{range_header}\n"
+    yield "-" * 79 + "\n"
+
+    for i in range(n):
+        shipped = sens.shipped[i]
+        pct = fmt_share(shipped, supply[i], ">9.1f")
+        line = f"{factories[i]:<12s} {shipped:>10.0f} {supply[i]:>10.0f} {pct}"
+        if ranged:
+            low, high = supply_ranges[i]
+            line += f" {fmt_bound(low, '>10.0f')} {fmt_bound(high, '>10.0f')}"
+        yield line + "\n"
+
+    yield "\nWarehouse Demand Fulfillment:\n"
+    yield f"{'Warehouse':<12s} {'Received':>10s} {'Demand':>10s} {'% Filled':>10s}{range_header}\n"
+    yield "-" * 79 + "\n"
+
+    for j in range(m):
+        received = sens.received[j]
+        pct = fmt_share(received, demand[j], ">9.1f")
+        line = f"{warehouses[j]:<12s} {received:>10.0f} {demand[j]:>10.0f} {pct}"
+        if ranged:
+            low, high = demand_ranges[j]
+            line += f" {fmt_bound(low, '>10.0f')} {fmt_bound(high, '>10.0f')}"
+        yield line + "\n"
+
+    active_routes = len(active[0])
+    possible_routes = getattr(cost, "nnz", n * m)  # sparse costs list only open lanes
+
+    yield f"""
+
+{RULE}
+                          MANAGERIAL INSIGHTS
+{RULE}
+
+KEY FINDINGS:
+
+1. OPTIMAL ROUTES:
+   - {active_routes} active routes out of {possible_routes} possible
+   - Routes with negative reduced costs should be considered if situation changes
+   - High-cost routes may need renegotiation or alternative suppliers
+
+2. ALTERNATIVE ROUTES:
+   - Routes with reduced cost near 0 are good backup options
+   - Large positive reduced costs indicate routes to avoid
+
+3. CAPACITY PLANNING:
+   - All facilities at 100% utilization indicates optimal resource use
+   - Consider expanding facilities with consistent high demand
+
+RECOMMENDATIONS:
+
+1. Implement the optimal shipping plan immediately
+2. Negotiate lower rates for high-volume, high-cost routes
+3. Establish backup routes from alternatives with low reduced costs
+4. Monitor fuel prices and recalculate if costs change >5%
+5. Consider warehouse locations - clusters of high-cost routes suggest need
+6. Re-optimize monthly or when supply/demand changes by >10%
+
+{RULE}
+"""
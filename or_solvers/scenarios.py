@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+"""
+Batch what-if engine for the product-mix LP: solve many perturbations
+of one base model, each warm-started from the base optimal basis.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+import numpy as np
+from scipy.sparse import csc_matrix, issparse
+
+from .lp_session import LPSession
+
+# Scenarios handed to a worker process at a time
+DEFAULT_CHUNKSIZE = 64
+
+
+@dataclass
+class Scenario:
+    """Changes to the base LP; any field may be None
+
+    db and dc are dense deltas added to b and c; dA is a
+    (rows, cols, deltas) triple of sparse changes to A (kept sparse when
+    the base A is).
+    """
+    db: np.ndarray = None
+    dc: np.ndarray = None
+    dA: tuple = None
+
+
+@dataclass
+class ScenarioResults:
+    """One row per scenario, in input order
+
+    status uses the linprog codes (0 optimal, 2 infeasible, 3 unbounded,
+    4 numerical); objective, x and duals are NaN where status != 0.
+    objective is the profit and duals are in profit terms, as in
+    SimplexResult.
+    """
+    status: np.ndarray
+    objective: np.ndarray
+    x: np.ndarray
+    duals: np.ndarray
+    pivots: np.ndarray
+
+
+# Base session built once per worker process by _init_worker
+_base = None
+
+
+def _init_worker(c, A, b, basis):
+    global _base
+    _base = LPSession.from_basis(c, A, b, basis)
+
+
+def _solve_one(base, scenario):
+    session = base.copy()
+    b = base.b if scenario.db is None else base.b + scenario.db
+    c = base.c if scenario.dc is None else base.c + scenario.dc
+
+    if scenario.dA is None:
+        result = session.reoptimize(b=b, c=c)
+    else:
+        rows, cols, deltas = scenario.dA
+        if issparse(base.A):
+            A = base.A + csc_matrix((deltas, (rows, cols)), shape=base.A.shape)
+        else:
+            A = base.A.copy()
+            np.add.at(A, (rows, cols), deltas)
+        result = session.reoptimize(b=b, c=c, A=A, changed_columns=np.unique(cols))
+    return result, session.pivots - base.pivots
+
+
+def _solve_chunk(scenarios, base=None):
+    base = _base if base is None else base
+    m, n = base.A.shape
+    k = len(scenarios)
+    status = np.zeros(k, dtype=np.int8)
+    objective = np.full(k, np.nan)
+    x = np.full((k, n), np.nan)
+    duals = np.full((k, m), np.nan)
+    pivots = np.zeros(k, dtype=np.int32)
+
+    for s, scenario in enumerate(scenarios):
+        result, pivots[s] = _solve_one(base, scenario)
+        status[s] = result.status
+        if result.success:
+            objective[s] = result.profit
+            x[s] = result.x
+            duals[s] = result.duals
+    return status, objective, x, duals, pivots
+
+
+def solve_scenarios(c, A, b, scenarios, processes=None, chunksize=DEFAULT_CHUNKSIZE, session=None):
+    """
+    Solve the base LP once, then every scenario warm-started from its basis.
+
+    Work is spread over a process pool in chunks of chunksize; each worker
+    factors the base basis once. processes=None uses every core,
+    processes=1 solves inline. Pass session to reuse an already solved
+    base model.
+    """
+    if session is None:
+        session = LPSession(c, A, b)
+    scenarios = list(scenarios)
+    if processes is None:
+        processes = os.cpu_count() or 1
+
+    chunks = [scenarios[k:k + chunksize] for k in range(0, len(scenarios), chunksize)]
+    if processes <= 1 or len(chunks) <= 1:
+        parts = [_solve_chunk(chunk, session) for chunk in chunks]
+    else:
+        initargs = (session.c, session.A, session.b, session.basis)
+        with ProcessPoolExecutor(processes, initializer=_init_worker, initargs=initargs) as pool:
+            parts = list(pool.map(_solve_chunk, chunks))
+
+    if not parts:
+        parts = [_solve_chunk([], session)]
+    return ScenarioResults(*(np.concatenate(arrays) for arrays in zip(*parts)))
@@ -0,0 +1,405 @@
+# -*- coding: utf-8 -*-
+"""
+Linear programming (product mix) solver with sensitivity analysis.
+
+All functions take the model in linprog form (minimize c @ x subject to
+A @ x <= b, x >= 0) and return plain result objects; nothing here touches
+the GUI. A may be a dense array or a scipy.sparse matrix; a sparse A
+stays sparse through the solve, the sensitivity ranging and LPSession.
+"""
+
+import os
+import re
+import sys
+import threading
+import warnings
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+import numpy as np
+from scipy.linalg import LinAlgWarning, lu_factor, lu_solve, qr
+from scipy.optimize import linprog
+from scipy.sparse import csc_matrix, csr_matrix, diags, issparse
+from scipy.sparse import hstack as sparse_hstack
+from scipy.sparse.csgraph import min_weight_full_bipartite_matching
+from scipy.sparse.linalg import splu
+
+from .stats import SolveStats, collect, count, phase
+
+# Slack / quantity below which a constraint is binding or a variable is zero
+TOL = 0.01
+# Numerical zero for basis identification and ratio tests
+EPS = 1e-9
+# Rows / columns of B^-1 formed at a time for sensitivity ranging
+SENSITIVITY_BLOCK = 256
+
+
+@dataclass
+class SimplexSensitivity:
+    """Shadow prices, reduced costs and ranging for an optimal LP
+
+    rhs_ranges[i] is the (min, max) b[i] over which the shadow prices stay
+    valid; cost_ranges[j] is the (min, max) unit profit of product j over
+    which the optimal basis is unchanged. basis indexes the columns of
+    [A | I] that form the optimal basis.
+    """
+    shadow_prices: np.ndarray
+    binding: np.ndarray
+    reduced_costs: np.ndarray
+    rhs_ranges: np.ndarray
+    cost_ranges: np.ndarray
+    basis: np.ndarray = None
+
+
+@dataclass
+class SimplexResult:
+    """Outcome of one LP solve; profit is the maximized objective (-c @ x)
+
+    duals and reduced_costs are in profit terms, read from the HiGHS
+    marginals: duals[i] is the profit gained per extra unit of b[i], and
+    reduced_costs[j] is how much product j's profit must rise before it
+    is worth producing. status uses the linprog codes (0 optimal,
+    2 infeasible, 3 unbounded, 4 numerical difficulties). stats holds
+    the phase timings and counters when the solve collected them.
+    """
+    success: bool
+    message: str
+    x: np.ndarray = None
+    profit: float = None
+    usage: np.ndarray = None
+    slack: np.ndarray = None
+    duals: np.ndarray = None
+    reduced_costs: np.ndarray = None
+    sensitivity: SimplexSensitivity = None
+    status: int = 0
+    stats: SolveStats = None
+
+
+# Iteration line of the HiGHS simplex log: iteration count, then objective
+_LOG_LINE = re.compile(r"^\s*(\d+)\s+([-+]?\d\S*)\s")
+
+
+def _linprog(c, A, b, progress=None):
+    if progress is None:
+        return linprog(c, A_ub=A, b_ub=b, bounds=(0, None), method="highs")
+    with _highs_log(lambda iteration, objective: progress(iteration, -objective)):
+        return linprog(c, A_ub=A, b_ub=b, bounds=(0, None), method="highs",
+                       options={"disp": True})
+
+
+@contextmanager
+def _highs_log(progress):
+    """Feed the HiGHS iteration log to progress(iteration, objective)
+
+    HiGHS prints its log from C straight to file descriptor 1, so fd 1
+    is pointed at a pipe for the duration and a reader thread parses
+    the lines as they come; anything else written to stdout meanwhile
+    is dropped.
+    """
+    sys.stdout.flush()
+    read_end, write_end = os.pipe()
+    saved = os.dup(1)
+    os.dup2(write_end, 1)
+    os.close(write_end)
+    reader = threading.Thread(target=_follow_log, args=(read_end, progress), daemon=True)
+    reader.start()
+    try:
+        yield
+    finally:
+        os.dup2(saved, 1)  # closes the last write end, so the reader sees EOF
+        os.close(saved)
+        reader.join()
+
+
+def _follow_log(fd, progress):
+    iterating = False
+    with os.fdopen(fd, errors="replace") as log:
+        for line in log:
+            if "Iteration" in line:
+                iterating = True
+                continue
+            match = _LOG_LINE.match(line) if iterating else None
+            if match:
+                try:
+                    objective = float(match.group(2))
+                except ValueError:
+                    continue
+                progress(int(match.group(1)), objective)
+
+
+def _clean(values):
+    """Zero out solver round-off so reports do not show -0.00"""
+    return np.where(np.abs(values) < EPS, 0.0, values)
+
+
+def _result_from_linprog(res, b):
+    if not res.success:
+        return SimplexResult(False, res.message, status=res.status)
+
+    slack = res.ineqlin.residual
+    return SimplexResult(
+        success=True,
+        message=res.message,
+        x=res.x,
+        profit=-res.fun,
+        usage=np.asarray(b, dtype=float) - slack,
+        slack=slack,
+        duals=_clean(-res.ineqlin.marginals),
+        reduced_costs=_clean(res.lower.marginals),
+    )
+
+
+def solve_simplex(c, A, b, sensitivity=True, progress=None, stats=False):
+    """Solve the product-mix LP and optionally attach sensitivity figures
+
+    progress, if given, is called as progress(iteration, profit) from
+    the HiGHS simplex log, on a reader thread. The log is captured by
+    redirecting stdout (fd 1) during the solve, so pass progress from a
+    worker process (see jobs.SolveJob) rather than from a program whose
+    own console output matters meanwhile. stats=True (or an enclosing
+    stats.collect() block) attaches a SolveStats to the result.
+    """
+    with collect(stats) as collected:
+        with phase("lp.solve"):
+            res = _linprog(c, A, b, progress)
+        count("lp.iterations", int(res.nit))
+        result = _result_from_linprog(res, b)
+
+        if result.success and sensitivity:
+            result.sensitivity = simplex_sensitivity(A, b, c, result)
+    result.stats = collected
+    return result
+
+
+def simplex_sensitivity(A, b, c, result):
+    """Shadow prices, reduced costs, RHS and objective coefficient ranges
+
+    Shadow prices and reduced costs are the exact duals of the original
+    solve. The ranges come from the optimal basis: B is LU-factored once
+    and every RHS / cost range is a vectorized ratio test against the
+    columns of B^-1 and the rows of B^-1 [A | I], so no extra LP solves
+    are needed. Those are formed SENSITIVITY_BLOCK at a time, so a
+    sparse A is never densified and memory stays O(block * (m + n)).
+    """
+    with phase("lp.sensitivity"):
+        return _simplex_sensitivity(A, b, c, result)
+
+
+def _simplex_sensitivity(A, b, c, result):
+    A = as_model_matrix(A)
+    b = np.asarray(b, dtype=float)
+    c = np.asarray(c, dtype=float)
+    m, n = A.shape
+
+    with phase("lp.basis"):
+        basis = optimal_basis(A, result)
+        factor = BasisFactor(A, basis)
+    x_B = np.maximum(factor.solve(b), 0.0)
+
+    # RHS ranging: x_B + delta * B^-1 e_i must stay >= 0
+    dec, inc = np.empty(m), np.empty(m)
+    with phase("lp.rhs_ranging"):
+        for block in _blocks(m):
+            dec[block], inc[block] = _ratio_test(x_B[:, None], factor.solve(_unit(m, block)))
+            count("lp.ranging_blocks")
+    rhs_ranges = np.column_stack([b - dec, b + inc])
+
+    # Cost ranging (min form): d_N - delta * (B^-1 [A | I])[k] must stay >= 0
+    c_full = np.concatenate([c, np.zeros(m)])
+    y = factor.solve(c_full[basis], trans=True)
+    d_all = np.maximum(c_full - np.concatenate([A.T @ y, y]), 0.0)
+    d_all[basis] = 0.0
+
+    profit = -c
+    cost_ranges = np.column_stack([np.full(n, -np.inf), profit + d_all[:n]])
+
+    rows = np.flatnonzero(basis < n)
+    with phase("lp.cost_ranging"):
+        for block in _blocks(len(rows)):
+            rho = factor.solve(_unit(m, rows[block]), trans=True)
+            tableau = np.hstack([np.asarray(A.T @ rho).T, rho.T])
+            tableau[:, basis] = 0.0
+            up, down = _ratio_test(d_all[:, None], tableau.T)
+            cols = basis[rows[block]]
+            cost_ranges[cols, 0] = profit[cols] - up
+            cost_ranges[cols, 1] = profit[cols] + down
+            count("lp.ranging_blocks")
+
+    return SimplexSensitivity(
+        shadow_prices=result.duals,
+        binding=result.slack < TOL,
+        reduced_costs=result.reduced_costs,
+        rhs_ranges=rhs_ranges,
+        cost_ranges=cost_ranges,
+        basis=basis,
+    )
+
+
+def as_model_matrix(A):
+    """A as a float ndarray, or as a csc matrix if it is sparse (never densified)"""
+    if issparse(A):
+        return csc_matrix(A, dtype=float)
+    return np.asarray(A, dtype=float)
+
+
+def _blocks(size):
+    for start in range(0, size, SENSITIVITY_BLOCK):
+        yield slice(start, min(start + SENSITIVITY_BLOCK, size))
+
+
+def _unit(m, rows):
+    """Columns e_i of the m x m identity for i in rows"""
+    rows = np.arange(m)[rows]
+    E = np.zeros((m, len(rows)))
+    E[rows, np.arange(len(rows))] = 1.0
+    return E
+
+
+class BasisFactor:
+    """LU factors of the basis B = [A | I][:, basis]
+
+    Dense A is factored with LAPACK, sparse A with SuperLU, so B is never
+    densified. Raises np.linalg.LinAlgError if B is singular.
+    """
+
+    def __init__(self, A, basis):
+        m, n = A.shape
+        basis = np.asarray(basis)
+        structural = basis < n
+        self.sparse = issparse(A)
+        if self.sparse:
+            slack = csc_matrix((np.ones(m), (np.arange(m), np.arange(m))), shape=(m, m))
+            parts = sparse_hstack([A[:, basis[structural]], slack[:, basis[~structural] - n]])
+            order = np.argsort(np.concatenate([np.flatnonzero(structural),
+                                               np.flatnonzero(~structural)]))
+            try:
+                self._lu = splu(csc_matrix(parts)[:, order])
+            except RuntimeError as exc:  # "Factor is exactly singular"
+                raise np.linalg.LinAlgError("basis matrix is singular") from exc
+            diag = np.abs(self._lu.U.diagonal())
+        else:
+            B = np.zeros((m, m))
+            B[:, structural] = A[:, basis[structural]]
+            B[basis[~structural] - n, np.flatnonzero(~structural)] = 1.0
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", LinAlgWarning)
+                self._lu = lu_factor(B, check_finite=False)
+            diag = np.abs(np.diag(self._lu[0]))
+        if m and diag.min() <= EPS * max(1.0, diag.max()):
+            raise np.linalg.LinAlgError("basis matrix is singular")
+
+    def solve(self, rhs, trans=False):
+        """B^-1 rhs, or B^-T rhs with trans=True; rhs may hold several columns"""
+        if self.sparse:
+            return self._lu.solve(np.asarray(rhs, dtype=float), trans="T" if trans else "N")
+        return lu_solve(self._lu, rhs, trans=int(trans), check_finite=False)
+
+
+def _ratio_test(values, directions):
+    """Largest steps (down, up) keeping values + step * directions >= 0
+
+    values broadcasts against directions; the minimum is taken over
+    axis 0, one ratio test per column of directions.
+    """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratios = values / np.abs(directions)
+    down = np.where(directions > EPS, ratios, np.inf).min(axis=0)
+    up = np.where(directions < -EPS, ratios, np.inf).min(axis=0)
+    return down, up
+
+
+def optimal_basis(A, result):
+    """Indices of an optimal basis of [A | I] (slack j is column n + j)
+
+    Columns with positive value must be basic. In degenerate solutions the
+    basis is completed from zero-valued columns with zero reduced cost, so
+    the basis reproduces the HiGHS duals, falling back to any column only
+    if those run out. A sparse A goes through _sparse_basis instead.
+    """
+    A = as_model_matrix(A)
+    m, n = A.shape
+    values = np.concatenate([result.x, result.slack])
+    reduced = np.concatenate([result.reduced_costs, result.duals])
+
+    scale = max(1.0, np.abs(values).max())
+    positive = np.flatnonzero(values > EPS * scale)
+    zero_cost = np.flatnonzero((values <= EPS * scale) & (np.abs(reduced) <= EPS * scale))
+    if issparse(A):
+        return _sparse_basis(A, positive, zero_cost)
+    return _qr_basis(np.hstack([A, np.eye(m)]), positive, zero_cost)
+
+
+def _qr_basis(full, positive, zero_cost):
+    """Basis of full = [A | I] by pivoted QR
+
+    Positive columns first, then zero reduced cost ones, then any. A
+    sparse full is densified only a pool of columns at a time.
+    """
+    m = full.shape[0]
+    others = np.setdiff1d(np.arange(full.shape[1]), np.concatenate([positive, zero_cost]))
+    basis = _independent_columns(full, positive, m)
+    for pool in (zero_cost, others):
+        if len(basis) == m:
+            break
+        basis = np.concatenate([basis, _complete_columns(full, basis, pool, m - len(basis))])
+    return np.sort(basis)
+
+
+def _sparse_basis(A, positive, zero_cost):
+    """Basis for a sparse A without dense QR
+
+    Every row is matched to a positive or zero reduced cost column at
+    once (minimum weight bipartite matching on the sparsity pattern,
+    with the positive columns cheaper so that all of them get in), so
+    no slack with a nonzero dual is ever basic. Structural rank is not
+    numerical rank, so the result is checked by factoring it; if no
+    such matching exists or it is singular, _qr_basis picks the columns
+    instead.
+    """
+    m, n = A.shape
+    full = csc_matrix(sparse_hstack(
+        [A, csc_matrix((np.ones(m), (np.arange(m), np.arange(m))), shape=(m, m))]))
+    candidates = np.concatenate([positive, zero_cost])
+    weights = np.concatenate([np.ones(len(positive)), np.full(len(zero_cost), 2.0)])
+    pattern = csr_matrix(full[:, candidates] != 0, dtype=float) @ diags(weights)
+    try:
+        rows, cols = min_weight_full_bipartite_matching(pattern)
+    except ValueError:  # no full matching
+        rows = ()
+    if len(rows) == m:
+        basis = np.sort(candidates[cols])
+        try:
+            BasisFactor(A, basis)
+            return basis
+        except np.linalg.LinAlgError:
+            pass
+    count("lp.qr_basis_fallbacks")
+    return _qr_basis(full, positive, zero_cost)
+
+
+def _independent_columns(full, candidates, limit):
+    """Up to limit linearly independent columns from candidates"""
+    if len(candidates) == 0:
+        return np.array([], dtype=int)
+    _, R, piv = qr(_dense_columns(full, candidates), mode="economic", pivoting=True)
+    diag = np.abs(np.diag(R))
+    rank = int(np.sum(diag > EPS * max(1.0, diag.max())))
+    return candidates[piv[:min(rank, limit)]]
+
+
+def _complete_columns(full, basis, pool, count):
+    """Pick count columns from pool independent of the current basis columns"""
+    if count == 0 or len(pool) == 0:
+        return np.array([], dtype=int)
+    columns = _dense_columns(full, pool)
+    if len(basis):
+        Q, _ = qr(_dense_columns(full, basis), mode="economic")
+        columns = columns - Q @ (Q.T @ columns)
+    _, R, piv = qr(columns, mode="economic", pivoting=True)
+    diag = np.abs(np.diag(R))
+    rank = int(np.sum(diag > EPS * max(1.0, diag.max()))) if diag.size else 0
+    return pool[piv[:min(rank, count)]]
+
+
+def _dense_columns(full, cols):
+    return full[:, cols].toarray() if issparse(full) else full[:, cols]
@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+"""
+Opt-in instrumentation: time per solver phase and event counters.
+
+Solvers wrap their phases in `with phase("transport.uv"):` and count
+events with count("transport.pivots", n). Both only record while a
+collect() block is active; otherwise phase returns a shared no-op
+context and count returns at once, so instrumented code pays one list
+check per call. Phases are coarse (model build, solve, sensitivity,
+rendering) and hot loops count locally and report once, so enabling
+collection does not change the timings it measures.
+
+    with collect() as stats:
+        result = solve_transportation(cost, supply, demand)
+    stats.to_chrome_trace("trace.json")  # open in chrome://tracing or Perfetto
+
+The solve functions also take stats=True to attach the SolveStats of the
+call to their result. Collection is per process and not thread-safe:
+phases and counts from worker threads are not recorded.
+"""
+
+import json
+import os
+import time
+from contextlib import contextmanager, nullcontext
+from dataclasses import asdict, dataclass, field
+
+# Timeline events kept per SolveStats; phase totals keep counting past it
+MAX_EVENTS = 100_000
+
+
+@dataclass
+class SolveStats:
+    """Phase timings and counters of one solve or collect() block
+
+    phases[name] is the wall time in seconds spent in phase name (nested
+    phases also count toward the enclosing one) and calls[name] the
+    number of times it was entered. counters hold iteration counts,
+    loop-search lengths, re-solves and the like. events is the timeline,
+    (name, pid, start, duration) in seconds of time.perf_counter.
+    """
+    phases: dict = field(default_factory=dict)
+    calls: dict = field(default_factory=dict)
+    counters: dict = field(default_factory=dict)
+    events: list = field(default_factory=list)
+
+    def merge(self, other):
+        """Add the phases, counters and events of other to these"""
+        for name, seconds in other.phases.items():
+            self.phases[name] = self.phases.get(name, 0.0) + seconds
+        for name, calls in other.calls.items():
+            self.calls[name] = self.calls.get(name, 0) + calls
+        for name, value in other.counters.items():
+            self.counters[name] = self.counters.get(name, 0) + value
+        self.events.extend(other.events[:MAX_EVENTS - len(self.events)])
+
+    def to_dict(self):
+        """Phases, calls and counters as plain JSON-ready values (no timeline)"""
+        data = asdict(self)
+        del data["events"]
+        return data
+
+    def to_json(self, path=None):
+        """to_dict() as JSON text, also written to path if given"""
+        text = json.dumps(self.to_dict(), indent=1, default=float)
+        if path is not None:
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(text)
+        return text
+
+    def to_chrome_trace(self, path):
+        """Write the timeline in Chrome trace event format (chrome://tracing, Perfetto)"""
+        origin = min((start for _, _, start, _ in self.events), default=0.0)
+        events = [
+            {"name": name, "cat": name.split(".")[0], "ph": "X", "pid": pid, "tid": pid,
+             "ts": (start - origin) * 1e6, "dur": duration * 1e6}
+            for name, pid, start, duration in self.events
+        ]
+        events += [{"name": name, "ph": "C", "pid": os.getpid(), "ts": 0, "args": {"value": value}}
+                   for name, value in self.counters.items()]
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+    def summary(self):
+        """Phases by time spent, then counters, as text lines"""
+        lines = [f"{name:<32s} {seconds:>10.4f}s {self.calls[name]:>8d}x"
+                 for name, seconds in sorted(self.phases.items(), key=lambda kv: -kv[1])]
+        lines += [f"{name:<32s} {value:>12,}" for name, value in sorted(self.counters.items())]
+        return "\n".join(lines)
+
+
+# Active collectors, innermost last
+_active = []
+_NULL = nullcontext()
+
+
+class _Phase:
+    __slots__ = ("name", "start")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        duration = time.perf_counter() - self.start
+        if _active:
+            stats = _active[-1]
+            stats.phases[self.name] = stats.phases.get(self.name, 0.0) + duration
+            stats.calls[self.name] = stats.calls.get(self.name, 0) + 1
+            if len(stats.events) < MAX_EVENTS:
+                stats.events.append((self.name, os.getpid(), self.start, duration))
+        return False
+
+
+def phase(name):
+    """Context manager timing phase name while collection is on (a no-op otherwise)"""
+    return _Phase(name) if _active else _NULL
+
+
+def count(name, value=1):
+    """Add value to counter name while collection is on"""
+    if _active:
+        counters = _active[-1].counters
+        counters[name] = counters.get(name, 0) + value
+
+
+def collecting():
+    """True inside a collect() block"""
+    return bool(_active)
+
+
+@contextmanager
+def collect(enabled=True):
+    """Collect phases and counters of the block into a new SolveStats
+
+    Blocks nest: an inner block's figures are added to the enclosing one
+    when it ends. collect(False) yields a SolveStats only if an enclosing
+    block is active and None otherwise, which is how the solvers' stats
+    option stays free when it is off.
+    """
+    if not (enabled or _active):
+        yield None
+        return
+    stats = SolveStats()
+    _active.append(stats)
+    try:
+        yield stats
+    finally:
+        _active.pop()
+        if _active:
+            _active[-1].merge(stats)
@@ -0,0 +1,292 @@
+# -*- coding: utf-8 -*-
+"""
+Exact cost and supply / demand ranging for an optimal transportation
+plan, read off its spanning-tree basis without re-solving.
+
+Cost ranging. A non-basic cell can get cheaper by its reduced cost
+before it enters. Raising a basic cell's cost by delta shifts the
+potentials of the subtree S below that arc by +delta on nodes of the
+arc's child type and -delta on the others, so the only reduced costs
+that move are those of cells with exactly one end in S. S is a slice of
+the preorder thread, i.e. a range of row ranks and a range of column
+ranks; per-line prefix / suffix minima of the reduced costs, ordered by
+those ranks, give the smallest reduced cost leaving S from each line in
+O(1). One basic cell costs O(|S|).
+
+Supply / demand ranging. Moving delta units of net supply from one node
+to another changes flow only along the tree path between them, +delta
+on arcs crossed row -> column and -delta on the others. Minima of the
+flows of row-owned and column-owned arcs over 2^l steps up the tree
+(binary lifting) answer any batch of such path queries in
+O(log(rows + cols)) each, vectorized.
+"""
+
+import numpy as np
+
+from .stats import phase
+from .transportation import TransportationSimplex, _as_cost, _balanced_cost, _LaneCost
+
+
+class TransportationRanging:
+    """Ranging queries against one optimal transportation basis
+
+    Build it with from_result. Real factories are rows 0..m-1 and real
+    warehouses columns 0..n-1; an unbalanced problem also has the dummy
+    row m (unmet demand) or column n (unshipped supply) in its basis.
+    """
+
+    def __init__(self, model, tree, shape):
+        self.model = model
+        self.tree = tree
+        self.shape = shape
+        self.M, self.N = model.shape
+        with phase("transport.ranging"):
+            self._prepare_tree()
+            self._prepare_reduced()
+            self._prepare_lifting()
+
+    @classmethod
+    def from_result(cls, cost, supply, demand, result, shortage_penalty=0.0,
+                    overflow_penalty=0.0):
+        """Ranging for a TransportationResult of solve_transportation
+
+        cost, supply, demand and the penalties must be those it was
+        solved with.
+        """
+        cost = _as_cost(cost)
+        supply = np.asarray(supply, dtype=float)
+        demand = np.asarray(demand, dtype=float)
+        model, supply_b, demand_b = _balanced_cost(cost, supply, demand,
+                                                   shortage_penalty, overflow_penalty)
+        tree = TransportationSimplex.from_basis(model, result.basis, supply_b, demand_b)
+        tree.potentials()
+        return cls(model, tree, cost.shape)
+
+    # -----------------------------------------------------------------
+    # Setup
+    # -----------------------------------------------------------------
+    def _prepare_tree(self):
+        tree = self.tree
+        order, parent = tree.order, tree.parent
+        size = np.ones(self.M + self.N, dtype=np.intp)
+        for k, p in zip(order[:0:-1].tolist(), parent[order[:0:-1]].tolist()):
+            size[p] += size[k]
+        self._end = tree.pos + size
+        is_row = order < self.M
+        # number of row / column nodes before each preorder position
+        self._rows_before = np.concatenate([[0], np.cumsum(is_row)])
+        self._cols_before = np.concatenate([[0], np.cumsum(~is_row)])
+        self._row_rank = self._rows_before[tree.pos[:self.M]]
+        self._col_rank = self._cols_before[tree.pos[self.M:]]
+
+    def _prepare_reduced(self):
+        """Every admissible cell of the model with its reduced cost (basic: inf)"""
+        M, N = self.M, self.N
+        u, v = self.tree.pi[:M], self.tree.pi[M:]
+        if isinstance(self.model, _LaneCost):
+            rows, cols, costs = self.model.lanes(0, len(self.model))
+            rows, cols = rows.astype(np.intp), cols.astype(np.intp)
+        else:
+            rows, cols = np.divmod(np.arange(M * N), N)
+            costs = self.model[np.arange(M)].ravel()
+        reduced = np.maximum(costs - u[rows] - v[cols], 0.0)
+
+        nodes = np.flatnonzero(self.tree.parent >= 0)
+        self._owner = {self.tree._cell(k): int(k) for k in nodes}
+        cells = np.array(list(self._owner), dtype=np.int64).reshape(-1, 2)
+        basic_keys = cells[:, 0] * N + cells[:, 1]
+        keys = rows.astype(np.int64) * N + cols  # row-major, so sorted
+        masked = reduced.copy()
+        if len(keys):
+            at = np.minimum(np.searchsorted(keys, basic_keys), len(keys) - 1)
+            masked[at[keys[at] == basic_keys]] = np.inf
+
+        self._lanes = (rows, cols, costs, reduced, keys)
+        self._basic = np.isinf(masked)
+        self._by_row = _LineMinima(rows, self._col_rank[cols], masked, M, N)
+        self._by_col = _LineMinima(cols, self._row_rank[rows], masked, N, M)
+
+    def _prepare_lifting(self):
+        tree = self.tree
+        size = self.M + self.N
+        up = np.where(tree.parent >= 0, tree.parent, np.arange(size))
+        flows = np.where(tree.parent >= 0, tree.flow, np.inf)
+        is_row = np.arange(size) < self.M
+        self._up = [up]
+        self._min_row = [np.where(is_row, flows, np.inf)]
+        self._min_col = [np.where(is_row, np.inf, flows)]
+        for _ in range(max(1, int(tree.depth.max()).bit_length()) - 1):
+            prev = self._up[-1]
+            self._min_row.append(np.minimum(self._min_row[-1], self._min_row[-1][prev]))
+            self._min_col.append(np.minimum(self._min_col[-1], self._min_col[-1][prev]))
+            self._up.append(prev[prev])
+
+    # -----------------------------------------------------------------
+    # Cost ranging
+    # -----------------------------------------------------------------
+    def cost_ranges(self, rows=None, cols=None):
+        """(rows, cols, ranges) with ranges[k] the (min, max) cost of cell k
+
+        The optimal basis stays optimal while one cell's cost stays in its
+        range. Defaults to every real cell (every admissible lane of a
+        sparse cost). Non-basic cells are one vectorized step; each basic
+        cell costs O(size of the subtree cut off by its arc).
+        """
+        lane_rows, lane_cols, costs, reduced, keys = self._lanes
+        m, n = self.shape
+        if rows is None:
+            real = (lane_rows < m) & (lane_cols < n)
+            at = np.flatnonzero(real)
+        else:
+            rows = np.asarray(rows, dtype=np.intp)
+            cols = np.asarray(cols, dtype=np.intp)
+            wanted = rows.astype(np.int64) * self.N + cols
+            at = np.minimum(np.searchsorted(keys, wanted), len(keys) - 1)
+            if not (keys[at] == wanted).all():
+                raise ValueError("cost ranging needs admissible cells (lanes of the cost)")
+        ranges = np.column_stack([costs[at] - reduced[at], np.full(len(at), np.inf)])
+
+        for k in np.flatnonzero(self._basic[at]).tolist():
+            lane = at[k]
+            dec, inc = self._basic_slack(self._owner[int(lane_rows[lane]), int(lane_cols[lane])])
+            ranges[k] = costs[lane] - dec, costs[lane] + inc
+        return lane_rows[at], lane_cols[at], ranges
+
+    def _basic_slack(self, k):
+        """(decrease, increase) the cost of the arc owned by node k can take"""
+        tree = self.tree
+        lo, hi = tree.pos[k], self._end[k]
+        subtree = tree.order[lo:hi]
+        rows_in = subtree[subtree < self.M]
+        cols_in = subtree[subtree >= self.M] - self.M
+        leave_by_row = self._by_row.outside(rows_in, self._cols_before[lo], self._cols_before[hi])
+        leave_by_col = self._by_col.outside(cols_in, self._rows_before[lo], self._rows_before[hi])
+        # A row child shifts the rows of S up: row-side exits limit an increase
+        if k < self.M:
+            return leave_by_col, leave_by_row
+        return leave_by_row, leave_by_col
+
+    # -----------------------------------------------------------------
+    # Supply / demand ranging
+    # -----------------------------------------------------------------
+    def shift_ranges(self, sources, sinks):
+        """(down, up) for moving delta units of net supply from sources[k] to sinks[k]
+
+        Nodes are rows 0..M-1 and columns M..M+N-1 of the balanced model
+        (the dummy line included). delta may range over [-down, up] before
+        some basic flow goes negative and the basis changes.
+        """
+        a = np.array(sources, dtype=np.intp, ndmin=1)
+        b = np.array(sinks, dtype=np.intp, ndmin=1)
+        inf = np.full(len(a), np.inf)
+        a_row, a_col, b_row, b_col = inf.copy(), inf.copy(), inf.copy(), inf.copy()
+        depth = self.tree.depth
+
+        a = self._climb(a, np.maximum(depth[a] - depth[b], 0), a_row, a_col)
+        b = self._climb(b, np.maximum(depth[b] - depth[a], 0), b_row, b_col)
+        for level in range(len(self._up) - 1, -1, -1):
+            up = self._up[level]
+            apart = up[a] != up[b]
+            self._step(a, apart, level, a_row, a_col)
+            self._step(b, apart, level, b_row, b_col)
+        apart = a != b
+        self._step(a, apart, 0, a_row, a_col)
+        self._step(b, apart, 0, b_row, b_col)
+
+        # Up from the source a row-owned arc is crossed row -> column (+delta)
+        down = np.minimum(a_row, b_col)
+        up = np.minimum(a_col, b_row)
+        return down, up
+
+    def _step(self, x, mask, level, acc_row, acc_col):
+        nodes = x[mask]
+        acc_row[mask] = np.minimum(acc_row[mask], self._min_row[level][nodes])
+        acc_col[mask] = np.minimum(acc_col[mask], self._min_col[level][nodes])
+        x[mask] = self._up[level][nodes]
+
+    def _climb(self, x, steps, acc_row, acc_col):
+        x = x.copy()
+        for level in range(len(self._up)):
+            self._step(x, (steps >> level) & 1 == 1, level, acc_row, acc_col)
+        return x
+
+    def _partner(self, partner, default):
+        if partner is not None:
+            return partner
+        m, n = self.shape
+        if self.N > n:
+            return self.M + n  # dummy column: unshipped supply
+        if self.M > m:
+            return m  # dummy row: unmet demand
+        return default
+
+    def supply_ranges(self, supply, partner=None):
+        """(min, max) supply of each factory keeping the basis optimal
+
+        The difference is matched at the partner node: by default the
+        dummy line (unshipped supply or unmet demand), or in a balanced
+        problem the last warehouse, whose demand moves with it. Within
+        the range the total cost changes at u[i] + v[partner] per unit.
+        """
+        m, n = self.shape
+        partner = self._partner(partner, self.M + n - 1)
+        down, up = self.shift_ranges(np.arange(m), np.full(m, partner))
+        supply = np.asarray(supply, dtype=float)
+        return np.column_stack([supply - down, supply + up])
+
+    def demand_ranges(self, demand, partner=None):
+        """(min, max) demand of each warehouse keeping the basis optimal
+
+        As supply_ranges; in a balanced problem the last factory's supply
+        moves with it by default.
+        """
+        m, n = self.shape
+        partner = self._partner(partner, m - 1)
+        down, up = self.shift_ranges(np.full(n, partner), self.M + np.arange(n))
+        demand = np.asarray(demand, dtype=float)
+        return np.column_stack([demand - down, demand + up])
+
+
+class _LineMinima:
+    """Values grouped by line and sorted by rank, with per-line prefix / suffix minima
+
+    outside(lines, lo, hi) is, per line, the smallest value whose rank is
+    < lo or >= hi: O(log) each, vectorized.
+    """
+
+    def __init__(self, lines, ranks, values, n_lines, n_ranks):
+        self.n_ranks = n_ranks
+        keys = lines.astype(np.int64) * n_ranks + ranks
+        if len(keys) == n_lines * n_ranks:
+            # every (line, rank) present (a dense cost): scatter instead of sorting
+            grid = np.empty(len(keys))
+            grid[keys] = values
+            grid = grid.reshape(n_lines, n_ranks)
+            self.keys = np.arange(len(keys), dtype=np.int64)
+            self.indptr = np.arange(0, len(keys) + 1, max(n_ranks, 1))
+            self.prefix = np.minimum.accumulate(grid, axis=1).ravel()
+            self.suffix = np.minimum.accumulate(grid[:, ::-1], axis=1)[:, ::-1].ravel()
+            return
+
+        order = np.argsort(keys, kind="stable")
+        self.keys = keys[order]
+        values = values[order]
+        self.indptr = np.concatenate([[0], np.cumsum(np.bincount(lines, minlength=n_lines))])
+        self.prefix = np.empty(len(values))
+        self.suffix = np.empty(len(values))
+        for start, stop in zip(self.indptr[:-1].tolist(), self.indptr[1:].tolist()):
+            if stop > start:
+                segment = values[start:stop]
+                self.prefix[start:stop] = np.minimum.accumulate(segment)
+                self.suffix[start:stop] = np.minimum.accumulate(segment[::-1])[::-1]
+
+    def outside(self, lines, lo, hi):
+        if len(lines) == 0 or len(self.keys) == 0:
+            return np.inf
+        base = lines.astype(np.int64) * self.n_ranks
+        a = np.searchsorted(self.keys, base + lo)
+        b = np.searchsorted(self.keys, base + hi)
+        start, stop = self.indptr[lines], self.indptr[lines + 1]
+        before = np.where(a > start, self.prefix[np.maximum(a - 1, 0)], np.inf)
+        after = np.where(b < stop, self.suffix[np.minimum(b, len(self.keys) - 1)], np.inf)
+        return float(np.minimum(before, after).min())
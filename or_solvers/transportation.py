@@ -0,0 +1,1051 @@
+# -*- coding: utf-8 -*-
+"""
+Transportation problem solver: Vogel's Approximation Method for the
+initial plan, UV/MODI for optimization, plus sensitivity analysis.
+
+Supply and demand need not balance: the gap goes to an implicit dummy
+column (unshipped supply) or dummy row (unmet demand) priced at the
+overflow / shortage penalties, without copying the cost matrix.
+
+The cost may also be a scipy.sparse matrix whose stored entries are the
+only admissible lanes (forbidden routes are simply absent); memory and
+per-pivot work then scale with the number of lanes, and plans come
+back as sparse matrices.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+from scipy.sparse import coo_matrix, csr_matrix, issparse
+from scipy.sparse.csgraph import connected_components
+
+from .stats import SolveStats, collect, count, phase
+
+# Relative size below which a remaining supply/demand or flow counts as zero
+ZERO = 1e-9
+
+
+@dataclass
+class TransportationSensitivity:
+    """Dual variables, reduced costs and utilization of an optimal plan
+
+    u and v are the final potentials of the basis (reduced_costs = cost -
+    u[:, None] - v[None, :], zero on basic cells). For a sparse cost,
+    reduced_costs is a csr matrix over the admissible lanes. routes
+    holds (row, col, cost, reduced cost) for the non-basic cells with
+    the smallest reduced cost, sorted by it.
+    """
+    u: np.ndarray
+    v: np.ndarray
+    routes: list
+    shipped: np.ndarray
+    received: np.ndarray
+    reduced_costs: np.ndarray = None
+
+
+@dataclass
+class TransportationResult:
+    """Initial (VAM) and optimized (UV) plans with their total costs
+
+    basis lists the basic cells of the optimal plan, including degenerate
+    cells that carry zero flow; in an unbalanced problem it also holds
+    cells of the dummy row (index m) or column (index n). unmet_demand and
+    unshipped_supply are the amounts routed to the dummy, and the total
+    costs include their penalties. The allocations are csr matrices when
+    the cost was sparse. u and v are the final potentials of every row
+    and column of the basis, the dummy line included. warm_start is True
+    when the solve started from the basis passed in rather than from VAM.
+    stats holds the phase timings and counters when the solve collected
+    them.
+    """
+    initial_allocation: np.ndarray
+    initial_cost: float
+    allocation: np.ndarray
+    total_cost: float
+    iterations: int
+    basis: list = None
+    sensitivity: TransportationSensitivity = None
+    unmet_demand: np.ndarray = None
+    unshipped_supply: np.ndarray = None
+    u: np.ndarray = None
+    v: np.ndarray = None
+    warm_start: bool = False
+    stats: SolveStats = None
+
+
+def solve_transportation(cost, supply, demand, sensitivity=True,
+                         shortage_penalty=0.0, overflow_penalty=0.0, progress=None, basis=None,
+                         stats=False):
+    """VAM start followed by UV/MODI optimization
+
+    If total supply and demand differ, the shortfall is left unmet at
+    shortage_penalty per unit (scalar or one per warehouse) or the excess
+    left unshipped at overflow_penalty per unit (scalar or one per
+    factory).
+
+    A sparse cost (e.g. csr_matrix((costs, (rows, cols)), shape)) allows
+    only its stored lanes. Raises ValueError if no plan over those lanes
+    meets the supply and demand.
+
+    progress, if given, is called as progress(iteration, cost) while
+    UV/MODI pivots (see TransportationSimplex.solve). basis, e.g. the
+    basis of an earlier result with other costs, is used as the start
+    instead of VAM if it is a feasible basis for this supply and demand;
+    the initial plan and cost are then those of that basis. stats=True
+    (or an enclosing stats.collect() block) attaches a SolveStats to the
+    result.
+    """
+    with collect(stats) as collected:
+        with phase("transport.build"):
+            cost = _as_cost(cost)
+            supply = np.asarray(supply, dtype=float)
+            demand = np.asarray(demand, dtype=float)
+            model, supply_b, demand_b = _balanced_cost(cost, supply, demand,
+                                                       shortage_penalty, overflow_penalty)
+            tree = None
+            warm_start = False
+            if basis is not None:
+                try:
+                    tree = TransportationSimplex.from_basis(model, basis, supply_b, demand_b)
+                    warm_start = True
+                    count("transport.warm_starts")
+                except (ValueError, IndexError):
+                    tree = None  # not a basis of this problem: start from VAM
+        if tree is None:
+            with phase("transport.vam"):
+                _, _, start = vogels_approximation_method(cost, supply, demand, return_basis=True)
+                tree = TransportationSimplex.from_basis(model, start, supply_b, demand_b)
+        allocation, _, _, vam_cost = _split_plan(model, cost.shape, *tree.basis())
+
+        with phase("transport.uv"):
+            iterations = tree.solve(progress=progress)
+        basis, flows = _feasible_basis(model, tree)
+        optimal_allocation, unmet, unshipped, optimal_cost = _split_plan(model, cost.shape,
+                                                                         basis, flows)
+        u, v = tree.potentials()
+        result = TransportationResult(allocation, vam_cost, optimal_allocation, optimal_cost,
+                                      iterations, basis, unmet_demand=unmet,
+                                      unshipped_supply=unshipped, u=u, v=v,
+                                      warm_start=warm_start)
+
+        if sensitivity:
+            result.sensitivity = transportation_sensitivity(model, optimal_allocation, basis, u, v)
+    result.stats = collected
+    return result
+
+
+def transportation_sensitivity(cost, allocation, basis, u=None, v=None, top=10):
+    """Dual variables (u, v), non-basic reduced costs and utilization
+
+    cost may be the balanced cost model of an unbalanced or sparse
+    problem; only the real factories and warehouses (the shape of
+    allocation) and their admissible lanes are reported. u and v are the
+    potentials of basis (e.g. TransportationResult.u / v); without them
+    they are computed by one pass over the basis tree. All reduced costs
+    come from one broadcast and the top cheapest non-basic routes are
+    picked with argpartition.
+    """
+    with phase("transport.sensitivity"):
+        return _transportation_sensitivity(cost, allocation, basis, u, v, top)
+
+
+def _transportation_sensitivity(cost, allocation, basis, u, v, top):
+    cost = _as_model(cost)
+    if u is None or v is None:
+        tree = TransportationSimplex.from_cells(cost, basis, np.zeros(len(basis)))
+        u, v = tree.potentials()
+    rows, cols = allocation.shape
+    u, v = np.asarray(u)[:rows], np.asarray(v)[:cols]
+    basic = np.array(list(basis), dtype=np.int64).reshape(-1, 2)
+    basic = basic[(basic[:, 0] < rows) & (basic[:, 1] < cols)]
+    basic_keys = basic[:, 0] * cols + basic[:, 1]
+
+    if isinstance(cost, _LaneCost):
+        lane_rows, lane_cols, costs = cost.lanes(0, len(cost))
+        real = (lane_rows < rows) & (lane_cols < cols)
+        lane_rows, lane_cols, costs = lane_rows[real], lane_cols[real], costs[real]
+        lane_reduced = _clean(costs - u[lane_rows] - v[lane_cols])
+        reduced = csr_matrix((lane_reduced, (lane_rows, lane_cols)), shape=(rows, cols))
+        keys = lane_rows.astype(np.int64) * cols + lane_cols  # row-major, so sorted
+    else:
+        dense = cost.base[:rows, :cols]
+        reduced = _clean(dense - u[:, None] - v[None, :])
+        costs, lane_reduced = dense.ravel(), reduced.ravel()
+        keys = None
+
+    masked = lane_reduced.copy()
+    if keys is None:
+        masked[basic_keys] = np.inf
+    elif len(keys):
+        at = np.minimum(np.searchsorted(keys, basic_keys), len(keys) - 1)
+        masked[at[keys[at] == basic_keys]] = np.inf
+    picks = np.arange(len(masked))
+    if len(masked) > top:
+        picks = np.argpartition(masked, top - 1)[:top]
+    picks = picks[np.isfinite(masked[picks])]
+    picks = picks[np.argsort(masked[picks], kind="stable")]
+    if keys is None:
+        pick_rows, pick_cols = np.divmod(picks, cols)
+    else:
+        pick_rows, pick_cols = lane_rows[picks], lane_cols[picks]
+    routes = [(int(i), int(j), float(c), float(r)) for i, j, c, r in
+              zip(pick_rows, pick_cols, costs[picks], lane_reduced[picks])]
+
+    shipped, received = _line_sums(allocation)
+    return TransportationSensitivity(u, v, routes, shipped, received, reduced)
+
+
+def _clean(values):
+    """Zero out round-off so a basic or tied cell does not show -0.00"""
+    scale = max(1.0, float(np.abs(values).max())) if np.size(values) else 1.0
+    return np.where(np.abs(values) <= ZERO * scale, 0.0, values)
+
+
+def vogels_approximation_method(cost, supply, demand, return_basis=False):
+    """VAM for initial basic feasible solution
+
+    Every row and column is sorted by cost once. Each line keeps pointers
+    to its cheapest and second-cheapest live cells, so its penalty is only
+    refreshed when one of those two is crossed out; the pointers only
+    move forward, so all refreshes together cost O(cells). The penalty
+    choice is an argmax over the live lines. With a sparse cost only the
+    stored lanes are considered and the allocation is a csr matrix.
+
+    Each allocation crosses out exactly one line (both only on the last
+    cell), so a balanced problem always yields rows + cols - 1 basic
+    cells, some of them with zero flow when the plan is degenerate. With
+    return_basis the list of those cells is returned as well.
+
+    In an unbalanced problem the implicit dummy line is filled last. The
+    lines still live at the end (left over once the other side runs out,
+    or with no live lane) are joined to each other and to the dummy
+    column (index cols) or row (index rows) by a northwest-corner pass;
+    those cells appear in the returned basis only, and cells between
+    real lines there are artificial (not lanes of a sparse cost). Only
+    real allocations appear in the returned allocation and cost.
+    """
+    cost = _as_cost(cost)
+    rows, cols = cost.shape
+    supply = np.array(supply, dtype=float)
+    demand = np.array(demand, dtype=float)
+    gap = supply.sum() - demand.sum()
+    tol = ZERO * max(1.0, supply.sum(), demand.sum())
+    basis = []
+    flows = []
+
+    row_live = np.ones(rows, dtype=bool)
+    col_live = np.ones(cols, dtype=bool)
+    row_lines = _SortedLines(*_line_order(cost), row_live, col_live)
+    col_lines = _SortedLines(*_line_order(cost.T), col_live, row_live)
+
+    while True:
+        i, row_penalty = row_lines.max_penalty()
+        j, col_penalty = col_lines.max_penalty()
+        if i < 0 and j < 0:
+            break
+
+        # Same tie-break as sorting (penalty, index, 'row'/'col') tuples
+        if j < 0 or (i >= 0 and (row_penalty, i) >= (col_penalty, j)):
+            j = row_lines.cheapest(i)
+        else:
+            i = col_lines.cheapest(j)
+
+        # Allocate
+        allocated = min(supply[i], demand[j])
+        supply[i] -= allocated
+        demand[j] -= allocated
+        basis.append((i, j))
+        flows.append(allocated)
+
+        row_done = supply[i] <= tol
+        col_done = demand[j] <= tol
+        if row_done and col_done:
+            # Degenerate step: keep one line live at zero so that it still
+            # gets a (zero-flow) basic cell later
+            if np.count_nonzero(row_live) > 1:
+                col_done, demand[j] = False, 0.0
+            elif np.count_nonzero(col_live) > 1:
+                row_done, supply[i] = False, 0.0
+
+        if row_done:
+            row_live[i] = False
+            row_lines.penalty[i] = -np.inf
+            col_lines.cross_out(i)
+        if col_done:
+            col_live[j] = False
+            col_lines.penalty[j] = -np.inf
+            row_lines.cross_out(j)
+
+    # Join the lines still live, with the dummy line last
+    left_rows, left_cols = np.flatnonzero(row_live), np.flatnonzero(col_live)
+    left_supply, left_demand = supply[left_rows], demand[left_cols]
+    excess = max(left_supply.sum() - left_demand.sum(), 0.0)
+    if gap > tol:
+        left_cols = np.append(left_cols, cols)
+        left_demand = np.append(left_demand, excess)
+    elif gap < -tol:
+        left_rows = np.append(left_rows, rows)
+        left_supply = np.append(left_supply, left_demand.sum() - left_supply.sum())
+    if len(left_rows) and len(left_cols):
+        basis += _northwest_corner(left_rows, left_supply, left_cols, left_demand, tol)
+
+    real_rows, real_cols = np.array(basis[:len(flows)], dtype=np.intp).reshape(-1, 2).T
+    flows = np.array(flows)
+    if issparse(cost):
+        allocation = csr_matrix((flows, (real_rows, real_cols)), shape=cost.shape)
+        allocation.eliminate_zeros()
+        total_cost = float(flows @ cost[real_rows, real_cols].A1) if len(flows) else 0.0
+    else:
+        allocation = np.zeros((rows, cols))
+        allocation[real_rows, real_cols] = flows
+        total_cost = np.sum(allocation * cost)
+    if return_basis:
+        return allocation, total_cost, basis
+    return allocation, total_cost
+
+
+def _line_order(cost):
+    """(ptr, other, value): each line's cells by increasing cost, ties by index"""
+    if issparse(cost):
+        cost = csr_matrix(cost)
+        cost.sort_indices()
+        lines = np.repeat(np.arange(cost.shape[0]), np.diff(cost.indptr))
+        perm = np.lexsort((cost.data, lines))
+        return cost.indptr, cost.indices[perm], cost.data[perm]
+    order = np.argsort(cost, axis=1, kind="stable")
+    ptr = np.arange(cost.shape[0] + 1) * cost.shape[1]
+    return ptr, order.ravel(), np.take_along_axis(cost, order, axis=1).ravel()
+
+
+def _northwest_corner(rows, supply, cols, demand, tol):
+    """Staircase of len(rows) + len(cols) - 1 cells covering the given lines"""
+    supply, demand = supply.copy(), demand.copy()
+    a = b = 0
+    cells = [(rows[0], cols[0])]
+    while a < len(rows) - 1 or b < len(cols) - 1:
+        amount = min(supply[a], demand[b])
+        supply[a] -= amount
+        demand[b] -= amount
+        if b == len(cols) - 1 or (a < len(rows) - 1 and supply[a] <= tol):
+            a += 1
+        else:
+            b += 1
+        cells.append((rows[a], cols[b]))
+    return [(int(i), int(j)) for i, j in cells]
+
+
+class _SortedLines:
+    """
+    VAM bookkeeping for one orientation (rows or columns) of the cost
+    matrix: line k's cells are other[ptr[k]:ptr[k + 1]] with costs
+    value[...], by increasing cost; first and second point at its two
+    cheapest cells still live in other_live. watchers[o] lists the lines
+    whose first or second cell was o when last refreshed.
+    """
+
+    # Cells checked at once when skipping crossed-out cells
+    CHUNK = 16
+
+    def __init__(self, ptr, other, value, live, other_live):
+        self.ptr = ptr
+        self.other = other
+        self.value = value
+        self.live = live
+        self.other_live = other_live
+        self.first = ptr[:-1].copy()
+        self.second = ptr[:-1] + 1
+        self.penalty = np.full(len(live), -np.inf)
+        self.watchers = [[] for _ in range(len(other_live))]
+        for k in np.flatnonzero(live):
+            self._refresh(k)
+
+    def _next_live(self, k, pos):
+        end = self.ptr[k + 1]
+        while pos < end:
+            stop = min(end, pos + self.CHUNK)
+            live = self.other_live[self.other[pos:stop]]
+            if live.any():
+                return pos + int(np.argmax(live))
+            pos = stop
+        return end
+
+    def _refresh(self, k):
+        end = self.ptr[k + 1]
+        first = self._next_live(k, self.first[k])
+        second = self._next_live(k, max(self.second[k], first + 1))
+        self.first[k], self.second[k] = first, second
+
+        if first >= end:
+            self.penalty[k] = -np.inf
+            return
+        self.watchers[self.other[first]].append(k)
+        if second >= end:
+            self.penalty[k] = self.value[first]
+        else:
+            self.watchers[self.other[second]].append(k)
+            self.penalty[k] = self.value[second] - self.value[first]
+
+    def cheapest(self, k):
+        return self.other[self.first[k]]
+
+    def max_penalty(self):
+        """Live line with the largest penalty (ties → largest index), or -1"""
+        best = len(self.penalty) - 1 - int(np.argmax(self.penalty[::-1]))
+        if self.penalty[best] == -np.inf:
+            return -1, -np.inf
+        return best, self.penalty[best]
+
+    def cross_out(self, other):
+        """Refresh the live lines whose two cheapest cells included other"""
+        watchers, self.watchers[other] = self.watchers[other], []
+        for k in set(watchers):
+            end = self.ptr[k + 1]
+            first, second = self.first[k], self.second[k]
+            if self.live[k] and ((first < end and self.other[first] == other)
+                                 or (second < end and self.other[second] == other)):
+                self._refresh(k)
+
+
+def uv_method(cost, allocation, supply, demand, max_iterations=None, basis=None,
+              shortage_penalty=0.0, overflow_penalty=0.0, progress=None):
+    """UV/MODI method for optimization
+
+    Runs the spanning-tree transportation simplex from the given plan.
+    basis lists the starting basic cells (e.g. from VAM with
+    return_basis); without it the positive cells are used, plus dummy
+    cells for any leftover supply or demand, completed with zero-flow
+    cells if the plan is degenerate. Returns the optimal plan, its cost
+    (including shortage / overflow penalties) and the number of pivots.
+    progress is passed on to TransportationSimplex.solve.
+    """
+    cost = _as_cost(cost)
+    supply = np.asarray(supply, dtype=float)
+    demand = np.asarray(demand, dtype=float)
+    model, supply_b, demand_b = _balanced_cost(cost, supply, demand,
+                                               shortage_penalty, overflow_penalty)
+    if basis is None:
+        basis = _plan_cells(allocation, supply, demand, model.shape)
+    tree = TransportationSimplex.from_basis(model, basis, supply_b, demand_b)
+    iterations = tree.solve(max_iterations, progress=progress)
+    allocation, _, _, total_cost = _split_plan(model, cost.shape, *_feasible_basis(model, tree))
+    return allocation, total_cost, iterations
+
+
+class _PaddedCost:
+    """
+    Dense cost matrix with an optional implicit balancing line appended,
+    without copying it: a dummy row (per-column costs, unmet demand) or a
+    dummy column (per-row costs, unshipped supply). Supports the indexing
+    the simplex uses: cost[i, j], cost[i] and cost[rows].
+    """
+
+    def __init__(self, cost, row=None, col=None):
+        self.base = cost
+        self.row = row
+        self.col = col
+        m, n = cost.shape
+        self.shape = (m + (row is not None), n + (col is not None))
+
+    def __getitem__(self, key):
+        m, n = self.base.shape
+        if isinstance(key, tuple):
+            i, j = key
+            if i == m:
+                return self.row[j]
+            if j == n:
+                return self.col[i]
+            return self.base[i, j]
+
+        rows = np.asarray(key)
+        if rows.ndim == 0:
+            return self[rows[None]][0]
+        if self.col is not None:
+            return np.hstack([self.base[rows], self.col[rows, None]])
+        if self.row is None:
+            return self.base[rows]
+        block = np.empty((len(rows), n))
+        real = rows < m
+        block[real] = self.base[rows[real]]
+        block[~real] = self.row
+        return block
+
+    def cell_costs(self, rows, cols):
+        m, n = self.base.shape
+        costs = np.empty(len(rows))
+        real = (rows < m) & (cols < n)
+        costs[real] = self.base[rows[real], cols[real]]
+        if self.row is not None:
+            costs[rows == m] = self.row[cols[rows == m]]
+        if self.col is not None:
+            costs[cols == n] = self.col[rows[cols == n]]
+        return costs
+
+    def admissible(self, rows, cols):
+        return np.ones(len(rows), dtype=bool)
+
+
+class _LaneCost:
+    """
+    Admissible lanes of a sparse problem, plus the implicit dummy line if
+    unbalanced, stored row-major like a csr matrix: the lanes of row i are
+    rows/cols/costs[indptr[i]:indptr[i + 1]], sorted by column. Any other
+    cell costs big_m: it can only be an artificial basic cell, which
+    pricing never brings back once it leaves.
+    """
+
+    def __init__(self, cost, row=None, col=None):
+        m, n = cost.shape
+        self.shape = (m + (row is not None), n + (col is not None))
+        index = np.int32 if max(self.shape) < np.iinfo(np.int32).max else np.int64
+        rows = np.repeat(np.arange(m, dtype=index), np.diff(cost.indptr))
+        cols = cost.indices.astype(index)
+        costs = cost.data
+        if col is not None:
+            at = cost.indptr[1:]
+            rows = np.insert(rows, at, np.arange(m, dtype=index))
+            cols = np.insert(cols, at, n)
+            costs = np.insert(costs, at, col)
+        if row is not None:
+            rows = np.concatenate([rows, np.full(n, m, dtype=index)])
+            cols = np.concatenate([cols, np.arange(n, dtype=index)])
+            costs = np.concatenate([costs, row])
+        self.rows, self.cols = rows, cols
+        self.costs = np.asarray(costs, dtype=float)
+        self.indptr = np.concatenate([[0], np.cumsum(np.bincount(rows, minlength=self.shape[0]))])
+        largest = np.abs(self.costs).max() if len(self.costs) else 0.0
+        self.big_m = sum(self.shape) * (1.0 + largest)
+
+    def __len__(self):
+        return len(self.costs)
+
+    def _find(self, i, j):
+        lo, hi = self.indptr[i], self.indptr[i + 1]
+        at = lo + int(np.searchsorted(self.cols[lo:hi], j))
+        return at if at < hi and self.cols[at] == j else -1
+
+    def __getitem__(self, key):
+        at = self._find(*key)
+        return self.costs[at] if at >= 0 else self.big_m
+
+    def cell_costs(self, rows, cols):
+        return np.array([self[i, j] for i, j in zip(rows, cols)], dtype=float)
+
+    def admissible(self, rows, cols):
+        return np.array([self._find(i, j) >= 0 for i, j in zip(rows, cols)], dtype=bool)
+
+    def lanes(self, start, stop):
+        """Rows, columns and costs of lanes start..stop-1 in row-major order"""
+        return self.rows[start:stop], self.cols[start:stop], self.costs[start:stop]
+
+
+def _as_cost(cost):
+    """Dense float array, or canonical csr (sorted, one entry per lane)"""
+    if issparse(cost):
+        cost = csr_matrix(cost, dtype=float)
+        cost.sum_duplicates()
+        return cost
+    return np.asarray(cost, dtype=float)
+
+
+def _as_model(cost):
+    """A cost model (_PaddedCost / _LaneCost) for a plain dense or sparse cost"""
+    if isinstance(cost, (_PaddedCost, _LaneCost)):
+        return cost
+    cost = _as_cost(cost)
+    return _LaneCost(cost) if issparse(cost) else _PaddedCost(cost)
+
+
+def _balanced_cost(cost, supply, demand, shortage_penalty, overflow_penalty):
+    """Cost model with the dummy line if unbalanced, and balanced supply/demand"""
+    m, n = cost.shape
+    model = _LaneCost if issparse(cost) else _PaddedCost
+    gap = supply.sum() - demand.sum()
+    tol = ZERO * max(1.0, supply.sum(), demand.sum())
+    if gap > tol:
+        col = np.broadcast_to(np.asarray(overflow_penalty, dtype=float), (m,))
+        return model(cost, col=col), supply, np.append(demand, gap)
+    if gap < -tol:
+        row = np.broadcast_to(np.asarray(shortage_penalty, dtype=float), (n,))
+        return model(cost, row=row), np.append(supply, -gap), demand
+    return model(cost), supply, demand
+
+
+def _line_sums(allocation):
+    """Row and column totals of a dense or sparse plan"""
+    return (np.asarray(allocation.sum(axis=1)).ravel(),
+            np.asarray(allocation.sum(axis=0)).ravel())
+
+
+def _plan_cells(allocation, supply, demand, shape, tol=0.01):
+    """Positive cells of a plan plus dummy cells for leftover supply/demand"""
+    m, n = allocation.shape
+    if issparse(allocation):
+        plan = allocation.tocoo()
+        rows, cols = plan.row[plan.data > tol], plan.col[plan.data > tol]
+    else:
+        rows, cols = np.nonzero(allocation > tol)
+    cells = list(zip(rows, cols))
+    shipped, received = _line_sums(allocation)
+    if shape[1] > n:
+        cells += [(i, n) for i in np.flatnonzero(supply - shipped > tol)]
+    if shape[0] > m:
+        cells += [(m, j) for j in np.flatnonzero(demand - received > tol)]
+    return cells
+
+
+def _feasible_basis(model, tree):
+    """Basic cells and flows of a solved tree; ValueError if artificial flow is left"""
+    cells, flows = tree.basis()
+    rows, cols = np.array(cells, dtype=np.intp).reshape(-1, 2).T
+    if not model.admissible(rows, cols)[flows > tree._zero].all():
+        raise ValueError("no feasible plan over the admissible lanes")
+    return cells, flows
+
+
+def _split_plan(model, shape, cells, flows):
+    """Real allocation, unmet demand, unshipped supply and cost of a basis
+
+    Artificial cells (not lanes) are left out of the allocation and cost.
+    """
+    m, n = shape
+    rows, cols = np.array(cells, dtype=np.intp).reshape(-1, 2).T
+    flows = np.asarray(flows, dtype=float)
+    costs = model.cell_costs(rows, cols)
+    admissible = model.admissible(rows, cols)
+    total_cost = float(flows[admissible] @ costs[admissible])
+
+    unmet = np.zeros(n)
+    unshipped = np.zeros(m)
+    unmet[cols[rows == m]] = flows[rows == m]
+    unshipped[rows[cols == n]] = flows[cols == n]
+
+    real = (rows < m) & (cols < n) & admissible & (flows > 0)
+    if isinstance(model, _LaneCost):
+        allocation = csr_matrix((flows[real], (rows[real], cols[real])), shape=shape)
+    else:
+        allocation = np.zeros((m, n))
+        allocation[rows[real], cols[real]] = flows[real]
+    return allocation, unmet, unshipped, total_cost
+
+
+class TransportationSimplex:
+    """
+    Transportation simplex with the basis stored as a spanning tree.
+
+    Rows are nodes 0..m-1 and columns are nodes m..m+n-1. Every non-root
+    node k owns the basic arc to parent[k] and its flow; depth and the
+    preorder thread (order, with pos[k] the position of node k in it)
+    describe the tree, so the subtree of k is the slice of order starting
+    at pos[k] up to the next node that is not deeper than k. Potentials
+    pi satisfy pi[i] + pi[m + j] = cost[i, j] on every basic cell, so u
+    is pi[:m] and v is pi[m:].
+
+    Each pivot finds the cycle by walking both ends of the entering cell
+    up to their common ancestor, and then re-hangs only the subtree cut
+    off by the leaving arc. Potentials, depths and the thread change only
+    inside that subtree, as array slices. Pricing is vectorized over
+    blocks of rows, or of lanes when cost is a _LaneCost; the dummy line
+    of an unbalanced problem is just another row or column of the tree.
+    """
+
+    # Cells priced per block before accepting the best entering cell
+    BLOCK_CELLS = 1 << 16
+    # Lanes priced per block for a sparse (_LaneCost) problem
+    BLOCK_LANES = 1 << 12
+    # Degenerate pivots in a row before switching to Bland's rule
+    DEGENERATE_STREAK = 50
+    # Pivots between progress callbacks
+    PROGRESS_EVERY = 100
+
+    def __init__(self, cost, cells, flows):
+        self.cost = cost
+        self.m, self.n = cost.shape
+        self._build(cells, flows)
+        self._zero = ZERO * max(1.0, self.flow.sum())
+        self._block_rows = max(1, min(self.m, self.BLOCK_CELLS // self.n))
+        self._block_start = 0
+
+    @classmethod
+    def from_cells(cls, cost, cells, flows):
+        """Tree basis from explicit basic cells, completed with zero-flow cells if short"""
+        cells = [(int(i), int(j)) for i, j in cells]
+        flows = list(flows)
+        if len(cells) < sum(cost.shape) - 1:
+            rows, cols = np.array(cells, dtype=np.intp).reshape(-1, 2).T
+            extra = _spanning_completion(cost.shape, rows, cols)
+            cells += extra
+            flows += [0.0] * len(extra)
+        return cls(cost, cells, flows)
+
+    @classmethod
+    def from_basis(cls, cost, cells, supply, demand):
+        """Tree basis from basic cells, with the flows implied by supply and demand
+
+        supply and demand must balance and include the dummy line, if any.
+        Raises ValueError if a cell lies outside cost (a basis of the
+        problem with its dummy line on the other side) or the implied
+        flows are not all non-negative.
+        """
+        cells = [(int(i), int(j)) for i, j in cells]
+        rows, cols = cost.shape
+        if any(not (0 <= i < rows and 0 <= j < cols) for i, j in cells):
+            raise ValueError(f"basis cells must lie within the {rows} x {cols} problem")
+        tree = cls.from_cells(cost, cells, np.zeros(len(cells)))
+        tree._set_flows(np.asarray(supply, dtype=float), np.asarray(demand, dtype=float))
+        return tree
+
+    @classmethod
+    def from_allocation(cls, cost, allocation, tol=0.01):
+        """Tree basis from the positive cells of a plan, completed if degenerate"""
+        rows, cols = (allocation > tol).nonzero()
+        return cls.from_cells(cost, zip(rows, cols), np.asarray(allocation[rows, cols]).ravel())
+
+    # -----------------------------------------------------------------
+    # Tree construction
+    # -----------------------------------------------------------------
+    def _build(self, cells, flows):
+        m, n = self.m, self.n
+        size = m + n
+        if len(cells) != size - 1:
+            raise ValueError(f"a basis needs {size - 1} cells, got {len(cells)}")
+
+        neighbors = [[] for _ in range(size)]
+        for (i, j), flow in zip(cells, flows):
+            neighbors[i].append((m + j, flow))
+            neighbors[m + j].append((i, flow))
+
+        self.parent = np.full(size, -1, dtype=np.intp)
+        self.flow = np.zeros(size)
+        self.depth = np.zeros(size, dtype=np.intp)
+        self.pi = np.zeros(size)
+        order = []
+        visited = np.zeros(size, dtype=bool)
+        visited[0] = True
+        stack = [0]
+        while stack:
+            k = stack.pop()
+            order.append(k)
+            for other, flow in neighbors[k]:
+                if not visited[other]:
+                    visited[other] = True
+                    self.parent[other] = k
+                    self.flow[other] = flow
+                    self.depth[other] = self.depth[k] + 1
+                    self.pi[other] = self._arc_cost(k, other) - self.pi[k]
+                    stack.append(other)
+        if len(order) != size:
+            raise ValueError("basis cells do not form a spanning tree")
+
+        self.order = np.array(order, dtype=np.intp)
+        self.pos = np.empty(size, dtype=np.intp)
+        self.pos[self.order] = np.arange(size)
+
+    def _set_flows(self, supply, demand):
+        """Arc flows from the net supply of each subtree (leaves first)"""
+        m = self.m
+        net = np.concatenate([supply, -demand])
+        for k in self.order[:0:-1]:
+            net[self.parent[k]] += net[k]
+        flow = np.concatenate([net[:m], -net[m:]])
+        flow[self.order[0]] = 0.0
+        self._zero = ZERO * max(1.0, supply.sum())
+        if (flow < -self._zero).any():
+            raise ValueError("basis is not primal feasible for this supply and demand")
+        self.flow = np.where(flow <= self._zero, 0.0, flow)
+
+    def _arc_cost(self, a, b):
+        i, j = (a, b - self.m) if a < self.m else (b, a - self.m)
+        return self.cost[i, j]
+
+    def _cell(self, k):
+        """(row, col) of the basic arc owned by node k"""
+        p = self.parent[k]
+        return (k, p - self.m) if k < self.m else (p, k - self.m)
+
+    # -----------------------------------------------------------------
+    # Solution access
+    # -----------------------------------------------------------------
+    @property
+    def u(self):
+        return self.pi[:self.m]
+
+    @property
+    def v(self):
+        return self.pi[self.m:]
+
+    def potentials(self):
+        """(u, v) recomputed from the basic cells in one pass down the tree
+
+        pi is updated incrementally by the pivots; this rebuilds it from
+        the root (pi = 0) in preorder, so the result carries no
+        accumulated round-off. O(rows + cols).
+        """
+        nodes = self.order[1:]
+        parents = self.parent[nodes]
+        rows = np.where(nodes < self.m, nodes, parents)
+        cols = np.where(nodes < self.m, parents, nodes) - self.m
+        costs = self.cost.cell_costs(rows, cols)
+        pi = np.zeros(self.m + self.n)
+        for k, p, c in zip(nodes.tolist(), parents.tolist(), costs.tolist()):
+            pi[k] = c - pi[p]
+        self.pi = pi
+        return pi[:self.m].copy(), pi[self.m:].copy()
+
+    def basis(self):
+        """Basic cells (row, col) and their flows"""
+        nodes = np.flatnonzero(self.parent >= 0)
+        return [self._cell(k) for k in nodes], self.flow[nodes]
+
+    def objective(self):
+        """Cost of the current basis, dummy line and artificial cells included"""
+        cells, flows = self.basis()
+        rows, cols = np.array(cells, dtype=np.intp).reshape(-1, 2).T
+        return float(flows @ self.cost.cell_costs(rows, cols))
+
+    def allocation(self):
+        cells, flows = self.basis()
+        rows, cols = np.array(cells, dtype=np.intp).reshape(-1, 2).T
+        if isinstance(self.cost, _LaneCost):
+            return csr_matrix((flows, (rows, cols)), shape=(self.m, self.n))
+        allocation = np.zeros((self.m, self.n))
+        allocation[rows, cols] = flows
+        return allocation
+
+    # -----------------------------------------------------------------
+    # Simplex
+    # -----------------------------------------------------------------
+    def solve(self, max_iterations=None, tol=1e-9, progress=None):
+        """Pivot until no cell has negative reduced cost; returns pivot count
+
+        Pricing is block-Dantzig. After DEGENERATE_STREAK zero-step pivots
+        in a row it switches to Bland's rule (first improving cell, lowest
+        index leaving cell among ties) until a pivot makes progress again,
+        which rules out cycling on degenerate bases.
+
+        progress, if given, is called as progress(iterations, objective)
+        every PROGRESS_EVERY pivots and once at the end. objective is
+        updated by theta * reduced cost per pivot, so it stays O(1).
+        """
+        iterations = 0
+        degenerate = 0
+        degenerate_pivots = bland_pivots = cycle_arcs = rehung_nodes = 0
+        objective = self.objective() if progress is not None else 0.0
+        while max_iterations is None or iterations < max_iterations:
+            bland = degenerate >= self.DEGENERATE_STREAK
+            entering = self._price_bland(tol) if bland else self._price(tol)
+            if entering is None:
+                break
+            i, j = entering
+            reduced = self.cost[i, j] - self.pi[i] - self.pi[self.m + j]
+            theta, arcs, rehung = self._pivot(i, j, bland=bland)
+            degenerate = degenerate + 1 if theta <= self._zero else 0
+            degenerate_pivots += degenerate > 0
+            bland_pivots += bland
+            cycle_arcs += arcs
+            rehung_nodes += rehung
+            iterations += 1
+            objective += theta * reduced
+            if progress is not None and iterations % self.PROGRESS_EVERY == 0:
+                progress(iterations, float(objective))
+        if progress is not None:
+            progress(iterations, float(objective))
+        count("transport.pivots", iterations)
+        count("transport.degenerate_pivots", degenerate_pivots)
+        count("transport.bland_pivots", bland_pivots)
+        count("transport.cycle_arcs", cycle_arcs)
+        count("transport.rehung_nodes", rehung_nodes)
+        return iterations
+
+    def reduced_costs(self):
+        """cost - u[:, None] - v[None, :] for every cell (every lane, as csr)"""
+        if isinstance(self.cost, _LaneCost):
+            rows, cols, costs = self.cost.lanes(0, len(self.cost))
+            return csr_matrix((costs - self.u[rows] - self.v[cols], (rows, cols)), shape=self.cost.shape)
+        return self.cost[np.arange(self.m)] - self.u[:, None] - self.v[None, :]
+
+    def _price(self, tol):
+        """Most negative reduced cost in the first block of rows that has one"""
+        if isinstance(self.cost, _LaneCost):
+            return self._price_lanes(tol)
+        m, step = self.m, self._block_rows
+        scale = tol * max(1.0, np.abs(self.pi).max())
+        for offset in range(0, m, step):
+            lo = self._block_start + offset
+            rows = np.arange(lo, lo + min(step, m - offset)) % m
+            rc = self.cost[rows] - self.pi[rows, None] - self.v[None, :]
+            flat = int(np.argmin(rc))
+            if rc.flat[flat] < -scale:
+                self._block_start = lo % m
+                i, j = divmod(flat, self.n)
+                return rows[i], j
+        return None
+
+    def _price_bland(self, tol):
+        """Lowest-index cell (row-major) with negative reduced cost"""
+        if isinstance(self.cost, _LaneCost):
+            return self._price_lanes(tol, bland=True)
+        scale = tol * max(1.0, np.abs(self.pi).max())
+        for i in range(self.m):
+            rc = self.cost[i] - self.pi[i] - self.v
+            negative = np.flatnonzero(rc < -scale)
+            if len(negative):
+                return i, negative[0]
+        return None
+
+    def _price_lanes(self, tol, bland=False):
+        """Block pricing over the lanes only (first negative lane under Bland)"""
+        lanes, step = self.cost, self.BLOCK_LANES
+        blocks = -(-len(lanes) // step)
+        scale = tol * max(1.0, np.abs(self.pi).max())
+        first = 0 if bland else self._block_start % max(blocks, 1)
+        u, v = self.u, self.v
+        for t in range(blocks):
+            block = (first + t) % blocks
+            rows, cols, costs = lanes.lanes(block * step, (block + 1) * step)
+            rc = costs - u[rows] - v[cols]
+            if bland:
+                negative = np.flatnonzero(rc < -scale)
+                if len(negative):
+                    return rows[negative[0]], cols[negative[0]]
+                continue
+            k = int(np.argmin(rc))
+            if rc[k] < -scale:
+                self._block_start = block
+                return rows[k], cols[k]
+        return None
+
+    def cycle(self, i, j):
+        """Basic arcs (owner nodes) of the cycle closed by cell (i, j), with signs
+
+        Arcs are listed from the column end and then from the row end up to
+        the common ancestor; the k-th arc from either end carries
+        -theta for even k and +theta for odd k.
+        """
+        a, b = i, self.m + j
+        path_a, path_b = [], []
+        while self.depth[a] > self.depth[b]:
+            path_a.append(a)
+            a = self.parent[a]
+        while self.depth[b] > self.depth[a]:
+            path_b.append(b)
+            b = self.parent[b]
+        while a != b:
+            path_a.append(a)
+            path_b.append(b)
+            a, b = self.parent[a], self.parent[b]
+
+        arcs = path_b + path_a
+        signs = [1 if k % 2 else -1 for k in range(len(path_b))]
+        signs += [1 if k % 2 else -1 for k in range(len(path_a))]
+        return arcs, signs, len(path_b)
+
+    def _pivot(self, i, j, bland=False):
+        """Bring cell (i, j) into the basis; returns (theta, cycle arcs, rehung nodes)"""
+        m = self.m
+        arcs, signs, split = self.cycle(i, j)
+        arcs = np.array(arcs)
+        signs = np.array(signs)
+
+        minus = arcs[signs < 0]
+        theta = self.flow[minus].min()
+        blocking = minus[self.flow[minus] <= theta + self._zero]
+        if bland:
+            index = [r * self.n + c for r, c in map(self._cell, blocking)]
+            leaving = blocking[int(np.argmin(index))]
+        else:
+            leaving = blocking[0]
+
+        # Zero-flow basic cells stay in the basis at exactly zero
+        self.flow[arcs] += signs * theta
+        self.flow[arcs] = np.where(np.abs(self.flow[arcs]) <= self._zero, 0.0, self.flow[arcs])
+
+        # Endpoint of the entering cell that lies in the cut-off subtree
+        on_col_side = np.flatnonzero(arcs == leaving)[0] < split
+        inner, outer = (m + j, i) if on_col_side else (i, m + j)
+        rehung = self._rehang(leaving, inner, outer, theta)
+        return theta, len(arcs), rehung
+
+    def _subtree_end(self, k):
+        """Position in order just past the subtree of node k"""
+        start = self.pos[k] + 1
+        shallower = self.depth[self.order[start:]] <= self.depth[k]
+        return start + int(np.argmax(shallower)) if shallower.any() else len(self.order)
+
+    def _rehang(self, q, inner, outer, theta):
+        """Cut arc (q, parent[q]) and hang q's subtree from outer via inner
+
+        Returns the number of nodes in the subtree that moved.
+        """
+        m = self.m
+        delta = self.cost[min(inner, outer), max(inner, outer) - m] - self.pi[inner] - self.pi[outer]
+
+        # Path inner = w0, w1, ..., wk = q (old parent pointers)
+        path = [inner]
+        while path[-1] != q:
+            path.append(self.parent[path[-1]])
+
+        # New preorder of the subtree: subtree(w0), then for each t >= 1
+        # subtree(w_t) minus subtree(w_{t-1}), each keeping its old order
+        order, depth = self.order, self.depth
+        spans = [(self.pos[w], self._subtree_end(w)) for w in path]
+        segments = [order[spans[0][0]:spans[0][1]]]
+        for (start, end), (inner_start, inner_end) in zip(spans[1:], spans):
+            segments.append(np.concatenate([order[start:inner_start], order[inner_end:end]]))
+        root_depth = depth[outer] + 1
+        for t, (w, nodes) in enumerate(zip(path, segments)):
+            depth[nodes] += root_depth + t - depth[w]
+        q_start, q_end = spans[-1]
+        subtree = np.concatenate(segments)
+
+        # Reverse parent pointers (and arc flows) along the path
+        new_parent, new_flow = outer, theta
+        for w in path:
+            old_parent, old_flow = self.parent[w], self.flow[w]
+            self.parent[w], self.flow[w] = new_parent, new_flow
+            new_parent, new_flow = w, old_flow
+
+        # Potentials shift by ±delta inside the subtree
+        same_side = (subtree < m) == (inner < m)
+        self.pi[subtree] += np.where(same_side, delta, -delta)
+
+        # Splice the re-rooted subtree into the thread right after outer
+        rest = np.concatenate([order[:q_start], order[q_end:]])
+        at = self.pos[outer] + 1
+        if at > q_start:
+            at -= q_end - q_start
+        self.order = np.concatenate([rest[:at], subtree, rest[at:]])
+        self.pos[self.order] = np.arange(len(self.order))
+        return len(subtree)
+
+
+def _spanning_completion(shape, rows, cols):
+    """Zero-flow cells joining the forest of basic cells into a spanning tree"""
+    m, n = shape
+    graph = coo_matrix((np.ones(len(rows)), (rows, m + cols)), shape=(m + n, m + n))
+    components, labels = connected_components(graph, directed=False)
+    if components == 1:
+        return []
+
+    extra = []
+    root = labels[0]
+    root_cols = np.flatnonzero(labels[m:] == root)
+    first_row = {}
+    first_col = {}
+    for k in range(m + n - 1, -1, -1):
+        (first_row if k < m else first_col)[labels[k]] = k
+
+    if len(root_cols) == 0:
+        # Node 0 is an isolated row: hang it on another component's column
+        label, col = next((lab, k) for lab, k in first_col.items() if lab != root)
+        extra.append((0, col - m))
+        root = label
+        root_cols = [col - m]
+        first_row.pop(label, None)
+
+    anchor_col = root_cols[0]
+    for label in set(labels.tolist()) - {root, labels[0]}:
+        if label in first_col:
+            extra.append((0, first_col[label] - m))
+        else:
+            extra.append((first_row[label], anchor_col))
+    return extra
@@ -0,0 +1,29 @@
+# -*- coding: utf-8 -*-
+"""Assignment duals and sensitivity"""
+
+import numpy as np
+import pytest
+from scipy.sparse import csr_matrix
+
+from or_solvers.assignment import assignment_duals, assignment_sensitivity
+
+COST = np.array([[4.0, 1.0, 3.0], [2.0, 0.0, 5.0], [3.0, 2.0, 2.0]])
+# Not optimal: row 0 -> column 0 and row 1 -> column 1 cost 4 + 0; swapping
+# them would cost 1 + 2
+ROWS, COLS = np.arange(3), np.array([0, 1, 2])
+
+
+@pytest.mark.parametrize("cost", [COST, COST[:2], csr_matrix(COST), csr_matrix(COST[:2])])
+def test_non_optimal_matching_raises(cost):
+    rows = ROWS[:cost.shape[0]]
+    cols = COLS[:cost.shape[0]]
+    with pytest.raises(ValueError, match="not optimal"):
+        assignment_duals(cost, rows, cols)
+    with pytest.raises(ValueError, match="not optimal"):
+        assignment_sensitivity(cost, rows, cols)
+
+
+def test_optimal_matching_gets_duals():
+    u, v = assignment_duals(COST, ROWS, np.array([1, 0, 2]))
+    assert np.all(u[:, None] + v[None, :] <= COST + 1e-9)
+    assert np.allclose(u + v[[1, 0, 2]], COST[ROWS, [1, 0, 2]])
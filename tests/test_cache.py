@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+"""SolveCache warm starts against cold solves"""
+
+import numpy as np
+import pytest
+from scipy.optimize import linear_sum_assignment
+
+from or_solvers.cache import SolveCache
+
+# Cached costs and the same costs with two rows replaced
+TWO_ROW_EDITS = [
+    ([[1, 2, 4, 2], [1, 1, 1, 0], [3, 9, 8, 4], [8, 9, 8, 3]],
+     [[1, 2, 4, 2], [3, 8, 5, 1], [0, 0, 4, 4], [8, 9, 8, 3]]),
+    ([[8, 7, 8, 4, 6], [2, 3, 0, 0, 9], [6, 1, 9, 3, 4], [4, 0, 6, 1, 7], [6, 1, 6, 2, 8]],
+     [[8, 7, 8, 4, 6], [2, 3, 0, 0, 9], [3, 9, 2, 9, 2], [4, 6, 0, 8, 7], [6, 1, 6, 2, 8]]),
+]
+
+
+@pytest.mark.parametrize("sensitivity", [False, True])
+@pytest.mark.parametrize("cost, changed", TWO_ROW_EDITS)
+def test_assignment_warm_start_with_two_changed_rows(cost, changed, sensitivity):
+    cache = SolveCache()
+    cache.solve_assignment(np.array(cost, dtype=float))
+    changed = np.array(changed, dtype=float)
+
+    result = cache.solve_assignment(changed, sensitivity=sensitivity)
+    row_ind, col_ind = linear_sum_assignment(changed)
+    assert cache.warm_starts == 1
+    assert result.total == changed[row_ind, col_ind].sum()
+
+
+def test_rejected_transportation_basis_is_not_a_warm_start():
+    cost = np.array([[4.0, 6.0, 9.0], [5.0, 3.0, 8.0], [7.0, 6.0, 2.0]])
+    for supply, demand, warm in (([30, 20, 10], [10, 20, 30], False),
+                                 ([11, 20, 29], [30, 20, 10], True)):
+        cache = SolveCache()
+        cache.solve_transportation(cost, [10, 20, 30], [30, 20, 10])
+        # Same costs, so the cached basis is offered; for the first supply
+        # and demand its flows turn negative
+        result = cache.solve_transportation(cost, supply, demand)
+        assert result.warm_start == warm
+        assert cache.warm_starts == warm
+
+
+def test_cold_solved_lp_is_not_a_warm_start():
+    A = np.array([[1.0, 1.0], [1.0, 3.0]])
+    cache = SolveCache()
+    cache.solve_simplex([-1.0, -2.0], A, [4.0, 6.0])
+    # new b and c: the old basis is neither primal nor dual feasible
+    cache.solve_simplex([-1.0, 5.0], A, [-1.0, 6.0])
+    assert cache.warm_starts == 0
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+"""solve_integer statuses at the time and node limits and on infeasible models"""
+
+import sys
+
+import numpy as np
+import pytest
+
+from or_solvers.integer import FEASIBILITY_TOL, _IntegerModel, solve_integer
+
+
+def _multi_knapsack(m=20, n=60, seed=0):
+    rng = np.random.default_rng(seed)
+    A = rng.integers(10, 1000, (m, n)).astype(float)
+    c = -(A.sum(axis=0) / m + rng.integers(0, 50, n))
+    return c, A, A.sum(axis=1) / 2
+
+
+@pytest.mark.parametrize("search", ["highspy", "milp"])
+def test_node_limit_keeps_the_incumbent(monkeypatch, search):
+    if search == "milp":
+        monkeypatch.setitem(sys.modules, "highspy", None)  # import fails → scipy milp
+    c, A, b = _multi_knapsack()
+    res = solve_integer(c, A, b, node_limit=1)
+    assert res.success and res.status == 1
+    assert res.nodes <= 1 and res.gap > 0
+    assert res.profit >= res.rounded_profit
+    assert np.all(A @ res.x <= b + FEASIBILITY_TOL * (1 + b))
+    assert np.array_equal(res.x, np.round(res.x))
+
+
+def test_time_limit_before_the_search_returns_the_rounded_plan():
+    c, A, b = _multi_knapsack()
+    res = solve_integer(c, A, b, time_limit=1e-9)
+    assert res.success and res.status == 1
+    assert res.profit == res.rounded_profit
+
+
+def test_solver_failure_is_not_reported_as_a_time_limit(monkeypatch):
+    c, A, b = _multi_knapsack()
+    monkeypatch.setattr(_IntegerModel, "search",
+                        lambda self, *limits: (None, -np.inf, 0, 4, "Solve error"))
+    res = solve_integer(c, A, b)
+    assert res.success and res.status == 4
+    assert res.profit == res.rounded_profit
+
+
+def test_infeasible_integer_model():
+    # 1.2 <= x <= 1.8 holds no whole number, though the LP is feasible
+    res = solve_integer([-1.0], [[1.0], [-1.0]], [1.8, -1.2])
+    assert not res.success and res.status == 2
+
+
+def test_unbounded_integer_model():
+    res = solve_integer([-1.0], [[-1.0]], [0.0])
+    assert not res.success and res.status == 3
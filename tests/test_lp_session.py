@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+"""LPSession re-solves against linprog"""
+
+import numpy as np
+import pytest
+from scipy.optimize import linprog
+
+from or_solvers import lp_session
+from or_solvers.lp_session import LPSession
+from or_solvers.scenarios import Scenario, solve_scenarios
+
+
+def _degenerate_lp(seed):
+    """Small LP with several rows through the same vertices (b has repeated zeros)"""
+    rng = np.random.default_rng(seed)
+    m, n = 6, 4
+    A = rng.integers(-2, 4, (m, n)).astype(float)
+    b = np.where(rng.random(m) < 0.5, 0.0, rng.integers(1, 5, m)).astype(float)
+    A[b == 0] = np.abs(A[b == 0])
+    A[-1] = 1.0
+    b[-1] = 10.0
+    c = -rng.integers(1, 5, n).astype(float)
+    return c, A, b
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_add_constraint_on_degenerate_lp(seed):
+    c, A, b = _degenerate_lp(seed)
+    row = np.random.default_rng(seed + 1).integers(0, 3, len(c)).astype(float)
+    result = LPSession(c, A, b).add_constraint(row, 1.0)
+
+    expected = linprog(c, A_ub=np.vstack([A, row]), b_ub=np.append(b, 1.0), method="highs")
+    assert result.success == expected.success
+    if expected.success:
+        assert result.profit == pytest.approx(-expected.fun, abs=1e-7)
+
+
+# Wyndor Glass: optimum x = (2, 6); x1 + x2 <= 4 cuts it off
+WYNDOR = (np.array([-3.0, -5.0]), np.array([[1.0, 0.0], [0.0, 2.0], [3.0, 2.0]]),
+          np.array([4.0, 12.0, 18.0]))
+CUT = (np.array([1.0, 1.0]), 4.0)
+
+
+def test_pivot_limit_falls_back_to_cold_solve(monkeypatch):
+    c, A, b = WYNDOR
+    session = LPSession(c, A, b)
+    monkeypatch.setattr(lp_session, "MAX_PIVOTS_PER_LINE", 0)
+    result = session.add_constraint(*CUT)
+    assert session.cold_solves == 1
+    assert result.profit == pytest.approx(20.0)
+
+
+def test_singular_refactorization_falls_back_to_cold_solve(monkeypatch):
+    c, A, b = WYNDOR
+    session = LPSession(c, A, b)
+
+    def singular(self, r, q):
+        raise np.linalg.LinAlgError("basis matrix is singular")
+
+    monkeypatch.setattr(LPSession, "_pivot", singular)
+    result = session.add_constraint(*CUT)
+    assert session.cold_solves == 1
+    assert result.profit == pytest.approx(20.0)
+
+
+def test_scenarios_survive_the_pivot_limit(monkeypatch):
+    c, A, b = WYNDOR
+    monkeypatch.setattr(lp_session, "MAX_PIVOTS_PER_LINE", 0)
+    scenarios = [Scenario(db=np.array([0.0, -6.0, 0.0])), Scenario(dc=np.array([-4.0, 0.0]))]
+    results = solve_scenarios(c, A, b, scenarios, processes=1)
+    assert results.status.tolist() == [0, 0]
+    assert results.objective == pytest.approx([27.0, 44.0])
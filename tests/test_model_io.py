@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""MPS bounds and .npz memory mapping in the file loaders"""
+
+import numpy as np
+import pytest
+
+from or_solvers.model_io import _lp_instance, _read_mps, load_lp, load_matrix, load_transportation
+
+# Bound lines with and without the optional set name and value
+MPS = """NAME          BOUNDS
+ROWS
+ N  obj
+ L  cap
+COLUMNS
+    MARKER    'MARKER'    'INTORG'
+    X1        obj    -1   cap    1
+    MARKER    'MARKER'    'INTEND'
+    X2        obj    -2   cap    1
+    X3        obj    -1   cap    2
+    X4        obj    -3   cap    1
+    X5        obj    -1   cap    3
+RHS
+    RHS       cap    10
+BOUNDS
+ UP BND       X1     5
+ BV           X2
+ UI BND       X3     4
+ LI           X4     0
+ UI           X4     2.5
+ PL BND       X5
+ENDATA
+"""
+
+
+def _write(tmp_path, text):
+    path = tmp_path / "model.mps"
+    path.write_text(text, encoding="utf-8")
+    return str(path)
+
+
+@pytest.mark.parametrize("reader", ["builtin", "load_lp"])
+def test_mps_bounds(tmp_path, reader):
+    path = _write(tmp_path, MPS)
+    lp = _lp_instance(*_read_mps(path)) if reader == "builtin" else load_lp(path)
+    assert lp.products == ["X1", "X2", "X3", "X4", "X5"]
+    assert lp.integer.tolist() == [True, True, True, True, False]
+    bounds = {name: b for name, b in zip(lp.constraint_names, lp.b)}
+    assert bounds == {"cap": 10, "X1 (upper bound)": 5, "X2 (upper bound)": 1,
+                      "X3 (upper bound)": 4, "X4 (upper bound)": 2.5}
+
+
+def test_mps_free_bound_without_set_name(tmp_path):
+    path = _write(tmp_path, MPS.replace(" PL BND       X5", " FR           X5"))
+    lower, upper = _read_mps(path)[4:6]
+    assert lower[4] == -np.inf and upper[4] == np.inf
+
+
+def test_mps_semi_continuous_bound_is_rejected(tmp_path):
+    path = _write(tmp_path, MPS.replace(" PL BND       X5", " SC BND       X5     8"))
+    with pytest.raises(ValueError, match="semi-continuous"):
+        _read_mps(path)
+    with pytest.raises(ValueError, match="semi-continuous"):
+        load_lp(path)
+
+
+def test_npz_members_are_memory_mapped_when_uncompressed(tmp_path):
+    cost = np.arange(12.0).reshape(3, 4)
+    plain, packed = tmp_path / "plain.npz", tmp_path / "packed.npz"
+    np.savez(plain, other=np.ones(2), cost=np.asfortranarray(cost))
+    np.savez_compressed(packed, cost=cost)
+
+    mapped = load_matrix(str(plain), "cost")
+    assert isinstance(mapped, np.memmap)
+    assert np.array_equal(mapped, cost)
+    assert np.array_equal(load_matrix(str(plain)), np.ones(2))
+    assert np.array_equal(load_matrix(str(packed)), cost)
+
+    np.savez(plain, cost=cost, supply=[10.0, 20.0, 30.0], demand=[15.0] * 4)
+    instance = load_transportation(str(plain))
+    assert np.array_equal(instance.cost_matrix, cost)
+    assert instance.supply.tolist() == [10, 20, 30]
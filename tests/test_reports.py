@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+"""Text reports render for fractional costs and empty lines"""
+
+import numpy as np
+import pytest
+
+from or_solvers import reports
+from or_solvers.assignment import solve_assignment
+from or_solvers.instances import AssignmentInstance, TransportationInstance
+from or_solvers.murty import k_best_assignments
+from or_solvers.transportation import solve_transportation
+
+
+@pytest.mark.filterwarnings("error")
+def test_transportation_report_with_float_costs_and_zero_supply():
+    inst = TransportationInstance(
+        np.array([[4.5, 6.25, 9.0], [5.0, 3.75, 8.5], [7.0, 6.0, 2.5]]),
+        np.array([30.0, 0.0, 30.0]), np.array([20.0, 25.0, 15.0]),
+        ["F1", "F2", "F3"], ["W1", "W2", "W3"],
+    )
+    res = solve_transportation(inst.cost_matrix, inst.supply, inst.demand)
+    text = "".join(reports.transportation_problem(inst)) + "".join(
+        reports.transportation_solution(inst, res))
+
+    assert " 4.5  6.25" in text
+    assert "nan" not in text and "inf%" not in text
+    supply_line = [line for line in text.splitlines() if line.startswith("F2 ")][-1]
+    assert supply_line.split()[1:4] == ["0", "0", "-"]
+
+
+@pytest.mark.filterwarnings("error")
+def test_assignment_report_with_float_costs():
+    cost = np.array([[4.5, 1.25, 3.0], [2.0, 0.5, 5.0], [3.0, 2.0, 2.75]])
+    inst = AssignmentInstance(cost, ["A", "B", "C"], ["T1", "T2", "T3"])
+    res = solve_assignment(cost)
+    text = "".join(reports.assignment_problem(inst)) + "".join(
+        reports.assignment_solution(inst, res, k_best_assignments(cost, 3)[1:]))
+
+    assert "MINIMUM TOTAL TIME: 6 hours" in text
+    assert "(1.25 hours)" in text
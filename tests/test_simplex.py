@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+"""Sensitivity ranges from sparse and dense bases on degenerate LPs"""
+
+import numpy as np
+import pytest
+from scipy.optimize import linprog
+from scipy.sparse import csr_matrix
+
+from or_solvers.lp_session import LPSession
+from or_solvers.simplex import BasisFactor, solve_simplex
+
+
+def _degenerate_lp(seed):
+    """LP with more products than rows and some rows with b = 0"""
+    rng = np.random.default_rng(seed)
+    m, n = 6, 8
+    A = rng.integers(0, 3, (m, n)).astype(float)
+    b = np.full(m, 6.0)
+    b[rng.random(m) < 0.3] = 0.0
+    c = -rng.integers(1, 20, n).astype(float)
+    return c, A, b
+
+
+def _plan_stays_optimal(c, A, b, result):
+    """Whether result.x is still optimal with each product's profit at its range ends"""
+    for j, ends in enumerate(result.sensitivity.cost_ranges):
+        for profit in ends[np.isfinite(ends)]:
+            moved = c.copy()
+            moved[j] = -profit
+            best = linprog(moved, A_ub=A, b_ub=b, method="highs")
+            if moved @ result.x > best.fun + 1e-7:
+                return False
+    return True
+
+
+@pytest.mark.parametrize("seed", range(60))
+def test_sparse_and_dense_ranges_on_degenerate_lp(seed):
+    c, A, b = _degenerate_lp(seed)
+    dense = solve_simplex(c, A, b)
+    sparse = solve_simplex(c, csr_matrix(A), b)
+    assert _plan_stays_optimal(c, A, b, dense)
+    assert _plan_stays_optimal(c, A, b, sparse)
+
+    # the basis reproduces the HiGHS duals: no basic slack has a nonzero dual
+    basis = sparse.sensitivity.basis
+    y = BasisFactor(csr_matrix(A), basis).solve(np.concatenate([c, np.zeros(len(b))])[basis],
+                                                trans=True)
+    assert np.allclose(-y, sparse.duals, atol=1e-7)
+
+
+@pytest.mark.parametrize("seed", range(60))
+def test_sparse_add_constraint_on_degenerate_lp(seed):
+    c, A, b = _degenerate_lp(seed)
+    row = np.random.default_rng(seed + 1).integers(0, 3, len(c)).astype(float)
+    result = LPSession(c, csr_matrix(A), b).add_constraint(row, 1.0)
+
+    expected = linprog(c, A_ub=np.vstack([A, row]), b_ub=np.append(b, 1.0), method="highs")
+    assert result.success == expected.success
+    if expected.success:
+        assert result.profit == pytest.approx(-expected.fun, abs=1e-7)
@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+"""Transportation warm starts from bases of other problems"""
+
+import numpy as np
+import pytest
+
+from benchmarks.generators import random_transportation
+from or_solvers.cache import SolveCache
+from or_solvers.transportation import solve_transportation
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_basis_with_dummy_line_on_the_other_side_falls_back_to_vam(seed):
+    short = random_transportation(5, 4, imbalance=-0.2, seed=seed)  # dummy row
+    surplus = random_transportation(5, 4, imbalance=0.2, seed=seed + 100)  # dummy column
+    basis = solve_transportation(*short).basis
+
+    warm = solve_transportation(*surplus, basis=basis)
+    cold = solve_transportation(*surplus)
+    assert warm.total_cost == pytest.approx(cold.total_cost)
+
+
+def test_cache_from_supply_surplus_to_demand_surplus():
+    cache = SolveCache()
+    for seed in range(5):
+        for imbalance in (0.2, -0.2):
+            cost, supply, demand = random_transportation(5, 4, imbalance=imbalance, seed=seed)
+            result = cache.solve_transportation(cost, supply, demand)
+            cold = solve_transportation(cost, supply, demand)
+            assert result.total_cost == pytest.approx(cold.total_cost)
+            assert np.allclose(result.allocation.sum(axis=1) + result.unshipped_supply, supply)